@@ -1,25 +1,47 @@
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox, filedialog
-from PIL import Image, ImageTk
 from datetime import datetime
 import webbrowser
 import sqlite3
-import csv
+from compliance import COMPLIANCE_STATUSES, PRESENTATION_INTERVAL_MONTHS
+from exporter import export_compliance, export_data
+from importer import import_students
+from instrumentation import profile_screen
+from storage_scanner import StorageScanner, format_size
+from student_facets import CERTIFICATE_BUCKETS, FacetFilter
+from services import (PhDService, ServiceError, ValidationError, StudentData, PresentationData, SynopsisData,
+                      CertificateData, StudentFilter, parse_id_list)
+from task_runner import TaskRunner
+from screen_manager import ScreenManager
+from ui_utils import format_batch, show_picture
 import os
-import shutil
+
+STUDENT_PAGE_SIZE = 100
+
+
+def error_message(error, action):
+    # Service errors are already worded for the user; anything else gets the action as context
+    return str(error) if isinstance(error, ServiceError) else f"Error {action}: {error}"
+
 
 class AdminUI:
-    def __init__(self, root, db_file, file_manager, show_login_callback):
+    def __init__(self, root, db_file, file_manager, show_login_callback, task_runner=None, service=None, screens=None):
         self.root = root
         self.db_file = db_file
         self.file_manager = file_manager
         self.show_login = show_login_callback
         self.is_admin = True
+        self.upload_dir = file_manager.upload_dir
         self.cert_dir = file_manager.cert_dir
         self.pic_dir = file_manager.pic_dir
+        self.thumb_dir = file_manager.thumb_dir
+        self.blob_dir = file_manager.blob_dir
+        self.service = service or PhDService(db_file, self.blob_dir, self.thumb_dir)
         self.present_dir = file_manager.present_dir
         self.synopsis_dir = file_manager.synopsis_dir
+        self.task_runner = task_runner or TaskRunner(root)
+        self.screens = screens or ScreenManager(root)
         self.setup_styles()
 
     def setup_styles(self):
@@ -53,41 +75,13 @@ class AdminUI:
         scrollbar.pack(side="right", fill="y")
         return card_frame, canvas
 
-    def get_student_presentations(self, student_id):
-        try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM presentations WHERE student_id = ?", (student_id,))
-                return cursor.fetchall()
-        except sqlite3.Error as e:
-            messagebox.showerror("Error", f"Error fetching presentations: {e}", parent=self.root)
-            return []
-
-    def get_student_synopsis(self, student_id):
-        try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM synopsis WHERE student_id = ?", (student_id,))
-                return cursor.fetchone()
-        except sqlite3.Error as e:
-            messagebox.showerror("Error", f"Error fetching synopsis: {e}", parent=self.root)
-            return None
-
-    def get_student_certificates(self, student_id):
-        try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT id, certificate_title, certificate_path FROM certificates WHERE student_id = ?", (student_id,))
-                return cursor.fetchall()
-        except sqlite3.Error as e:
-            messagebox.showerror("Error", f"Error fetching certificates: {e}", parent=self.root)
-            return []
-
+    @profile_screen
     def show_admin_dashboard(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        screen = self.screens.open("admin_dashboard")
+        if screen is None:
+            return
 
-        card_frame, canvas = self.create_scrollable_frame(self.root)
+        card_frame, canvas = self.create_scrollable_frame(screen.frame)
         card_frame.configure(padding=30)
 
         ttk.Label(
@@ -96,6 +90,42 @@ class AdminUI:
             style="Heading.TLabel"
         ).pack(pady=20)
 
+        summary_frame = ttk.Frame(card_frame, style="Card.TFrame")
+        summary_frame.pack(fill="x", padx=20, pady=(0, 10))
+
+        def show_summary():
+            # Reads the trigger-maintained counters, so this costs the same however many students there are
+            for widget in summary_frame.winfo_children():
+                widget.destroy()
+            try:
+                counts = self.service.dashboard_counts()
+            except sqlite3.Error as e:
+                ttk.Label(summary_frame, text=f"Summary unavailable: {e}").pack(anchor="w")
+                return
+
+            def count(facet, value=""):
+                return dict(counts.get(facet, [])).get(value, 0)
+
+            def breakdown(facet, limit=6):
+                values = counts.get(facet, [])
+                text = ", ".join(f"{value or 'N/A'} ({total})" for value, total in values[:limit])
+                if len(values) > limit:
+                    text += f", +{len(values) - limit} more"
+                return text or "none"
+
+            lines = [
+                f"Students: {count('students')}    Synopsis pending: {count('synopsis', 'pending')}    "
+                f"Extended: {count('extension', 'extended')}    Presentations: {count('presentations')}    "
+                f"Certificates: {count('certificates')}",
+                f"By department: {breakdown('department')}",
+                f"By supervisor: {breakdown('supervisor')}",
+                f"By batch: {breakdown('batch')}",
+            ]
+            for line in lines:
+                ttk.Label(summary_frame, text=line, wraplength=620).pack(anchor="w", pady=2)
+
+        show_summary()
+
         buttons = [
             ("Add Student", self.show_add_student),
             ("View All Students", self.show_view_students),
@@ -103,7 +133,10 @@ class AdminUI:
             ("Delete Student", self.show_delete_student),
             ("Search Student", self.show_search_student),
             ("Manage Presentations", self.show_manage_presentations),
-            ("Export to CSV", self.export_to_csv)
+            ("Presentation Compliance", self.show_presentation_compliance),
+            ("Export to CSV", self.export_to_csv),
+            ("Import from CSV/Excel", self.import_from_file),
+            ("Check Storage", self.check_storage)
         ]
 
         for text, command in buttons:
@@ -125,9 +158,7 @@ class AdminUI:
         back_btn.pack(pady=10, padx=20, fill="x", ipady=5)
         self.button_bind(back_btn)
 
-        canvas.bind_all("<MouseWheel>", lambda event: canvas.yview_scroll(int(-1 * (event.delta / 120)), "units"))
-        canvas.bind_all("<Button-4>", lambda event: canvas.yview_scroll(-1, "units"))
-        canvas.bind_all("<Button-5>", lambda event: canvas.yview_scroll(1, "units"))
+        self.screens.ready(screen, canvas, refresh=show_summary)
 
         card_frame.update_idletasks()
         canvas.configure(scrollregion=canvas.bbox("all"))
@@ -135,39 +166,170 @@ class AdminUI:
         self.root.update()
 
     def export_to_csv(self):
-        try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM students")
-                students = cursor.fetchall()
+        export_window = tk.Toplevel(self.root)
+        export_window.title("Export Data")
+        export_window.geometry("560x410")
+        export_window.configure(bg="#F5F7FA")
+        export_window.transient(self.root)  # Set as transient to the main window
+        export_window.grab_set()  # Ensure it stays in focus
+
+        card_frame_export = ttk.Frame(export_window, style="Card.TFrame")
+        card_frame_export.pack(expand=True, fill="both", padx=20, pady=20)
+
+        ttk.Label(card_frame_export, text="Export Data", style="Heading.TLabel").pack(pady=20)
+
+        scope = tk.StringVar(value="students")
+        scopes = [
+            ("Students", "students"),
+            ("One row per student with presentation, synopsis and certificate counts", "summary"),
+            ("All tables and the summary (ZIP archive)", "all"),
+            ("Presentation compliance report (one row per student)", "compliance")
+        ]
+        for text, value in scopes:
+            ttk.Radiobutton(card_frame_export, text=text, variable=scope, value=value).pack(anchor="w", padx=20, pady=2)
+        compress = tk.BooleanVar(value=False)
+        ttk.Checkbutton(card_frame_export, text="Compress CSV (gzip)", variable=compress).pack(anchor="w", padx=20, pady=(10, 2))
+
+        def start_export():
+            selected_scope = scope.get()
+            if selected_scope == "all":
+                file_path = filedialog.asksaveasfilename(parent=export_window, defaultextension=".zip", filetypes=[("ZIP archives", "*.zip")])
+            elif compress.get():
+                file_path = filedialog.asksaveasfilename(parent=export_window, defaultextension=".csv.gz", filetypes=[("Gzipped CSV files", "*.csv.gz")])
+            else:
+                file_path = filedialog.asksaveasfilename(parent=export_window, defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
+            if not file_path:
+                return
+            export_window.destroy()
 
-                if not students:
+            def exported(count):
+                if not count:
                     messagebox.showinfo("Info", "No students to export.", parent=self.root)
-                    return
+                else:
+                    messagebox.showinfo("Success", f"Student data exported to {file_path}!", parent=self.root)
+
+            def failed(e):
+                if isinstance(e, sqlite3.Error):
+                    messagebox.showerror("Error", f"Error exporting to CSV: {e}", parent=self.root)
+                else:
+                    messagebox.showerror("Error", f"Error writing CSV: {e}", parent=self.root)
 
-                file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
-                if not file_path:
+            self.task_runner.run(lambda task: export_data(self.db_file, file_path, selected_scope, task),
+                                 on_success=exported, on_error=failed, progress_title="Exporting data...")
+
+        export_btn = ttk.Button(card_frame_export, text="Export", style="Danger.TButton", command=start_export)
+        export_btn.pack(pady=20, padx=20, fill="x", ipady=5)
+        self.button_bind(export_btn)
+
+        cancel_btn = ttk.Button(card_frame_export, text="Cancel", style="TButton", command=export_window.destroy)
+        cancel_btn.pack(pady=10, padx=20, fill="x", ipady=5)
+        self.button_bind(cancel_btn)
+
+    def import_from_file(self):
+        file_path = filedialog.askopenfilename(filetypes=[("CSV, ZIP or Excel files", "*.csv *.zip *.xlsx"), ("All files", "*.*")])
+        if not file_path:
+            return
+
+        def imported(result):
+            self.service.data_changed()
+            counts = result.counts
+            summary = (f"Imported {counts['students']} students, {counts['presentations']} presentations, "
+                       f"{counts['synopsis']} synopses and {counts['certificates']} certificates.")
+            if not result.errors:
+                messagebox.showinfo("Success", summary, parent=self.root)
+                return
+
+            report_window = tk.Toplevel(self.root)
+            report_window.title("Import Report")
+            report_window.geometry("700x500")
+            report_window.configure(bg="#F5F7FA")
+            report_window.transient(self.root)
+
+            card_frame_report = ttk.Frame(report_window, style="Card.TFrame")
+            card_frame_report.pack(expand=True, fill="both", padx=20, pady=20)
+            ttk.Label(card_frame_report, text="Import Report", style="Heading.TLabel").pack(pady=10)
+            ttk.Label(card_frame_report, text=summary, wraplength=620).pack(anchor="w", padx=20, pady=2)
+            ttk.Label(card_frame_report, text=f"{len(result.errors)} rows were skipped:").pack(anchor="w", padx=20, pady=(10, 2))
+
+            errors_frame = ttk.Frame(card_frame_report, style="Card.TFrame")
+            errors_frame.pack(expand=True, fill="both", padx=20, pady=5)
+            errors_listbox = tk.Listbox(errors_frame, font=("Inter", 10))
+            errors_scroll = ttk.Scrollbar(errors_frame, orient="vertical", command=errors_listbox.yview)
+            errors_listbox.configure(yscrollcommand=errors_scroll.set)
+            errors_listbox.pack(side="left", expand=True, fill="both")
+            errors_scroll.pack(side="right", fill="y")
+            errors_listbox.insert(tk.END, *[str(error) for error in result.errors])
+
+            close_btn = ttk.Button(card_frame_report, text="Close", style="TButton", command=report_window.destroy)
+            close_btn.pack(pady=10, padx=20, fill="x", ipady=5)
+            self.button_bind(close_btn)
+
+        self.task_runner.run(lambda task: import_students(self.db_file, file_path, self.blob_dir, task),
+                             on_success=imported, progress_title="Importing students...",
+                             on_error=lambda e: messagebox.showerror("Error", f"Error importing students: {e}", parent=self.root))
+
+    def check_storage(self):
+        scanner = StorageScanner(self.db_file, self.upload_dir, self.thumb_dir)
+
+        def scanned(report):
+            report_window = tk.Toplevel(self.root)
+            report_window.title("Storage Check")
+            report_window.geometry("760x540")
+            report_window.configure(bg="#F5F7FA")
+            report_window.transient(self.root)
+
+            card_frame_report = ttk.Frame(report_window, style="Card.TFrame")
+            card_frame_report.pack(expand=True, fill="both", padx=20, pady=20)
+            ttk.Label(card_frame_report, text="Storage Check", style="Heading.TLabel").pack(pady=10)
+            ttk.Label(card_frame_report, text=report.summary(), wraplength=680).pack(anchor="w", padx=20, pady=2)
+
+            files_frame = ttk.Frame(card_frame_report, style="Card.TFrame")
+            files_frame.pack(expand=True, fill="both", padx=20, pady=5)
+            files_listbox = tk.Listbox(files_frame, font=("Inter", 10))
+            files_scroll = ttk.Scrollbar(files_frame, orient="vertical", command=files_listbox.yview)
+            files_listbox.configure(yscrollcommand=files_scroll.set)
+            files_listbox.pack(side="left", expand=True, fill="both")
+            files_scroll.pack(side="right", fill="y")
+            files_listbox.insert(tk.END, *[f"Missing: {path} ({table}, student {student_id})"
+                                           for table, student_id, path in report.missing])
+            files_listbox.insert(tk.END, *[f"Damaged: {path} ({format_size(size)}, recorded {format_size(recorded_size)})"
+                                           for path, recorded_size, size in report.damaged])
+            files_listbox.insert(tk.END, *[f"Orphaned: {path} ({format_size(size)})" for path, size in report.orphaned])
+
+            def reclaim():
+                if not messagebox.askyesno("Confirm", f"Delete {len(report.orphaned)} orphaned files "
+                                           f"({format_size(report.orphaned_bytes)})?", parent=report_window):
                     return
+                report_window.destroy()
+
+                def reclaimed(result):
+                    removed, freed = result
+                    messagebox.showinfo("Success", f"Removed {removed} files and freed {format_size(freed)}.", parent=self.root)
 
-                with open(file_path, 'w', newline='') as csvfile:
-                    writer = csv.writer(csvfile)
-                    headers = ["ID", "Roll Number", "Batch From", "Batch To", "Original Batch To", "Name", "Email", "Department", "Supervisor",
-                               "Registration Date", "DOB", "Picture Path", "Title", "Publications"]
-                    writer.writerow(headers)
-                    for student in students:
-                        writer.writerow(student)
+                self.task_runner.run(lambda task: scanner.reclaim(report, task), on_success=reclaimed,
+                                     progress_title="Removing orphaned files...",
+                                     on_error=lambda e: messagebox.showerror("Error", f"Error removing files: {e}", parent=self.root))
 
-                messagebox.showinfo("Success", f"Student data exported to {file_path}!", parent=self.root)
-        except sqlite3.Error as e:
-            messagebox.showerror("Error", f"Error exporting to CSV: {e}", parent=self.root)
-        except Exception as e:
-            messagebox.showerror("Error", f"Error writing CSV: {e}", parent=self.root)
+            if report.orphaned or report.stale_rows:
+                reclaim_btn = ttk.Button(card_frame_report, text=f"Reclaim {format_size(report.orphaned_bytes)}",
+                                         style="Danger.TButton", command=reclaim)
+                reclaim_btn.pack(pady=10, padx=20, fill="x", ipady=5)
+                self.button_bind(reclaim_btn)
 
+            close_btn = ttk.Button(card_frame_report, text="Close", style="TButton", command=report_window.destroy)
+            close_btn.pack(pady=10, padx=20, fill="x", ipady=5)
+            self.button_bind(close_btn)
+
+        self.task_runner.run(lambda task: scanner.scan(task), on_success=scanned, progress_title="Scanning uploads...",
+                             on_error=lambda e: messagebox.showerror("Error", f"Error scanning uploads: {e}", parent=self.root))
+
+    @profile_screen
     def show_add_student(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        screen = self.screens.open("add_student", cache=False)
+        if screen is None:
+            return
 
-        card_frame, canvas = self.create_scrollable_frame(self.root)
+        card_frame, canvas = self.create_scrollable_frame(screen.frame)
         card_frame.configure(padding=30)
 
         ttk.Label(card_frame, text="Add New Student", style="Heading.TLabel").pack(pady=20)
@@ -402,102 +564,50 @@ class AdminUI:
         self.button_bind(synopsis_btn)
 
         def submit():
-            name = entries["Name"].get().strip()
-            roll_number = entries["Roll Number"].get().strip()
-            batch_from = entries["Batch From"].get().strip()
-            batch_to = entries["Batch To"].get().strip()
-            email = entries["Email"].get().strip()
-            dob_str = entries["Date of Birth (DD-MM-YYYY)"].get().strip()
-            department = entries["Department"].get().strip()
-            supervisor = entries["Supervisor"].get().strip()
-            registration_date_str = entries["Registration Date (DD-MM-YYYY)"].get().strip()
-            title = entries["Title"].get().strip()
-            publications = entries["Publications"].get().strip()
             pres_date_str = presentation_date.get().strip()
             progress = progress_notes.get().strip()
             pres_file = presentation_path.get()
-
             try:
-                dob = datetime.strptime(dob_str, "%d-%m-%Y").strftime("%Y-%m-%d") if dob_str else None
-                registration_date = datetime.strptime(registration_date_str, "%d-%m-%Y").strftime("%Y-%m-%d") if registration_date_str else None
-                pres_date = datetime.strptime(pres_date_str, "%d-%m-%Y").strftime("%Y-%m-%d") if pres_date_str else None
-            except ValueError:
-                messagebox.showerror("Error", "Invalid date format. Use DD-MM-YYYY.", parent=self.root)
+                student = StudentData.from_form(
+                    name=entries["Name"].get(),
+                    roll_number=entries["Roll Number"].get(),
+                    email=entries["Email"].get(),
+                    department=entries["Department"].get(),
+                    supervisor=entries["Supervisor"].get(),
+                    registration_date=entries["Registration Date (DD-MM-YYYY)"].get(),
+                    title=entries["Title"].get(),
+                    publications=entries["Publications"].get(),
+                    dob=entries["Date of Birth (DD-MM-YYYY)"].get(),
+                    batch_from=entries["Batch From"].get(),
+                    batch_to=entries["Batch To"].get(),
+                )
+                student.validate()
+                presentation = None
+                if pres_date_str or progress or pres_file:
+                    presentation = PresentationData.from_form(pres_date_str, progress, pres_file)
+                    presentation.validate()
+                synopsis = None
+                if synopsis_data.get('title') and synopsis_data.get('submission_date') and synopsis_data.get('abstract'):
+                    synopsis = SynopsisData.from_form(synopsis_data['title'], synopsis_data['submission_date'],
+                                                      synopsis_data['abstract'], synopsis_data.get('file_path'))
+                certificates = [CertificateData(cert['title'], cert['path']) for cert in certificates_data]
+            except ValidationError as e:
+                messagebox.showerror("Error", str(e), parent=self.root)
                 return
+            pic_path = picture_path.get()
 
-            try:
-                if batch_from:
-                    int(batch_from)
-                if batch_to:
-                    int(batch_to)
-            except ValueError:
-                messagebox.showerror("Error", "Batch From and To must be valid years.", parent=self.root)
-                return
+            # Runs on a worker thread: the inserts and stored files share one transaction, and a
+            # failed or cancelled upload rolls the rows back and removes the files already stored.
+            def save(task):
+                return self.service.add_student(student, picture=pic_path or None, presentation=presentation,
+                                                synopsis=synopsis, certificates=certificates, task=task)
 
-            if not all([name, roll_number, email, department, supervisor, registration_date, title, publications]):
-                messagebox.showerror("Error", "All fields except DOB, Batch, and presentation fields are required.", parent=self.root)
-                return
+            def saved(student_id):
+                messagebox.showinfo("Success", f"Student {student.name} added successfully with ID {student_id}!", parent=self.root)
+                self.show_admin_dashboard()
 
-            if (pres_date_str or progress or pres_file) and not all([pres_date_str, progress]):
-                messagebox.showerror("Error", "Presentation date and progress notes are required if adding a presentation.", parent=self.root)
-                return
-
-            pic_path = picture_path.get()
-            final_pic_path = None
-            final_pres_path = None
-            final_synopsis_path = None
-
-            try:
-                with sqlite3.connect(self.db_file) as conn:
-                    cursor = conn.cursor()
-                    cursor.execute('''
-                        INSERT INTO students (roll_number, batch_from, batch_to, original_batch_to, name, email, department, supervisor, registration_date, 
-                                            dob, picture_path, title, publications)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (roll_number, batch_from or None, batch_to or None, batch_to or None, name, email, department, supervisor, registration_date, 
-                          dob, None, title, publications))
-                    student_id = cursor.lastrowid
-
-                    if pic_path:
-                        final_pic_path = os.path.join(self.pic_dir, f"{student_id}_{roll_number}{os.path.splitext(pic_path)[1]}")
-                        shutil.copy(pic_path, final_pic_path)
-                    if pres_file and pres_date and progress:
-                        final_pres_path = os.path.join(self.present_dir, f"{student_id}_{pres_date.replace('-', '')}{os.path.splitext(pres_file)[1]}")
-                        shutil.copy(pres_file, final_pres_path)
-                        cursor.execute('''
-                            INSERT INTO presentations (student_id, presentation_date, progress_notes, presentation_file)
-                            VALUES (?, ?, ?, ?)
-                        ''', (student_id, pres_date, progress, final_pres_path))
-                    if synopsis_data.get('title') and synopsis_data.get('submission_date') and synopsis_data.get('abstract'):
-                        submission_date = datetime.strptime(synopsis_data['submission_date'], "%d-%m-%Y").strftime("%Y-%m-%d")
-                        if synopsis_data.get('file_path'):
-                            final_synopsis_path = os.path.join(self.synopsis_dir, f"{student_id}_{submission_date.replace('-', '')}.pdf")
-                            shutil.copy(synopsis_data['file_path'], final_synopsis_path)
-                        cursor.execute('''
-                            INSERT INTO synopsis (student_id, synopsis_title, submission_date, abstract, synopsis_file)
-                            VALUES (?, ?, ?, ?, ?)
-                        ''', (student_id, synopsis_data['title'], submission_date, synopsis_data['abstract'], final_synopsis_path))
-                    for cert in certificates_data:
-                        final_cert_path = os.path.join(self.cert_dir, f"{student_id}_{cert['title'].replace(' ', '_')}.pdf")
-                        shutil.copy(cert['path'], final_cert_path)
-                        cursor.execute('''
-                            INSERT INTO certificates (student_id, certificate_title, certificate_path)
-                            VALUES (?, ?, ?)
-                        ''', (student_id, cert['title'], final_cert_path))
-                    conn.commit()
-
-                    if final_pic_path:
-                        cursor.execute('''
-                            UPDATE students 
-                            SET picture_path = ?
-                            WHERE id = ?
-                        ''', (final_pic_path, student_id))
-                        conn.commit()
-
-                    messagebox.showinfo("Success", f"Student {name} added successfully with ID {student_id}!", parent=self.root)
-                    self.show_admin_dashboard()
-            except sqlite3.Error as e:
-                messagebox.showerror("Error", f"Error adding student: {e}", parent=self.root)
+            self.task_runner.run(save, on_success=saved, owner=card_frame, progress_title="Saving student...",
+                                 on_error=lambda e: messagebox.showerror("Error", error_message(e, "adding student"), parent=self.root))
 
         submit_btn = ttk.Button(card_frame, text="Submit", style="Danger.TButton", command=submit)
         submit_btn.pack(pady=20, padx=20, fill="x", ipady=5)
@@ -506,18 +616,18 @@ class AdminUI:
         cancel_btn.pack(pady=10, padx=20, fill="x", ipady=5)
         self.button_bind(cancel_btn)
 
-        canvas.bind_all("<MouseWheel>", lambda event: canvas.yview_scroll(int(-1 * (event.delta / 120)), "units"))
-        canvas.bind_all("<Button-4>", lambda event: canvas.yview_scroll(-1, "units"))
-        canvas.bind_all("<Button-5>", lambda event: canvas.yview_scroll(1, "units"))
+        self.screens.ready(screen, canvas)
         
         card_frame.update_idletasks()
         canvas.configure(scrollregion=canvas.bbox("all"))
 
+    @profile_screen
     def show_manage_presentations(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        screen = self.screens.open("manage_presentations", cache=False)
+        if screen is None:
+            return
 
-        card_frame, canvas = self.create_scrollable_frame(self.root)
+        card_frame, canvas = self.create_scrollable_frame(screen.frame)
         card_frame.configure(padding=30)
 
         ttk.Label(card_frame, text="Manage Presentations", style="Heading.TLabel").pack(pady=20)
@@ -525,239 +635,491 @@ class AdminUI:
         id_entry = ttk.Entry(card_frame)
         id_entry.pack(pady=10, padx=20, fill="x", ipady=5)
 
-        def load_presentations():
+        def open_student():
             try:
                 student_id = int(id_entry.get())
-                with sqlite3.connect(self.db_file) as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("SELECT name FROM students WHERE id = ?", (student_id,))
-                    student = cursor.fetchone()
-                    if not student:
-                        messagebox.showerror("Error", "Student not found.", parent=self.root)
-                        return
+            except ValueError:
+                messagebox.showerror("Error", "Invalid ID. Please enter a number.", parent=self.root)
+                return
+            load_presentations(student_id)
 
-                    for widget in card_frame.winfo_children():
-                        widget.destroy()
+        def load_presentations(student_id):
+            def load(task):
+                student = self.service.find_student(student_id)
+                return student, self.service.list_presentations(student_id) if student else []
 
-                    card_frame.configure(padding=30)
-                    ttk.Label(card_frame, text=f"Presentations for {student[0]}", style="Heading.TLabel").pack(pady=20)
-
-                    tree = ttk.Treeview(card_frame, columns=("ID", "Date", "Progress", "File"), show="headings")
-                    tree.heading("ID", text="ID")
-                    tree.heading("Date", text="Date")
-                    tree.heading("Progress", text="Progress Notes")
-                    tree.heading("File", text="File")
-                    tree.column("ID", width=50)
-                    tree.column("Date", width=100)
-                    tree.column("Progress", width=300)
-                    tree.column("File", width=200)
-                    tree.pack(fill="both", expand=True, padx=20, pady=10)
-
-                    presentations = self.get_student_presentations(student_id)
-                    for pres in presentations:
-                        file_status = os.path.basename(pres[4]) if pres[4] and os.path.exists(pres[4]) else "N/A"
-                        tree.insert("", "end", values=(pres[0], pres[2], pres[3], file_status))
-
-                    def view_file(event):
-                        selected = tree.selection()
-                        if not selected:
-                            return
-                        item = tree.item(selected[0])
-                        pres_id = item["values"][0]
-                        with sqlite3.connect(self.db_file) as conn:
-                            cursor = conn.cursor()
-                            cursor.execute("SELECT presentation_file FROM presentations WHERE id = ?", (pres_id,))
-                            file_path = cursor.fetchone()[0]
-                            if file_path and os.path.exists(file_path):
-                                webbrowser.open(f"file://{os.path.abspath(file_path)}")
-                            else:
-                                messagebox.showinfo("Info", "Presentation file not available.", parent=self.root)
-
-                    tree.bind("<<TreeviewSelect>>", view_file)
-
-                    ttk.Label(card_frame, text="Add New Presentation").pack(anchor="w", padx=20, pady=(20, 0))
-                    ttk.Label(card_frame, text="Presentation Date (DD-MM-YYYY)").pack(anchor="w", padx=20, pady=(10, 0))
-                    pres_date_entry = ttk.Entry(card_frame)
-                    pres_date_entry.pack(pady=10, padx=20, fill="x", ipady=5)
-                    ttk.Label(card_frame, text="Progress Notes").pack(anchor="w", padx=20, pady=(10, 0))
-                    progress_entry = ttk.Entry(card_frame)
-                    progress_entry.pack(pady=10, padx=20, fill="x", ipady=5)
-                    presentation_path = tk.StringVar()
-                    def select_presentation():
-                        path = filedialog.askopenfilename(filetypes=[("PDF files", "*.pdf"), ("PPT files", "*.ppt *.pptx")])
-                        if path:
-                            presentation_path.set(path)
-                        card_frame.winfo_toplevel().lift()  # Bring manage presentations window back to front
-                        card_frame.winfo_toplevel().grab_set()  # Restore focus
-
-                    pres_btn = ttk.Button(card_frame, text="Select Presentation File (PDF/PPT)", style="TButton", command=select_presentation)
-                    pres_btn.pack(pady=10, padx=20, fill="x", ipady=5)
-                    self.button_bind(pres_btn)
-
-                    def add_presentation():
-                        pres_date_str = pres_date_entry.get().strip()
-                        progress = progress_entry.get().strip()
-                        pres_file = presentation_path.get()
-                        try:
-                            pres_date = datetime.strptime(pres_date_str, "%d-%m-%Y").strftime("%Y-%m-%d") if pres_date_str else None
-                        except ValueError:
-                            messagebox.showerror("Error", "Invalid date format. Use DD-MM-YYYY.", parent=self.root)
-                            return
-                        if not all([pres_date, progress]):
-                            messagebox.showerror("Error", "Presentation date and progress notes are required.", parent=self.root)
-                            return
-                        final_pres_path = None
-                        if pres_file:
-                            final_pres_path = os.path.join(self.present_dir, f"{student_id}_{pres_date.replace('-', '')}{os.path.splitext(pres_file)[1]}")
-                            shutil.copy(pres_file, final_pres_path)
-                        try:
-                            with sqlite3.connect(self.db_file) as conn:
-                                cursor = conn.cursor()
-                                cursor.execute('''
-                                    INSERT INTO presentations (student_id, presentation_date, progress_notes, presentation_file)
-                                    VALUES (?, ?, ?, ?)
-                                ''', (student_id, pres_date, progress, final_pres_path))
-                                conn.commit()
-                                messagebox.showinfo("Success", "Presentation added successfully!", parent=self.root)
-                                load_presentations()
-                        except sqlite3.Error as e:
-                            messagebox.showerror("Error", f"Error adding presentation: {e}", parent=self.root)
-
-                    add_btn = ttk.Button(card_frame, text="Add Presentation", style="Danger.TButton", command=add_presentation)
-                    add_btn.pack(pady=20, padx=20, fill="x", ipady=5)
-                    self.button_bind(add_btn)
-
-                    back_btn = ttk.Button(card_frame, text="Back", style="TButton", command=self.show_admin_dashboard)
-                    back_btn.pack(pady=10, padx=20, fill="x", ipady=5)
-                    self.button_bind(back_btn)
+            self.task_runner.run(load, owner=card_frame, on_success=lambda result: show_presentations(student_id, *result),
+                                 on_error=lambda e: messagebox.showerror("Error", error_message(e, "fetching presentations"), parent=self.root))
 
-            except ValueError:
-                messagebox.showerror("Error", "Invalid ID. Please enter a number.", parent=self.root)
+        def show_presentations(student_id, student, presentations):
+            if not student:
+                messagebox.showerror("Error", "Student not found.", parent=self.root)
+                return
+            for widget in card_frame.winfo_children():
+                widget.destroy()
 
-        load_btn = ttk.Button(card_frame, text="Load Presentations", style="TButton", command=load_presentations)
+            card_frame.configure(padding=30)
+            ttk.Label(card_frame, text=f"Presentations for {student.name}", style="Heading.TLabel").pack(pady=20)
+
+            tree = ttk.Treeview(card_frame, columns=("ID", "Date", "Progress", "File"), show="headings")
+            tree.heading("ID", text="ID")
+            tree.heading("Date", text="Date")
+            tree.heading("Progress", text="Progress Notes")
+            tree.heading("File", text="File")
+            tree.column("ID", width=50)
+            tree.column("Date", width=100)
+            tree.column("Progress", width=300)
+            tree.column("File", width=200)
+            tree.pack(fill="both", expand=True, padx=20, pady=10)
+
+            # The presentation rows carry their file path, so opening one needs no further query
+            files = {}
+            for pres in presentations:
+                file_status = os.path.basename(pres[4]) if pres[4] and os.path.exists(pres[4]) else "N/A"
+                files[tree.insert("", "end", values=(pres[0], pres[2], pres[3], file_status))] = pres[4]
+
+            def view_file(event):
+                selected = tree.selection()
+                if not selected:
+                    return
+                file_path = files.get(selected[0])
+                if file_path and os.path.exists(file_path):
+                    webbrowser.open(f"file://{os.path.abspath(file_path)}")
+                else:
+                    messagebox.showinfo("Info", "Presentation file not available.", parent=self.root)
+
+            tree.bind("<<TreeviewSelect>>", view_file)
+
+            ttk.Label(card_frame, text="Add New Presentation").pack(anchor="w", padx=20, pady=(20, 0))
+            ttk.Label(card_frame, text="Presentation Date (DD-MM-YYYY)").pack(anchor="w", padx=20, pady=(10, 0))
+            pres_date_entry = ttk.Entry(card_frame)
+            pres_date_entry.pack(pady=10, padx=20, fill="x", ipady=5)
+            ttk.Label(card_frame, text="Progress Notes").pack(anchor="w", padx=20, pady=(10, 0))
+            progress_entry = ttk.Entry(card_frame)
+            progress_entry.pack(pady=10, padx=20, fill="x", ipady=5)
+            presentation_path = tk.StringVar()
+            def select_presentation():
+                path = filedialog.askopenfilename(filetypes=[("PDF files", "*.pdf"), ("PPT files", "*.ppt *.pptx")])
+                if path:
+                    presentation_path.set(path)
+                card_frame.winfo_toplevel().lift()  # Bring manage presentations window back to front
+                card_frame.winfo_toplevel().grab_set()  # Restore focus
+
+            pres_btn = ttk.Button(card_frame, text="Select Presentation File (PDF/PPT)", style="TButton", command=select_presentation)
+            pres_btn.pack(pady=10, padx=20, fill="x", ipady=5)
+            self.button_bind(pres_btn)
+
+            def add_presentation():
+                pres_date_str = pres_date_entry.get().strip()
+                progress = progress_entry.get().strip()
+                pres_file = presentation_path.get()
+                try:
+                    presentation = PresentationData.from_form(pres_date_str, progress, pres_file)
+                    presentation.validate()
+                except ValidationError as e:
+                    messagebox.showerror("Error", str(e), parent=self.root)
+                    return
+
+                def save(task):
+                    return self.service.add_presentation(student_id, presentation, task=task)
+
+                def saved(_):
+                    messagebox.showinfo("Success", "Presentation added successfully!", parent=self.root)
+                    load_presentations(student_id)
+
+                self.task_runner.run(save, on_success=saved, owner=card_frame, progress_title="Uploading presentation...",
+                                     on_error=lambda e: messagebox.showerror("Error", error_message(e, "adding presentation"), parent=self.root))
+
+            add_btn = ttk.Button(card_frame, text="Add Presentation", style="Danger.TButton", command=add_presentation)
+            add_btn.pack(pady=20, padx=20, fill="x", ipady=5)
+            self.button_bind(add_btn)
+
+            back_btn = ttk.Button(card_frame, text="Back", style="TButton", command=self.show_admin_dashboard)
+            back_btn.pack(pady=10, padx=20, fill="x", ipady=5)
+            self.button_bind(back_btn)
+
+        load_btn = ttk.Button(card_frame, text="Load Presentations", style="TButton", command=open_student)
         load_btn.pack(pady=20, padx=20, fill="x", ipady=5)
         self.button_bind(load_btn)
         back_btn = ttk.Button(card_frame, text="Back", style="TButton", command=self.show_admin_dashboard)
         back_btn.pack(pady=10, padx=20, fill="x", ipady=5)
         self.button_bind(back_btn)
 
-        canvas.bind_all("<MouseWheel>", lambda event: canvas.yview_scroll(int(-1 * (event.delta / 120)), "units"))
-        canvas.bind_all("<Button-4>", lambda event: canvas.yview_scroll(-1, "units"))
-        canvas.bind_all("<Button-5>", lambda event: canvas.yview_scroll(1, "units"))
+        self.screens.ready(screen, canvas)
         
         card_frame.update_idletasks()
         canvas.configure(scrollregion=canvas.bbox("all"))
 
-    def show_view_students(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
+    @profile_screen
+    def show_presentation_compliance(self):
+        screen = self.screens.open("presentation_compliance")
+        if screen is None:
+            return
 
-        card_frame, canvas = self.create_scrollable_frame(self.root)
+        card_frame, canvas = self.create_scrollable_frame(screen.frame)
         card_frame.configure(padding=30)
 
-        ttk.Label(card_frame, text="All Students", style="Heading.TLabel").pack(pady=20)
+        ttk.Label(card_frame, text="Presentation Compliance", style="Heading.TLabel").pack(pady=20)
+        ttk.Label(card_frame, text=f"A presentation is due every {PRESENTATION_INTERVAL_MONTHS} months after registration "
+                                   f"or the last presentation.", wraplength=620).pack(anchor="w", padx=20)
+
+        ttk.Label(card_frame, text="Department").pack(anchor="w", padx=20, pady=(10, 0))
+        department_entry = ttk.Entry(card_frame)
+        department_entry.pack(pady=10, padx=20, fill="x", ipady=5)
+        status_frame = ttk.Frame(card_frame, style="Card.TFrame")
+        status_frame.pack(fill="x", padx=20, pady=5)
+        status = tk.StringVar(value="")
+        for text, value in [("All", "")] + [(value.capitalize(), value) for value in COMPLIANCE_STATUSES]:
+            ttk.Radiobutton(status_frame, text=text, variable=status, value=value).pack(side="left", padx=(0, 10))
+
+        summary_label = ttk.Label(card_frame, text="", wraplength=620)
+        summary_label.pack(anchor="w", padx=20, pady=5)
+
+        list_frame = ttk.Frame(card_frame, style="Card.TFrame")
+        list_frame.pack(fill="both", expand=True, padx=20, pady=10)
+
+        # Rows come a page at a time as the user scrolls; clicking a heading sorts by that column in
+        # the query, so the order covers every student and not just the loaded pages
+        columns = [("student_id", "ID", 50), ("roll_number", "Roll No", 90), ("name", "Name", 150),
+                   ("department", "Department", 110), ("supervisor", "Supervisor", 120), ("presentations", "Held", 50),
+                   ("last_presentation", "Last", 90), ("next_due", "Next Due", 90),
+                   ("days_overdue", "Days Overdue", 90), ("missed", "Missed", 60), ("status", "Status", 80)]
+        tree = ttk.Treeview(list_frame, columns=[key for key, _, _ in columns], show="headings", height=15, selectmode="browse")
+        for key, heading, width in columns:
+            tree.heading(key, text=heading, command=lambda key=key: sort_by(key))
+            tree.column(key, width=width, stretch=key in ("name", "department", "supervisor"))
+        tree_scroll = ttk.Scrollbar(list_frame, orient="vertical", command=tree.yview)
+        tree.pack(side="left", fill="both", expand=True)
+        tree_scroll.pack(side="right", fill="y")
+
+        report = {"department": None, "status": None, "sort": "days_overdue", "descending": True, "offset": 0,
+                  "done": False, "loading": False, "generation": self.service.generation, "day": None, "run": 0}
+
+        def options():
+            return dict(department=report["department"], status=report["status"], sort=report["sort"],
+                        descending=report["descending"])
+
+        def load_page():
+            if report["done"] or report["loading"]:
+                return
+            report["loading"] = True
+            self.task_runner.run(lambda task, offset=report["offset"], opts=options():
+                                 self.service.presentation_compliance(limit=STUDENT_PAGE_SIZE, offset=offset, **opts),
+                                 on_success=lambda rows, run=report["run"]: add_page(rows, run),
+                                 on_error=lambda e, run=report["run"]: load_failed(e, run), owner=tree)
+
+        def add_page(rows, run):
+            if run != report["run"]:
+                return  # loaded before the filters or sort changed
+            report["loading"] = False
+            if len(rows) < STUDENT_PAGE_SIZE:
+                report["done"] = True
+            if not rows and not report["offset"]:
+                tree.insert("", "end", values=("", "", "No students found."))
+                return
+            for row in rows:
+                days_overdue = row.days_overdue if row.status == "overdue" else ""
+                tree.insert("", "end", values=(row.student_id, row.roll_number, row.name, row.department, row.supervisor,
+                                               row.presentations, row.last_presentation or "N/A", row.next_due or "N/A",
+                                               days_overdue, row.missed, row.status))
+            report["offset"] += len(rows)
+
+        def load_failed(e, run):
+            if run != report["run"]:
+                return
+            report["loading"] = False
+            report["done"] = True
+            messagebox.showerror("Error", error_message(e, "loading the compliance report"), parent=self.root)
+
+        def show_summary(summary, run):
+            if run != report["run"]:
+                return
+            counts = [f"{value.capitalize()}: {summary.get(value, 0)}" for value in COMPLIANCE_STATUSES]
+            summary_label.configure(text=f"{sum(summary.values())} students.    " + "    ".join(counts))
+
+        def reload():
+            report.update(offset=0, done=False, loading=False, generation=self.service.generation,
+                          day=datetime.now().date(), run=report["run"] + 1)
+            tree.delete(*tree.get_children())
+            for key, heading, _ in columns:
+                arrow = (" ▼" if report["descending"] else " ▲") if key == report["sort"] else ""
+                tree.heading(key, text=heading + arrow)
+            self.task_runner.run(lambda task, department=report["department"]: self.service.compliance_summary(department=department),
+                                 on_success=lambda summary, run=report["run"]: show_summary(summary, run),
+                                 on_error=lambda e, run=report["run"]: load_failed(e, run), owner=tree)
+            load_page()
+
+        def apply_filters():
+            report.update(department=department_entry.get().strip() or None, status=status.get() or None)
+            reload()
+
+        def sort_by(key):
+            # A second click on the same column reverses the order
+            if report["sort"] == key:
+                report["descending"] = not report["descending"]
+            else:
+                report.update(sort=key, descending=key in ("days_overdue", "missed"))
+            reload()
+
+        def on_tree_scroll(first, last):
+            tree_scroll.set(first, last)
+            if float(last) > 0.9:
+                load_page()
+
+        def scroll_tree(units):
+            tree.yview_scroll(units, "units")
+            return "break"
+
+        tree.configure(yscrollcommand=on_tree_scroll)
+        tree.bind("<MouseWheel>", lambda event: scroll_tree(int(-1 * (event.delta / 120))))
+        tree.bind("<Button-4>", lambda event: scroll_tree(-1))
+        tree.bind("<Button-5>", lambda event: scroll_tree(1))
+
+        apply_btn = ttk.Button(card_frame, text="Apply Filters", style="TButton", command=apply_filters)
+        apply_btn.pack(pady=10, padx=20, fill="x", ipady=5)
+        self.button_bind(apply_btn)
+
+        def export_report():
+            file_path = filedialog.asksaveasfilename(parent=self.root, defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
+            if not file_path:
+                return
 
-        students_frame = ttk.Frame(card_frame, style="Card.TFrame")
-        students_frame.pack(fill="both", expand=True, padx=20, pady=10)
+            def exported(count):
+                if not count:
+                    messagebox.showinfo("Info", "No students to export.", parent=self.root)
+                else:
+                    messagebox.showinfo("Success", f"Compliance report exported to {file_path}!", parent=self.root)
 
-        selected_student_id = tk.StringVar()
+            self.task_runner.run(lambda task, opts=options(): export_compliance(self.db_file, file_path, task, **opts),
+                                 on_success=exported, progress_title="Exporting compliance report...",
+                                 on_error=lambda e: messagebox.showerror("Error", f"Error exporting compliance report: {e}", parent=self.root))
 
-        try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM students")
-                students = cursor.fetchall()
+        export_btn = ttk.Button(card_frame, text="Export to CSV", style="TButton", command=export_report)
+        export_btn.pack(pady=10, padx=20, fill="x", ipady=5)
+        self.button_bind(export_btn)
 
-                if not students:
-                    ttk.Label(students_frame, text="No students found.", font=("Inter", 11)).pack(pady=10)
-                else:
-                    for idx, student in enumerate(students):
-                        student_frame = ttk.Frame(students_frame, style="Card.TFrame", borderwidth=1, relief="solid")
-                        student_frame.pack(fill="x", padx=10, pady=5, ipady=5)
-
-                        dob = student[10] if student[10] else "N/A"
-                        title = student[12] if student[12] else "N/A"
-                        publications = student[13] if student[13] else "N/A"
-                        batch_from = student[2] if student[2] else None
-                        batch_to = student[3] if student[3] else None
-                        original_batch_to = student[4] if student[4] else None
-
-                        batch_display = "N/A"
-                        if batch_from and batch_to:
-                            batch_display = f"{batch_from}-{batch_to}"
-                            if original_batch_to:
-                                try:
-                                    batch_to_int = int(batch_to)
-                                    original_batch_to_int = int(original_batch_to)
-                                    extension_years = batch_to_int - original_batch_to_int
-                                    if extension_years > 0:
-                                        batch_display += f" (Extended by {extension_years} year{'s' if extension_years != 1 else ''})"
-                                except ValueError:
-                                    pass
-
-                        fields = [
-                            f"ID: {student[0]}",
-                            f"Roll No: {student[1]}",
-                            f"Batch: {batch_display}",
-                            f"Name: {student[5]}",
-                            f"Email: {student[6]}",
-                            f"DOB: {dob}",
-                            f"Department: {student[7]}",
-                            f"Supervisor: {student[8]}",
-                            f"Registration Date: {student[9]}",
-                            f"Title: {title}",
-                            f"Publications: {publications}"
-                        ]
-
-                        for field in fields:
-                            ttk.Label(
-                                student_frame,
-                                text=field,
-                                font=("Inter", 11),
-                                wraplength=600
-                            ).pack(anchor="w", padx=10, pady=2)
-
-                        ttk.Radiobutton(
-                            student_frame,
-                            text="Select",
-                            variable=selected_student_id,
-                            value=str(student[0])
-                        ).pack(anchor="w", padx=10, pady=5)
+        back_btn = ttk.Button(card_frame, text="Back", style="TButton", command=self.show_admin_dashboard)
+        back_btn.pack(pady=10, padx=20, fill="x", ipady=5)
+        self.button_bind(back_btn)
+
+        def refresh():
+            # Coming back only reloads when something was written in between or the day has changed
+            if report["generation"] != self.service.generation or report["day"] != datetime.now().date():
+                reload()
+
+        reload()
+        self.screens.ready(screen, canvas, refresh=refresh)
+
+        card_frame.update_idletasks()
+        canvas.configure(scrollregion=canvas.bbox("all"))
+
+    @profile_screen
+    def show_view_students(self):
+        screen = self.screens.open("view_students")
+        if screen is None:
+            return
+
+        card_frame, canvas = self.create_scrollable_frame(screen.frame)
+        card_frame.configure(padding=30)
+
+        ttk.Label(card_frame, text="All Students", style="Heading.TLabel").pack(pady=20)
 
-        except sqlite3.Error as e:
-            messagebox.showerror("Error", f"Error viewing students: {e}", parent=self.root)
+        # Filter panel: each facet lists its values with how many students each would leave given the
+        # other selections, counted by the database, and choosing one narrows the list straight away
+        filter_frame = ttk.Frame(card_frame, style="Card.TFrame")
+        filter_frame.pack(fill="x", padx=20, pady=(0, 10))
+        facet_boxes, facet_values = {}, {}
+        for facet, label in [("department", "Department"), ("supervisor", "Supervisor"), ("extension", "Extension"),
+                             ("synopsis", "Synopsis"), ("certificates", "Certificates")]:
+            row = ttk.Frame(filter_frame, style="Card.TFrame")
+            row.pack(fill="x", pady=3)
+            ttk.Label(row, text=label, width=14).pack(side="left")
+            box = ttk.Combobox(row, state="readonly", values=["All"])
+            box.current(0)
+            box.pack(side="left", fill="x", expand=True)
+            box.bind("<<ComboboxSelected>>", lambda event: apply_filters())
+            facet_boxes[facet] = box
+            facet_values[facet] = [None]
+        batch_row = ttk.Frame(filter_frame, style="Card.TFrame")
+        batch_row.pack(fill="x", pady=3)
+        ttk.Label(batch_row, text="Batch (years)", width=14).pack(side="left")
+        batch_from_entry = ttk.Entry(batch_row, width=8)
+        batch_from_entry.pack(side="left")
+        ttk.Label(batch_row, text=" to ").pack(side="left")
+        batch_to_entry = ttk.Entry(batch_row, width=8)
+        batch_to_entry.pack(side="left")
+        for entry in (batch_from_entry, batch_to_entry):
+            entry.bind("<Return>", lambda event: apply_filters())
+        batch_label = ttk.Label(filter_frame, text="", wraplength=620)
+        batch_label.pack(anchor="w", pady=3)
+        match_label = ttk.Label(filter_frame, text="", font=("Inter", 11, "bold"))
+        match_label.pack(anchor="w", pady=3)
+        filter_buttons = ttk.Frame(filter_frame, style="Card.TFrame")
+        filter_buttons.pack(fill="x", pady=5)
+
+        list_frame = ttk.Frame(card_frame, style="Card.TFrame")
+        list_frame.pack(fill="both", expand=True, padx=20, pady=10)
+
+        # A Treeview only draws the rows in view, and rows are fetched a page at a time as the
+        # user scrolls, so opening the list costs the same however many students are enrolled.
+        columns = ("ID", "Roll No", "Name", "Batch", "Department", "Supervisor", "Email")
+        widths = (50, 100, 160, 170, 120, 140, 180)
+        tree = ttk.Treeview(list_frame, columns=columns, show="headings", height=15, selectmode="browse")
+        for column, width in zip(columns, widths):
+            tree.heading(column, text=column)
+            tree.column(column, width=width, stretch=column not in ("ID", "Roll No"))
+        tree_scroll = ttk.Scrollbar(list_frame, orient="vertical", command=tree.yview)
+        tree.pack(side="left", fill="both", expand=True)
+        tree_scroll.pack(side="right", fill="y")
+
+        page = {"last_id": 0, "done": False, "loading": False, "generation": self.service.generation,
+                "filter": FacetFilter(), "run": 0}
+
+        def load_page():
+            if page["done"] or page["loading"]:
+                return
+            page["loading"] = True
+            self.task_runner.run(lambda task, after_id=page["last_id"], facet_filter=page["filter"]:
+                                 self.service.filter_students(facet_filter, after_id, STUDENT_PAGE_SIZE),
+                                 on_success=lambda students, run=page["run"]: add_page(students, run),
+                                 on_error=lambda e, run=page["run"]: page_failed(e, run), owner=tree)
+
+        def add_page(students, run):
+            if run != page["run"]:
+                return  # loaded before a refresh or a filter change started over
+            page["loading"] = False
+            if len(students) < STUDENT_PAGE_SIZE:
+                page["done"] = True
+            if not students and not page["last_id"]:
+                tree.insert("", "end", values=("", "", "No students found."))
+                return
+            for student in students:
+                tree.insert("", "end", iid=str(student.id),
+                            values=(student.id, student.roll_number, student.name, format_batch(student.batch_from, student.batch_to, student.extension_years),
+                                    student.department, student.supervisor, student.email))
+            if students:
+                page["last_id"] = students[-1].id
+
+        def page_failed(e, run):
+            if run != page["run"]:
+                return
+            page["loading"] = False
+            page["done"] = True
+            messagebox.showerror("Error", error_message(e, "viewing students"), parent=self.root)
+
+        def facet_text(facet, value):
+            if facet == "certificates":
+                return "None" if value == 0 else ("3 or more" if value == CERTIFICATE_BUCKETS[-1] else str(value))
+            return value.capitalize() if facet in ("extension", "synopsis") else value
+
+        def show_counts(result, run):
+            if run != page["run"]:
+                return
+            total, counts = result
+            match_label.configure(text=f"{total} student{'s' if total != 1 else ''} match")
+            for facet, box in facet_boxes.items():
+                selected = facet_values[facet][box.current()] if box.current() >= 0 else None
+                values, texts = [None], ["All"]
+                for value, students in counts[facet]:
+                    values.append(value)
+                    texts.append(f"{facet_text(facet, value)} ({students})")
+                if selected is not None and selected not in values:
+                    # Nothing matches the selection with the other filters; keep it shown anyway
+                    values.append(selected)
+                    texts.append(f"{facet_text(facet, selected)} (0)")
+                facet_values[facet] = values
+                box.configure(values=texts)
+                box.current(values.index(selected))
+            batches = [f"{year} ({students})" for year, students in counts["batch"] if year is not None]
+            batch_label.configure(text="Batches starting: " + (", ".join(batches) if batches else "none"))
+
+        def reload():
+            page.update(last_id=0, done=False, loading=False, generation=self.service.generation, run=page["run"] + 1)
+            tree.delete(*tree.get_children())
+            for widget in image_frame.winfo_children():
+                widget.destroy()
+            self.task_runner.run(lambda task, facet_filter=page["filter"]: self.service.student_facets(facet_filter),
+                                 on_success=lambda result, run=page["run"]: show_counts(result, run),
+                                 on_error=lambda e, run=page["run"]: page_failed(e, run), owner=tree)
+            load_page()
+
+        def apply_filters():
+            years = [entry.get().strip() for entry in (batch_from_entry, batch_to_entry)]
+            if not all(year.isdigit() for year in years if year):
+                messagebox.showerror("Error", "Batch years must be whole numbers.", parent=self.root)
+                return
+            selected = {facet: facet_values[facet][box.current()] if box.current() >= 0 else None
+                        for facet, box in facet_boxes.items()}
+            page["filter"] = FacetFilter(batch_from=int(years[0]) if years[0] else None,
+                                         batch_to=int(years[1]) if years[1] else None, **selected)
+            reload()
+
+        def clear_filters():
+            for box in facet_boxes.values():
+                box.current(0)
+            for entry in (batch_from_entry, batch_to_entry):
+                entry.delete(0, tk.END)
+            apply_filters()
+
+        apply_btn = ttk.Button(filter_buttons, text="Apply Filters", style="TButton", command=apply_filters)
+        apply_btn.pack(side="left", fill="x", expand=True, padx=(0, 5), ipady=5)
+        self.button_bind(apply_btn)
+        clear_btn = ttk.Button(filter_buttons, text="Clear Filters", style="TButton", command=clear_filters)
+        clear_btn.pack(side="left", fill="x", expand=True, padx=(5, 0), ipady=5)
+        self.button_bind(clear_btn)
+
+        def on_tree_scroll(first, last):
+            tree_scroll.set(first, last)
+            if float(last) > 0.9:
+                load_page()
+
+        def scroll_tree(units):
+            tree.yview_scroll(units, "units")
+            return "break"
+
+        tree.configure(yscrollcommand=on_tree_scroll)
+        tree.bind("<MouseWheel>", lambda event: scroll_tree(int(-1 * (event.delta / 120))))
+        tree.bind("<Button-4>", lambda event: scroll_tree(-1))
+        tree.bind("<Button-5>", lambda event: scroll_tree(1))
 
         image_frame = ttk.Frame(card_frame, style="Card.TFrame")
         image_frame.pack(pady=10, fill="x", padx=20)
+        reload()
 
         def show_details():
             for widget in image_frame.winfo_children():
                 widget.destroy()
 
-            student_id = selected_student_id.get()
-            if not student_id:
+            selection = tree.selection()
+            if not selection or not selection[0].isdigit():
                 return
-
-            student_id = int(student_id)
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT picture_path FROM students WHERE id = ?", (student_id,))
-                pic_path = cursor.fetchone()[0]
-
-            if pic_path and os.path.exists(pic_path):
-                try:
-                    image = Image.open(pic_path)
-                    image = image.resize((150, 150), Image.LANCZOS)
-                    image = ImageTk.PhotoImage(image)
-                    img_label = ttk.Label(image_frame, image=image, background="#FFFFFF")
-                    img_label.image = image
-                    img_label.pack(pady=10)
-                except Exception as e:
-                    ttk.Label(image_frame, text=f"Unable to load picture: {e}", font=("Inter", 11)).pack(pady=10)
-            else:
-                ttk.Label(image_frame, text="Picture not available", font=("Inter", 11)).pack(pady=10)
-
-            certificates = self.get_student_certificates(student_id)
+            student_id = int(selection[0])
+            self.task_runner.run(lambda task: self.service.get_student(student_id), owner=image_frame,
+                                 on_success=lambda details: details_loaded(student_id, details),
+                                 on_error=lambda e: messagebox.showerror("Error", error_message(e, "loading student"), parent=self.root))
+
+        def details_loaded(student_id, details):
+            # Another student may have been selected while this one loaded
+            if not details or tree.selection()[:1] != (str(student_id),):
+                return
+            for widget in image_frame.winfo_children():
+                widget.destroy()
+            student = details.student
+            pic_path = student.picture_path
+
+            # The list only carries the short columns; the long ones are shown for the selection
+            fields = [
+                f"DOB: {student.dob if student.dob else 'N/A'}",
+                f"Registration Date: {student.registration_date}",
+                f"Title: {student.title if student.title else 'N/A'}",
+                f"Publications: {student.publications if student.publications else 'N/A'}"
+            ]
+            for field in fields:
+                ttk.Label(image_frame, text=field, font=("Inter", 11), wraplength=600).pack(anchor="w", padx=10, pady=2)
+
+            show_picture(self.task_runner, image_frame, pic_path, self.thumb_dir)
+
+            certificates = details.certificates
             if certificates:
                 ttk.Label(image_frame, text="Certificates:", font=("Inter", 11, "bold")).pack(pady=5)
                 for cert in certificates:
@@ -773,7 +1135,7 @@ class AdminUI:
             else:
                 ttk.Label(image_frame, text="No certificates recorded", font=("Inter", 11)).pack(pady=5)
 
-            synopsis = self.get_student_synopsis(student_id)
+            synopsis = details.synopsis
             if synopsis:
                 ttk.Label(image_frame, text="Synopsis:", font=("Inter", 11, "bold")).pack(pady=5)
                 synopsis_label = f"Title: {synopsis[2]}\nSubmission Date: {synopsis[3]}\nAbstract: {synopsis[4]}"
@@ -788,7 +1150,7 @@ class AdminUI:
             else:
                 ttk.Label(image_frame, text="No synopsis recorded", font=("Inter", 11)).pack(pady=5)
 
-            presentations = self.get_student_presentations(student_id)
+            presentations = details.presentations
             if presentations:
                 ttk.Label(image_frame, text="6-Month Presentations:", font=("Inter", 11, "bold")).pack(pady=5)
                 for pres in presentations:
@@ -807,23 +1169,29 @@ class AdminUI:
         show_details_btn = ttk.Button(card_frame, text="Show Details", style="TButton", command=show_details)
         show_details_btn.pack(pady=10, padx=20, fill="x", ipady=5)
         self.button_bind(show_details_btn)
+        tree.bind("<Double-1>", lambda event: show_details())
 
         back_btn = ttk.Button(card_frame, text="Back", style="TButton", command=self.show_admin_dashboard)
         back_btn.pack(pady=20, padx=20, fill="x", ipady=5)
         self.button_bind(back_btn)
 
-        canvas.bind_all("<MouseWheel>", lambda event: canvas.yview_scroll(int(-1 * (event.delta / 120)), "units"))
-        canvas.bind_all("<Button-4>", lambda event: canvas.yview_scroll(-1, "units"))
-        canvas.bind_all("<Button-5>", lambda event: canvas.yview_scroll(1, "units"))
+        def refresh():
+            # Coming back to the list only reloads it (and its counts) when something was written in between
+            if page["generation"] != self.service.generation:
+                reload()
+
+        self.screens.ready(screen, canvas, refresh=refresh)
         
         card_frame.update_idletasks()
         canvas.configure(scrollregion=canvas.bbox("all"))
 
+    @profile_screen
     def show_update_student(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        screen = self.screens.open("update_student", cache=False)
+        if screen is None:
+            return
 
-        card_frame, canvas = self.create_scrollable_frame(self.root)
+        card_frame, canvas = self.create_scrollable_frame(screen.frame)
         card_frame.configure(padding=20)
 
         ttk.Label(card_frame, text="Update Student", style="Heading.TLabel").pack(pady=10)
@@ -834,403 +1202,369 @@ class AdminUI:
         def load_student():
             try:
                 student_id = int(id_entry.get())
-                with sqlite3.connect(self.db_file) as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("SELECT * FROM students WHERE id = ?", (student_id,))
-                    student = cursor.fetchone()
-                    if not student:
-                        messagebox.showerror("Error", "Student not found.", parent=self.root)
-                        return
-
-                    for widget in card_frame.winfo_children():
-                        widget.destroy()
+            except ValueError:
+                messagebox.showerror("Error", "Invalid ID. Please enter a number.", parent=self.root)
+                return
+            self.task_runner.run(lambda task: self.service.get_student(student_id), owner=card_frame,
+                                 on_success=lambda details: show_student(student_id, details),
+                                 on_error=lambda e: messagebox.showerror("Error", error_message(e, "loading student"), parent=self.root))
+
+        def show_student(student_id, details):
+            student = details.student if details else None
+            if not student:
+                messagebox.showerror("Error", "Student not found.", parent=self.root)
+                return
 
-                    card_frame.configure(padding=20)
-                    ttk.Label(card_frame, text="Update Student", style="Heading.TLabel").pack(pady=10)
+            for widget in card_frame.winfo_children():
+                widget.destroy()
 
-                    fields = ["Name", "Roll Number", "Email", "Date of Birth (DD-MM-YYYY)", "Department", "Supervisor", 
-                              "Registration Date (DD-MM-YYYY)", "Title", "Publications"]
-                    entries = {}
-                    try:
-                        dob_display = datetime.strptime(student[10], "%Y-%m-%d").strftime("%d-%m-%Y") if student[10] else ""
-                    except (ValueError, TypeError):
-                        dob_display = student[10] if student[10] else ""
-                    try:
-                        reg_date_display = datetime.strptime(student[9], "%Y-%m-%d").strftime("%d-%m-%Y") if student[9] else ""
-                    except (ValueError, TypeError):
-                        reg_date_display = student[9] if student[9] else ""
-                    defaults = [student[5], student[1], student[6], dob_display, 
-                                student[7], student[8], reg_date_display, 
-                                student[12] if student[12] else "", 
-                                student[13] if student[13] else ""]
-                    for field, default in zip(fields, defaults):
-                        if field == "Roll Number":
-                            ttk.Label(card_frame, text=field).pack(anchor="w", padx=20, pady=(5, 0))
-                            entry = ttk.Entry(card_frame)
-                            entry.insert(0, default)
-                            entry.pack(pady=5, padx=20, fill="x", ipady=3)
-                            entries[field] = entry
-
-                            batch_frame = ttk.Frame(card_frame, style="Card.TFrame")
-                            batch_frame.pack(pady=5, padx=20, fill="x")
-                            
-                            ttk.Label(batch_frame, text="Batch From").pack(side="left", padx=(0, 10))
-                            batch_from_entry = ttk.Entry(batch_frame, width=10)
-                            batch_from_entry.insert(0, student[2] if student[2] else "")
-                            batch_from_entry.pack(side="left", padx=(0, 20))
-                            entries["Batch From"] = batch_from_entry
-                            
-                            ttk.Label(batch_frame, text="Batch To").pack(side="left", padx=(0, 10))
-                            batch_to_entry = ttk.Entry(batch_frame, width=10)
-                            batch_to_entry.insert(0, student[3] if student[3] else "")
-                            batch_to_entry.pack(side="left")
-                            entries["Batch To"] = batch_to_entry
-
-                            ttk.Label(batch_frame, text="Extend By (Years)").pack(side="left", padx=(20, 10))
-                            extension_entry = ttk.Entry(batch_frame, width=5)
-                            extension_entry.pack(side="left")
-                            extension_entry.insert(0, "0")
-
-                            def apply_extension():
-                                try:
-                                    years_to_extend = int(extension_entry.get())
-                                    if years_to_extend < 0:
-                                        messagebox.showerror("Error", "Extension years cannot be negative.", parent=self.root)
-                                        return
-                                    current_to = batch_to_entry.get().strip()
-                                    if not current_to:
-                                        messagebox.showerror("Error", "Please enter a Batch To year first.", parent=self.root)
-                                        return
-                                    to_year = int(current_to)
-                                    new_to_year = to_year + years_to_extend
-                                    batch_to_entry.delete(0, tk.END)
-                                    batch_to_entry.insert(0, str(new_to_year))
-                                except ValueError:
-                                    messagebox.showerror("Error", "Please enter a valid number of years to extend.", parent=self.root)
-
-                            extension_btn = ttk.Button(batch_frame, text="Apply Extension", style="TButton", command=apply_extension)
-                            extension_btn.pack(side="left", padx=(10, 0))
-                            self.button_bind(extension_btn)
-                        else:
-                            ttk.Label(card_frame, text=field).pack(anchor="w", padx=20, pady=(5, 0))
-                            entry = ttk.Entry(card_frame)
-                            entry.insert(0, default)
-                            entry.pack(pady=5, padx=20, fill="x", ipady=3)
-                            entries[field] = entry
-
-                    picture_path = tk.StringVar(value=student[11] if student[11] else "")
-                    certificates_data = []
-
-                    def select_picture():
-                        path = filedialog.askopenfilename(filetypes=[("Image files", "*.jpg *.png")])
-                        if path:
-                            picture_path.set(path)
-                        card_frame.winfo_toplevel().lift()  # Bring update student window back to front
-                        card_frame.winfo_toplevel().grab_set()  # Restore focus
-
-                    def update_certificates():
-                        certificates_window = tk.Toplevel(self.root)
-                        certificates_window.title("Update Certificates")
-                        certificates_window.geometry("600x600")
-                        certificates_window.configure(bg="#F5F7FA")
-                        certificates_window.transient(self.root)  # Set as transient to the main window
-                        certificates_window.grab_set()  # Ensure it stays in focus
-
-                        top_bar = ttk.Frame(certificates_window, style="Shadow.TFrame")
-                        top_bar.pack(fill="x", padx=20, pady=(10, 0))
-                        left_frame = ttk.Frame(top_bar, style="Shadow.TFrame")
-                        left_frame.pack(side="left", padx=10)
-                        project_label = ttk.Label(left_frame, text="PhD Management System", style="Project.TLabel")
-                        project_label.pack(anchor="w", pady=2)
-                        author_label = ttk.Label(left_frame, text="Project by: Avneet Kaur, B.Tech (CSE), 6th Sem", style="Author.TLabel")
-                        author_label.pack(anchor="w", pady=2)
-                        home_btn = ttk.Button(top_bar, text="Home", style="TextButton.TButton", 
-                                             command=self.show_admin_dashboard)
-                        home_btn.pack(side="right", pady=2, padx=10)
-                        self.button_bind(home_btn)
-                        logout_btn = ttk.Button(top_bar, text="Log Out", style="TextButton.TButton", 
-                                               command=self.show_login)
-                        logout_btn.pack(side="right", pady=2, padx=10)
-                        self.button_bind(logout_btn)
-
-                        card_frame_certs = ttk.Frame(certificates_window, style="Card.TFrame")
-                        card_frame_certs.pack(expand=True, fill="both", padx=20, pady=20)
-
-                        ttk.Label(card_frame_certs, text="Update Certificates", style="Heading.TLabel").pack(pady=20)
-
-                        certs_listbox = tk.Listbox(card_frame_certs, height=10, font=("Inter", 11))
-                        certs_listbox.pack(pady=10, padx=20, fill="both")
-
-                        existing_certs = self.get_student_certificates(student_id)
-                        for cert in existing_certs:
-                            certs_listbox.insert(tk.END, f"{cert[1]}: {os.path.basename(cert[2]) if cert[2] else 'N/A'}")
-
-                        ttk.Label(card_frame_certs, text="Certificate Title").pack(anchor="w", padx=20, pady=(10, 0))
-                        cert_title_entry = ttk.Entry(card_frame_certs)
-                        cert_title_entry.pack(pady=10, padx=20, fill="x", ipady=5)
-
-                        cert_file_path = tk.StringVar()
-                        def select_certificate_file():
-                            path = filedialog.askopenfilename(filetypes=[("PDF files", "*.pdf")])
-                            if path:
-                                cert_file_path.set(path)
-                            certificates_window.lift()  # Bring certificates window back to front
-                            certificates_window.grab_set()  # Restore focus to certificates window
-
-                        cert_file_btn = ttk.Button(card_frame_certs, text="Select Certificate PDF", style="TButton", command=select_certificate_file)
-                        cert_file_btn.pack(pady=10, padx=20, fill="x", ipady=5)
-                        self.button_bind(cert_file_btn)
-
-                        def add_certificate():
-                            title = cert_title_entry.get().strip()
-                            path = cert_file_path.get()
-                            if not title or not path:
-                                messagebox.showerror("Error", "Certificate title and file are required.", parent=certificates_window)
-                                return
-                            certificates_data.append({"title": title, "path": path})
-                            certs_listbox.insert(tk.END, f"{title}: {os.path.basename(path)}")
-                            cert_title_entry.delete(0, tk.END)
-                            cert_file_path.set("")
-                            messagebox.showinfo("Success", "Certificate added to list.", parent=certificates_window)
-
-                        add_cert_btn = ttk.Button(card_frame_certs, text="Add Certificate", style="TButton", command=add_certificate)
-                        add_cert_btn.pack(pady=10, padx=20, fill="x", ipady=5)
-                        self.button_bind(add_cert_btn)
-
-                        def save_certificates():
-                            messagebox.showinfo("Success", "Certificates saved. Submit student to finalize.", parent=certificates_window)
-                            certificates_window.destroy()
-
-                        save_btn = ttk.Button(card_frame_certs, text="Save Certificates", style="Danger.TButton", command=save_certificates)
-                        save_btn.pack(pady=20, padx=20, fill="x", ipady=5)
-                        self.button_bind(save_btn)
-
-                        cancel_btn = ttk.Button(card_frame_certs, text="Cancel", style="TButton", command=certificates_window.destroy)
-                        cancel_btn.pack(pady=10, padx=20, fill="x", ipady=5)
-                        self.button_bind(cancel_btn)
-
-                    pic_btn = ttk.Button(card_frame, text="Select Picture (JPG/PNG)", style="TButton", command=select_picture)
-                    pic_btn.pack(pady=5, padx=20, fill="x", ipady=3)
-                    self.button_bind(pic_btn)
-
-                    cert_btn = ttk.Button(card_frame, text="Update Certificates", style="TButton", command=update_certificates)
-                    cert_btn.pack(pady=5, padx=20, fill="x", ipady=3)
-                    self.button_bind(cert_btn)
-
-                    synopsis = self.get_student_synopsis(student_id)
-                    synopsis_data = {}
-                    if synopsis:
-                        ttk.Label(card_frame, text="Synopsis:", font=("Inter", 11, "bold")).pack(anchor="w", padx=20, pady=(5, 0))
-                        synopsis_label = f"Title: {synopsis[2]} | Submission Date: {synopsis[3]}"
-                        ttk.Label(card_frame, text=synopsis_label, font=("Inter", 10), wraplength=600).pack(anchor="w", padx=40, pady=2)
-                        if synopsis[5] and os.path.exists(synopsis[5]):
-                            synopsis_btn = ttk.Button(card_frame, text="View Synopsis PDF", style="TButton",
-                                                    command=lambda p=synopsis[5]: webbrowser.open(f"file://{os.path.abspath(p)}"))
-                            synopsis_btn.pack(pady=2, padx=40, fill="x", ipady=2)
-                            self.button_bind(synopsis_btn)
+            card_frame.configure(padding=20)
+            ttk.Label(card_frame, text="Update Student", style="Heading.TLabel").pack(pady=10)
 
-                    def update_synopsis():
-                        synopsis_window = tk.Toplevel(self.root)
-                        synopsis_window.title("Update Synopsis")
-                        synopsis_window.geometry("600x500")
-                        synopsis_window.configure(bg="#F5F7FA")
-                        synopsis_window.transient(self.root)  # Set as transient to the main window
-                        synopsis_window.grab_set()  # Ensure it stays in focus
-
-                        top_bar = ttk.Frame(synopsis_window, style="Shadow.TFrame")
-                        top_bar.pack(fill="x", padx=20, pady=(10, 0))
-                        left_frame = ttk.Frame(top_bar, style="Shadow.TFrame")
-                        left_frame.pack(side="left", padx=10)
-                        project_label = ttk.Label(left_frame, text="PhD Management System", style="Project.TLabel")
-                        project_label.pack(anchor="w", pady=2)
-                        author_label = ttk.Label(left_frame, text="Project by: Avneet Kaur, B.Tech (CSE), 6th Sem", style="Author.TLabel")
-                        author_label.pack(anchor="w", pady=2)
-                        home_btn = ttk.Button(top_bar, text="Home", style="TextButton.TButton", 
-                                             command=self.show_admin_dashboard)
-                        home_btn.pack(side="right", pady=2, padx=10)
-                        self.button_bind(home_btn)
-                        logout_btn = ttk.Button(top_bar, text="Log Out", style="TextButton.TButton", 
-                                               command=self.show_login)
-                        logout_btn.pack(side="right", pady=2, padx=10)
-                        self.button_bind(logout_btn)
-
-                        card_frame_synopsis = ttk.Frame(synopsis_window, style="Card.TFrame")
-                        card_frame_synopsis.pack(expand=True, fill="both", padx=20, pady=20)
-
-                        ttk.Label(card_frame_synopsis, text="Synopsis Details", style="Heading.TLabel").pack(pady=20)
-
-                        ttk.Label(card_frame_synopsis, text="Synopsis Title").pack(anchor="w", padx=20, pady=(10, 0))
-                        synopsis_title_entry = ttk.Entry(card_frame_synopsis)
-                        synopsis_title_entry.insert(0, synopsis[2] if synopsis else "")
-                        synopsis_title_entry.pack(pady=10, padx=20, fill="x", ipady=5)
-
-                        ttk.Label(card_frame_synopsis, text="Submission Date (DD-MM-YYYY)").pack(anchor="w", padx=20, pady=(10, 0))
-                        submission_date_entry = ttk.Entry(card_frame_synopsis)
-                        submission_date_entry.insert(0, datetime.strptime(synopsis[3], "%Y-%m-%d").strftime("%d-%m-%Y") if synopsis else "")
-                        submission_date_entry.pack(pady=10, padx=20, fill="x", ipady=5)
-
-                        ttk.Label(card_frame_synopsis, text="Abstract (4–5 lines)").pack(anchor="w", padx=20, pady=(10, 0))
-                        abstract_text = tk.Text(card_frame_synopsis, height=5, font=("Inter", 11))
-                        abstract_text.insert("1.0", synopsis[4] if synopsis else "")
-                        abstract_text.pack(pady=10, padx=20, fill="x")
-
-                        synopsis_file_path = tk.StringVar(value=synopsis[5] if synopsis else "")
-                        def select_synopsis_file():
-                            path = filedialog.askopenfilename(filetypes=[("PDF files", "*.pdf")])
-                            if path:
-                                synopsis_file_path.set(path)
-                            synopsis_window.lift()  # Bring synopsis window back to front
-                            synopsis_window.grab_set()  # Restore focus to synopsis window
-
-                        synopsis_file_btn = ttk.Button(card_frame_synopsis, text="Select Synopsis PDF (Optional)", style="TButton", command=select_synopsis_file)
-                        synopsis_file_btn.pack(pady=10, padx=20, fill="x", ipady=5)
-                        self.button_bind(synopsis_file_btn)
-
-                        def save_synopsis():
-                            synopsis_data['title'] = synopsis_title_entry.get().strip()
-                            synopsis_data['submission_date'] = submission_date_entry.get().strip()
-                            synopsis_data['abstract'] = abstract_text.get("1.0", tk.END).strip()
-                            synopsis_data['file_path'] = synopsis_file_path.get()
-                            
-                            if not all([synopsis_data['title'], synopsis_data['submission_date'], synopsis_data['abstract']]):
-                                messagebox.showerror("Error", "Synopsis Title, Submission Date, and Abstract are required.", parent=synopsis_window)
+            fields = ["Name", "Roll Number", "Email", "Date of Birth (DD-MM-YYYY)", "Department", "Supervisor", 
+                      "Registration Date (DD-MM-YYYY)", "Title", "Publications"]
+            entries = {}
+            try:
+                dob_display = datetime.strptime(student.dob, "%Y-%m-%d").strftime("%d-%m-%Y") if student.dob else ""
+            except (ValueError, TypeError):
+                dob_display = student.dob if student.dob else ""
+            try:
+                reg_date_display = datetime.strptime(student.registration_date, "%Y-%m-%d").strftime("%d-%m-%Y") if student.registration_date else ""
+            except (ValueError, TypeError):
+                reg_date_display = student.registration_date if student.registration_date else ""
+            defaults = [student.name, student.roll_number, student.email, dob_display, 
+                        student.department, student.supervisor, reg_date_display, 
+                        student.title if student.title else "", 
+                        student.publications if student.publications else ""]
+            for field, default in zip(fields, defaults):
+                if field == "Roll Number":
+                    ttk.Label(card_frame, text=field).pack(anchor="w", padx=20, pady=(5, 0))
+                    entry = ttk.Entry(card_frame)
+                    entry.insert(0, default)
+                    entry.pack(pady=5, padx=20, fill="x", ipady=3)
+                    entries[field] = entry
+
+                    batch_frame = ttk.Frame(card_frame, style="Card.TFrame")
+                    batch_frame.pack(pady=5, padx=20, fill="x")
+
+                    ttk.Label(batch_frame, text="Batch From").pack(side="left", padx=(0, 10))
+                    batch_from_entry = ttk.Entry(batch_frame, width=10)
+                    batch_from_entry.insert(0, student.batch_from if student.batch_from else "")
+                    batch_from_entry.pack(side="left", padx=(0, 20))
+                    entries["Batch From"] = batch_from_entry
+
+                    ttk.Label(batch_frame, text="Batch To").pack(side="left", padx=(0, 10))
+                    batch_to_entry = ttk.Entry(batch_frame, width=10)
+                    batch_to_entry.insert(0, student.batch_to if student.batch_to else "")
+                    batch_to_entry.pack(side="left")
+                    entries["Batch To"] = batch_to_entry
+
+                    ttk.Label(batch_frame, text="Extend By (Years)").pack(side="left", padx=(20, 10))
+                    extension_entry = ttk.Entry(batch_frame, width=5)
+                    extension_entry.pack(side="left")
+                    extension_entry.insert(0, "0")
+
+                    def apply_extension():
+                        try:
+                            years_to_extend = int(extension_entry.get())
+                            if years_to_extend < 0:
+                                messagebox.showerror("Error", "Extension years cannot be negative.", parent=self.root)
                                 return
-                            try:
-                                datetime.strptime(synopsis_data['submission_date'], "%d-%m-%Y")
-                            except ValueError:
-                                messagebox.showerror("Error", "Invalid date format. Use DD-MM-YYYY.", parent=synopsis_window)
+                            current_to = batch_to_entry.get().strip()
+                            if not current_to:
+                                messagebox.showerror("Error", "Please enter a Batch To year first.", parent=self.root)
                                 return
+                            to_year = int(current_to)
+                            new_to_year = to_year + years_to_extend
+                            batch_to_entry.delete(0, tk.END)
+                            batch_to_entry.insert(0, str(new_to_year))
+                        except ValueError:
+                            messagebox.showerror("Error", "Please enter a valid number of years to extend.", parent=self.root)
 
-                            messagebox.showinfo("Success", "Synopsis details saved. Submit student to finalize.", parent=synopsis_window)
-                            synopsis_window.destroy()
-
-                        save_btn = ttk.Button(card_frame_synopsis, text="Save Synopsis", style="Danger.TButton", command=save_synopsis)
-                        save_btn.pack(pady=20, padx=20, fill="x", ipady=5)
-                        self.button_bind(save_btn)
+                    extension_btn = ttk.Button(batch_frame, text="Apply Extension", style="TButton", command=apply_extension)
+                    extension_btn.pack(side="left", padx=(10, 0))
+                    self.button_bind(extension_btn)
+                else:
+                    ttk.Label(card_frame, text=field).pack(anchor="w", padx=20, pady=(5, 0))
+                    entry = ttk.Entry(card_frame)
+                    entry.insert(0, default)
+                    entry.pack(pady=5, padx=20, fill="x", ipady=3)
+                    entries[field] = entry
 
-                        cancel_btn = ttk.Button(card_frame_synopsis, text="Cancel", style="TButton", command=synopsis_window.destroy)
-                        cancel_btn.pack(pady=10, padx=20, fill="x", ipady=5)
-                        self.button_bind(cancel_btn)
+            picture_path = tk.StringVar(value=student.picture_path if student.picture_path else "")
+            certificates_data = []
 
-                    synopsis_btn = ttk.Button(card_frame, text="Update Synopsis", style="TButton", command=update_synopsis)
-                    synopsis_btn.pack(pady=5, padx=20, fill="x", ipady=3)
+            def select_picture():
+                path = filedialog.askopenfilename(filetypes=[("Image files", "*.jpg *.png")])
+                if path:
+                    picture_path.set(path)
+                card_frame.winfo_toplevel().lift()  # Bring update student window back to front
+                card_frame.winfo_toplevel().grab_set()  # Restore focus
+
+            def update_certificates():
+                certificates_window = tk.Toplevel(self.root)
+                certificates_window.title("Update Certificates")
+                certificates_window.geometry("600x600")
+                certificates_window.configure(bg="#F5F7FA")
+                certificates_window.transient(self.root)  # Set as transient to the main window
+                certificates_window.grab_set()  # Ensure it stays in focus
+
+                top_bar = ttk.Frame(certificates_window, style="Shadow.TFrame")
+                top_bar.pack(fill="x", padx=20, pady=(10, 0))
+                left_frame = ttk.Frame(top_bar, style="Shadow.TFrame")
+                left_frame.pack(side="left", padx=10)
+                project_label = ttk.Label(left_frame, text="PhD Management System", style="Project.TLabel")
+                project_label.pack(anchor="w", pady=2)
+                author_label = ttk.Label(left_frame, text="Project by: Avneet Kaur, B.Tech (CSE), 6th Sem", style="Author.TLabel")
+                author_label.pack(anchor="w", pady=2)
+                home_btn = ttk.Button(top_bar, text="Home", style="TextButton.TButton", 
+                                     command=self.show_admin_dashboard)
+                home_btn.pack(side="right", pady=2, padx=10)
+                self.button_bind(home_btn)
+                logout_btn = ttk.Button(top_bar, text="Log Out", style="TextButton.TButton", 
+                                       command=self.show_login)
+                logout_btn.pack(side="right", pady=2, padx=10)
+                self.button_bind(logout_btn)
+
+                card_frame_certs = ttk.Frame(certificates_window, style="Card.TFrame")
+                card_frame_certs.pack(expand=True, fill="both", padx=20, pady=20)
+
+                ttk.Label(card_frame_certs, text="Update Certificates", style="Heading.TLabel").pack(pady=20)
+
+                certs_listbox = tk.Listbox(card_frame_certs, height=10, font=("Inter", 11))
+                certs_listbox.pack(pady=10, padx=20, fill="both")
+
+                existing_certs = details.certificates
+                for cert in existing_certs:
+                    certs_listbox.insert(tk.END, f"{cert[1]}: {os.path.basename(cert[2]) if cert[2] else 'N/A'}")
+
+                ttk.Label(card_frame_certs, text="Certificate Title").pack(anchor="w", padx=20, pady=(10, 0))
+                cert_title_entry = ttk.Entry(card_frame_certs)
+                cert_title_entry.pack(pady=10, padx=20, fill="x", ipady=5)
+
+                cert_file_path = tk.StringVar()
+                def select_certificate_file():
+                    path = filedialog.askopenfilename(filetypes=[("PDF files", "*.pdf")])
+                    if path:
+                        cert_file_path.set(path)
+                    certificates_window.lift()  # Bring certificates window back to front
+                    certificates_window.grab_set()  # Restore focus to certificates window
+
+                cert_file_btn = ttk.Button(card_frame_certs, text="Select Certificate PDF", style="TButton", command=select_certificate_file)
+                cert_file_btn.pack(pady=10, padx=20, fill="x", ipady=5)
+                self.button_bind(cert_file_btn)
+
+                def add_certificate():
+                    title = cert_title_entry.get().strip()
+                    path = cert_file_path.get()
+                    if not title or not path:
+                        messagebox.showerror("Error", "Certificate title and file are required.", parent=certificates_window)
+                        return
+                    certificates_data.append({"title": title, "path": path})
+                    certs_listbox.insert(tk.END, f"{title}: {os.path.basename(path)}")
+                    cert_title_entry.delete(0, tk.END)
+                    cert_file_path.set("")
+                    messagebox.showinfo("Success", "Certificate added to list.", parent=certificates_window)
+
+                add_cert_btn = ttk.Button(card_frame_certs, text="Add Certificate", style="TButton", command=add_certificate)
+                add_cert_btn.pack(pady=10, padx=20, fill="x", ipady=5)
+                self.button_bind(add_cert_btn)
+
+                def save_certificates():
+                    messagebox.showinfo("Success", "Certificates saved. Submit student to finalize.", parent=certificates_window)
+                    certificates_window.destroy()
+
+                save_btn = ttk.Button(card_frame_certs, text="Save Certificates", style="Danger.TButton", command=save_certificates)
+                save_btn.pack(pady=20, padx=20, fill="x", ipady=5)
+                self.button_bind(save_btn)
+
+                cancel_btn = ttk.Button(card_frame_certs, text="Cancel", style="TButton", command=certificates_window.destroy)
+                cancel_btn.pack(pady=10, padx=20, fill="x", ipady=5)
+                self.button_bind(cancel_btn)
+
+            pic_btn = ttk.Button(card_frame, text="Select Picture (JPG/PNG)", style="TButton", command=select_picture)
+            pic_btn.pack(pady=5, padx=20, fill="x", ipady=3)
+            self.button_bind(pic_btn)
+
+            cert_btn = ttk.Button(card_frame, text="Update Certificates", style="TButton", command=update_certificates)
+            cert_btn.pack(pady=5, padx=20, fill="x", ipady=3)
+            self.button_bind(cert_btn)
+
+            synopsis = details.synopsis
+            synopsis_data = {}
+            if synopsis:
+                ttk.Label(card_frame, text="Synopsis:", font=("Inter", 11, "bold")).pack(anchor="w", padx=20, pady=(5, 0))
+                synopsis_label = f"Title: {synopsis[2]} | Submission Date: {synopsis[3]}"
+                ttk.Label(card_frame, text=synopsis_label, font=("Inter", 10), wraplength=600).pack(anchor="w", padx=40, pady=2)
+                if synopsis[5] and os.path.exists(synopsis[5]):
+                    synopsis_btn = ttk.Button(card_frame, text="View Synopsis PDF", style="TButton",
+                                            command=lambda p=synopsis[5]: webbrowser.open(f"file://{os.path.abspath(p)}"))
+                    synopsis_btn.pack(pady=2, padx=40, fill="x", ipady=2)
                     self.button_bind(synopsis_btn)
 
-                    ttk.Label(card_frame, text="Current Presentations:", font=("Inter", 11, "bold")).pack(anchor="w", padx=20, pady=(5, 0))
-                    presentations = self.get_student_presentations(student_id)
-                    if presentations:
-                        for pres in presentations:
-                            pres_label = f"Date: {pres[2]} | Progress: {pres[3]}"
-                            ttk.Label(card_frame, text=pres_label, font=("Inter", 10)).pack(anchor="w", padx=40, pady=1)
-                            if pres[4] and os.path.exists(pres[4]):
-                                pres_btn = ttk.Button(card_frame, text="View Presentation", style="TButton",
-                                                     command=lambda p=pres[4]: webbrowser.open(f"file://{os.path.abspath(p)}"))
-                                pres_btn.pack(pady=2, padx=40, fill="x", ipady=2)
-                                self.button_bind(pres_btn)
-                    else:
-                        ttk.Label(card_frame, text="No presentations recorded", font=("Inter", 10)).pack(anchor="w", padx=40, pady=1)
-
-                    ttk.Label(card_frame, text="Current Certificates:", font=("Inter", 11, "bold")).pack(anchor="w", padx=20, pady=(5, 0))
-                    certificates = self.get_student_certificates(student_id)
-                    if certificates:
-                        for cert in certificates:
-                            cert_label = f"Title: {cert[1]}"
-                            ttk.Label(card_frame, text=cert_label, font=("Inter", 10)).pack(anchor="w", padx=40, pady=1)
-                            if cert[2] and os.path.exists(cert[2]):
-                                cert_btn = ttk.Button(card_frame, text="View Certificate", style="TButton",
-                                                     command=lambda p=cert[2]: webbrowser.open(f"file://{os.path.abspath(p)}"))
-                                cert_btn.pack(pady=2, padx=40, fill="x", ipady=2)
-                                self.button_bind(cert_btn)
-                    else:
-                        ttk.Label(card_frame, text="No certificates recorded", font=("Inter", 10)).pack(anchor="w", padx=40, pady=1)
-
-                    def submit():
-                        name = entries["Name"].get().strip()
-                        roll_number = entries["Roll Number"].get().strip()
-                        batch_from = entries["Batch From"].get().strip()
-                        batch_to = entries["Batch To"].get().strip()
-                        email = entries["Email"].get().strip()
-                        dob_str = entries["Date of Birth (DD-MM-YYYY)"].get().strip()
-                        department = entries["Department"].get().strip()
-                        supervisor = entries["Supervisor"].get().strip()
-                        registration_date_str = entries["Registration Date (DD-MM-YYYY)"].get().strip()
-                        title = entries["Title"].get().strip()
-                        publications = entries["Publications"].get().strip()
+            def update_synopsis():
+                synopsis_window = tk.Toplevel(self.root)
+                synopsis_window.title("Update Synopsis")
+                synopsis_window.geometry("600x500")
+                synopsis_window.configure(bg="#F5F7FA")
+                synopsis_window.transient(self.root)  # Set as transient to the main window
+                synopsis_window.grab_set()  # Ensure it stays in focus
+
+                top_bar = ttk.Frame(synopsis_window, style="Shadow.TFrame")
+                top_bar.pack(fill="x", padx=20, pady=(10, 0))
+                left_frame = ttk.Frame(top_bar, style="Shadow.TFrame")
+                left_frame.pack(side="left", padx=10)
+                project_label = ttk.Label(left_frame, text="PhD Management System", style="Project.TLabel")
+                project_label.pack(anchor="w", pady=2)
+                author_label = ttk.Label(left_frame, text="Project by: Avneet Kaur, B.Tech (CSE), 6th Sem", style="Author.TLabel")
+                author_label.pack(anchor="w", pady=2)
+                home_btn = ttk.Button(top_bar, text="Home", style="TextButton.TButton", 
+                                     command=self.show_admin_dashboard)
+                home_btn.pack(side="right", pady=2, padx=10)
+                self.button_bind(home_btn)
+                logout_btn = ttk.Button(top_bar, text="Log Out", style="TextButton.TButton", 
+                                       command=self.show_login)
+                logout_btn.pack(side="right", pady=2, padx=10)
+                self.button_bind(logout_btn)
+
+                card_frame_synopsis = ttk.Frame(synopsis_window, style="Card.TFrame")
+                card_frame_synopsis.pack(expand=True, fill="both", padx=20, pady=20)
+
+                ttk.Label(card_frame_synopsis, text="Synopsis Details", style="Heading.TLabel").pack(pady=20)
+
+                ttk.Label(card_frame_synopsis, text="Synopsis Title").pack(anchor="w", padx=20, pady=(10, 0))
+                synopsis_title_entry = ttk.Entry(card_frame_synopsis)
+                synopsis_title_entry.insert(0, synopsis[2] if synopsis else "")
+                synopsis_title_entry.pack(pady=10, padx=20, fill="x", ipady=5)
+
+                ttk.Label(card_frame_synopsis, text="Submission Date (DD-MM-YYYY)").pack(anchor="w", padx=20, pady=(10, 0))
+                submission_date_entry = ttk.Entry(card_frame_synopsis)
+                submission_date_entry.insert(0, datetime.strptime(synopsis[3], "%Y-%m-%d").strftime("%d-%m-%Y") if synopsis else "")
+                submission_date_entry.pack(pady=10, padx=20, fill="x", ipady=5)
+
+                ttk.Label(card_frame_synopsis, text="Abstract (4–5 lines)").pack(anchor="w", padx=20, pady=(10, 0))
+                abstract_text = tk.Text(card_frame_synopsis, height=5, font=("Inter", 11))
+                abstract_text.insert("1.0", synopsis[4] if synopsis else "")
+                abstract_text.pack(pady=10, padx=20, fill="x")
+
+                synopsis_file_path = tk.StringVar(value=synopsis[5] if synopsis else "")
+                def select_synopsis_file():
+                    path = filedialog.askopenfilename(filetypes=[("PDF files", "*.pdf")])
+                    if path:
+                        synopsis_file_path.set(path)
+                    synopsis_window.lift()  # Bring synopsis window back to front
+                    synopsis_window.grab_set()  # Restore focus to synopsis window
+
+                synopsis_file_btn = ttk.Button(card_frame_synopsis, text="Select Synopsis PDF (Optional)", style="TButton", command=select_synopsis_file)
+                synopsis_file_btn.pack(pady=10, padx=20, fill="x", ipady=5)
+                self.button_bind(synopsis_file_btn)
+
+                def save_synopsis():
+                    synopsis_data['title'] = synopsis_title_entry.get().strip()
+                    synopsis_data['submission_date'] = submission_date_entry.get().strip()
+                    synopsis_data['abstract'] = abstract_text.get("1.0", tk.END).strip()
+                    synopsis_data['file_path'] = synopsis_file_path.get()
+
+                    if not all([synopsis_data['title'], synopsis_data['submission_date'], synopsis_data['abstract']]):
+                        messagebox.showerror("Error", "Synopsis Title, Submission Date, and Abstract are required.", parent=synopsis_window)
+                        return
+                    try:
+                        datetime.strptime(synopsis_data['submission_date'], "%d-%m-%Y")
+                    except ValueError:
+                        messagebox.showerror("Error", "Invalid date format. Use DD-MM-YYYY.", parent=synopsis_window)
+                        return
 
-                        try:
-                            dob = datetime.strptime(dob_str, "%d-%m-%Y").strftime("%Y-%m-%d") if dob_str else None
-                            registration_date = datetime.strptime(registration_date_str, "%d-%m-%Y").strftime("%Y-%m-%d") if registration_date_str else None
-                        except ValueError:
-                            messagebox.showerror("Error", "Invalid date format. Use DD-MM-YYYY.", parent=self.root)
-                            return
+                    messagebox.showinfo("Success", "Synopsis details saved. Submit student to finalize.", parent=synopsis_window)
+                    synopsis_window.destroy()
 
-                        try:
-                            if batch_from:
-                                int(batch_from)
-                            if batch_to:
-                                int(batch_to)
-                        except ValueError:
-                            messagebox.showerror("Error", "Batch From and To must be valid years.", parent=self.root)
-                            return
+                save_btn = ttk.Button(card_frame_synopsis, text="Save Synopsis", style="Danger.TButton", command=save_synopsis)
+                save_btn.pack(pady=20, padx=20, fill="x", ipady=5)
+                self.button_bind(save_btn)
 
-                        if not all([name, roll_number, email, department, supervisor, registration_date, title, publications]):
-                            messagebox.showerror("Error", "All fields except DOB and Batch are required.", parent=self.root)
-                            return
+                cancel_btn = ttk.Button(card_frame_synopsis, text="Cancel", style="TButton", command=synopsis_window.destroy)
+                cancel_btn.pack(pady=10, padx=20, fill="x", ipady=5)
+                self.button_bind(cancel_btn)
 
-                        pic_path = picture_path.get()
-                        final_pic_path = student[11]
-                        final_synopsis_path = synopsis[5] if synopsis else None
+            synopsis_btn = ttk.Button(card_frame, text="Update Synopsis", style="TButton", command=update_synopsis)
+            synopsis_btn.pack(pady=5, padx=20, fill="x", ipady=3)
+            self.button_bind(synopsis_btn)
 
-                        try:
-                            with sqlite3.connect(self.db_file) as conn:
-                                cursor = conn.cursor()
-                                if pic_path and pic_path != student[11]:
-                                    final_pic_path = os.path.join(self.pic_dir, f"{student_id}_{roll_number}{os.path.splitext(pic_path)[1]}")
-                                    shutil.copy(pic_path, final_pic_path)
-                                cursor.execute('''
-                                    UPDATE students 
-                                    SET roll_number = ?, batch_from = ?, batch_to = ?, name = ?, email = ?, department = ?, 
-                                        supervisor = ?, registration_date = ?, dob = ?, picture_path = ?, 
-                                        title = ?, publications = ?
-                                    WHERE id = ?
-                                ''', (roll_number, batch_from or None, batch_to or None, name, email, department, supervisor, 
-                                      registration_date, dob, final_pic_path, title, publications, student_id))
-                                
-                                if certificates_data:
-                                    cursor.execute("DELETE FROM certificates WHERE student_id = ?", (student_id,))
-                                    for cert in certificates_data:
-                                        final_cert_path = os.path.join(self.cert_dir, f"{student_id}_{cert['title'].replace(' ', '_')}.pdf")
-                                        shutil.copy(cert['path'], final_cert_path)
-                                        cursor.execute('''
-                                            INSERT INTO certificates (student_id, certificate_title, certificate_path)
-                                            VALUES (?, ?, ?)
-                                        ''', (student_id, cert['title'], final_cert_path))
-                                
-                                if synopsis_data.get('title') and synopsis_data.get('submission_date') and synopsis_data.get('abstract'):
-                                    submission_date = datetime.strptime(synopsis_data['submission_date'], "%d-%m-%Y").strftime("%Y-%m-%d")
-                                    if synopsis_data.get('file_path') and synopsis_data.get('file_path') != (synopsis[5] if synopsis else None):
-                                        final_synopsis_path = os.path.join(self.synopsis_dir, f"{student_id}_{submission_date.replace('-', '')}.pdf")
-                                        shutil.copy(synopsis_data['file_path'], final_synopsis_path)
-                                    cursor.execute('''
-                                        INSERT OR REPLACE INTO synopsis (id, student_id, synopsis_title, submission_date, abstract, synopsis_file)
-                                        VALUES ((SELECT id FROM synopsis WHERE student_id = ?), ?, ?, ?, ?, ?)
-                                    ''', (student_id, student_id, synopsis_data['title'], submission_date, synopsis_data['abstract'], final_synopsis_path))
-                                
-                                conn.commit()
-                                messagebox.showinfo("Success", f"Student {name} updated successfully!", parent=self.root)
-                                self.show_admin_dashboard()
-                        except sqlite3.Error as e:
-                            messagebox.showerror("Error", f"Error updating student: {e}", parent=self.root)
-
-                    submit_btn = ttk.Button(card_frame, text="Submit", style="Danger.TButton", command=submit)
-                    submit_btn.pack(pady=20, padx=20, fill="x", ipady=5)
-                    self.button_bind(submit_btn)
-                    cancel_btn = ttk.Button(card_frame, text="Cancel", style="TButton", command=self.show_admin_dashboard)
-                    cancel_btn.pack(pady=10, padx=20, fill="x", ipady=5)
-                    self.button_bind(cancel_btn)
+            ttk.Label(card_frame, text="Current Presentations:", font=("Inter", 11, "bold")).pack(anchor="w", padx=20, pady=(5, 0))
+            presentations = details.presentations
+            if presentations:
+                for pres in presentations:
+                    pres_label = f"Date: {pres[2]} | Progress: {pres[3]}"
+                    ttk.Label(card_frame, text=pres_label, font=("Inter", 10)).pack(anchor="w", padx=40, pady=1)
+                    if pres[4] and os.path.exists(pres[4]):
+                        pres_btn = ttk.Button(card_frame, text="View Presentation", style="TButton",
+                                             command=lambda p=pres[4]: webbrowser.open(f"file://{os.path.abspath(p)}"))
+                        pres_btn.pack(pady=2, padx=40, fill="x", ipady=2)
+                        self.button_bind(pres_btn)
+            else:
+                ttk.Label(card_frame, text="No presentations recorded", font=("Inter", 10)).pack(anchor="w", padx=40, pady=1)
 
-            except ValueError:
-                messagebox.showerror("Error", "Invalid ID. Please enter a number.", parent=self.root)
+            ttk.Label(card_frame, text="Current Certificates:", font=("Inter", 11, "bold")).pack(anchor="w", padx=20, pady=(5, 0))
+            certificates = details.certificates
+            if certificates:
+                for cert in certificates:
+                    cert_label = f"Title: {cert[1]}"
+                    ttk.Label(card_frame, text=cert_label, font=("Inter", 10)).pack(anchor="w", padx=40, pady=1)
+                    if cert[2] and os.path.exists(cert[2]):
+                        cert_btn = ttk.Button(card_frame, text="View Certificate", style="TButton",
+                                             command=lambda p=cert[2]: webbrowser.open(f"file://{os.path.abspath(p)}"))
+                        cert_btn.pack(pady=2, padx=40, fill="x", ipady=2)
+                        self.button_bind(cert_btn)
+            else:
+                ttk.Label(card_frame, text="No certificates recorded", font=("Inter", 10)).pack(anchor="w", padx=40, pady=1)
+
+            def submit():
+                try:
+                    updated = StudentData.from_form(
+                        name=entries["Name"].get(),
+                        roll_number=entries["Roll Number"].get(),
+                        email=entries["Email"].get(),
+                        department=entries["Department"].get(),
+                        supervisor=entries["Supervisor"].get(),
+                        registration_date=entries["Registration Date (DD-MM-YYYY)"].get(),
+                        title=entries["Title"].get(),
+                        publications=entries["Publications"].get(),
+                        dob=entries["Date of Birth (DD-MM-YYYY)"].get(),
+                        batch_from=entries["Batch From"].get(),
+                        batch_to=entries["Batch To"].get(),
+                    )
+                    updated.validate()
+                    new_synopsis = None
+                    if synopsis_data.get('title') and synopsis_data.get('submission_date') and synopsis_data.get('abstract'):
+                        # Keep the current PDF unless a different one was picked
+                        synopsis_file = synopsis_data.get('file_path')
+                        if synopsis_file == (synopsis[5] if synopsis else None):
+                            synopsis_file = None
+                        new_synopsis = SynopsisData.from_form(synopsis_data['title'], synopsis_data['submission_date'],
+                                                              synopsis_data['abstract'], synopsis_file)
+                    certificates = [CertificateData(cert['title'], cert['path']) for cert in certificates_data] or None
+                except ValidationError as e:
+                    messagebox.showerror("Error", str(e), parent=self.root)
+                    return
+                pic_path = picture_path.get()
+                new_picture = pic_path if pic_path and pic_path != student.picture_path else None
+
+                def save(task):
+                    self.service.update_student(student_id, updated, picture=new_picture, synopsis=new_synopsis,
+                                                certificates=certificates, task=task)
+
+                def saved(_):
+                    messagebox.showinfo("Success", f"Student {updated.name} updated successfully!", parent=self.root)
+                    self.show_admin_dashboard()
+
+                self.task_runner.run(save, on_success=saved, owner=card_frame, progress_title="Saving student...",
+                                     on_error=lambda e: messagebox.showerror("Error", error_message(e, "updating student"), parent=self.root))
+
+            submit_btn = ttk.Button(card_frame, text="Submit", style="Danger.TButton", command=submit)
+            submit_btn.pack(pady=20, padx=20, fill="x", ipady=5)
+            self.button_bind(submit_btn)
+            cancel_btn = ttk.Button(card_frame, text="Cancel", style="TButton", command=self.show_admin_dashboard)
+            cancel_btn.pack(pady=10, padx=20, fill="x", ipady=5)
+            self.button_bind(cancel_btn)
 
         load_btn = ttk.Button(card_frame, text="Load Student", style="TButton", command=load_student)
         load_btn.pack(pady=20, padx=20, fill="x", ipady=5)
@@ -1239,79 +1573,121 @@ class AdminUI:
         back_btn.pack(pady=10, padx=20, fill="x", ipady=5)
         self.button_bind(back_btn)
 
-        canvas.bind_all("<MouseWheel>", lambda event: canvas.yview_scroll(int(-1 * (event.delta / 120)), "units"))
-        canvas.bind_all("<Button-4>", lambda event: canvas.yview_scroll(-1, "units"))
-        canvas.bind_all("<Button-5>", lambda event: canvas.yview_scroll(1, "units"))
+        self.screens.ready(screen, canvas)
         
         card_frame.update_idletasks()
         canvas.configure(scrollregion=canvas.bbox("all"))
 
+    @profile_screen
     def show_delete_student(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        screen = self.screens.open("delete_student", cache=False)
+        if screen is None:
+            return
 
-        card_frame, canvas = self.create_scrollable_frame(self.root)
+        card_frame, canvas = self.create_scrollable_frame(screen.frame)
         card_frame.configure(padding=30)
 
-        ttk.Label(card_frame, text="Delete Student", style="Heading.TLabel").pack(pady=20)
-        ttk.Label(card_frame, text="Student ID").pack(anchor="w", padx=20, pady=(10, 0))
+        ttk.Label(card_frame, text="Delete Students", style="Heading.TLabel").pack(pady=20)
+        ttk.Label(card_frame, text="Student IDs (e.g. 4, 7, 10-15)").pack(anchor="w", padx=20, pady=(10, 0))
         id_entry = ttk.Entry(card_frame)
         id_entry.pack(pady=10, padx=20, fill="x", ipady=5)
+        archive = tk.BooleanVar(value=False)
+        ttk.Checkbutton(card_frame, text="Archive their records to a ZIP before deleting", variable=archive).pack(anchor="w", padx=20, pady=(10, 2))
 
-        def delete_student():
+        def confirm_and_delete(student_ids=None, student_filter=None):
             try:
-                student_id = int(id_entry.get())
-                with sqlite3.connect(self.db_file) as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("SELECT name, picture_path FROM students WHERE id = ?", (student_id,))
-                    student = cursor.fetchone()
-                    if not student:
-                        messagebox.showerror("Error", "Student not found.", parent=self.root)
-                        return
+                ids = self.service.select_students(student_ids, student_filter)
+            except (ServiceError, sqlite3.Error) as e:
+                messagebox.showerror("Error", error_message(e, "selecting students"), parent=self.root)
+                return
+            if not ids:
+                messagebox.showerror("Error", "Student not found." if student_ids else "No students match the filter.", parent=self.root)
+                return
+            name = self.service.find_student(ids[0]).name if len(ids) == 1 else None
+            if name:
+                question = f"Are you sure you want to delete {name}?"
+            else:
+                question = (f"Are you sure you want to delete {len(ids)} students with their presentations, "
+                            f"synopses, certificates and files?")
+            if not messagebox.askyesno("Confirm", question, parent=self.root):
+                return
+            archive_path = None
+            if archive.get():
+                archive_path = filedialog.asksaveasfilename(parent=self.root, defaultextension=".zip", filetypes=[("ZIP archives", "*.zip")])
+                if not archive_path:
+                    return
 
-                    if messagebox.askyesno("Confirm", f"Are you sure you want to delete {student[0]}?", parent=self.root):
-                        cursor.execute("DELETE FROM students WHERE id = ?", (student_id,))
-                        cursor.execute("DELETE FROM presentations WHERE student_id = ?", (student_id,))
-                        cursor.execute("DELETE FROM synopsis WHERE student_id = ?", (student_id,))
-                        cursor.execute("DELETE FROM certificates WHERE student_id = ?", (student_id,))
-                        conn.commit()
-                        if student[1] and os.path.exists(student[1]):
-                            os.remove(student[1])
-                        messagebox.showinfo("Success", f"Student {student[0]} deleted successfully!", parent=self.root)
-                        self.show_admin_dashboard()
-            except ValueError:
-                messagebox.showerror("Error", "Invalid ID. Please enter a number.", parent=self.root)
-            except sqlite3.Error as e:
-                messagebox.showerror("Error", f"Error deleting student: {e}", parent=self.root)
+            def deleted(deleted_ids):
+                if name and len(deleted_ids) == 1:
+                    messagebox.showinfo("Success", f"Student {name} deleted successfully!", parent=self.root)
+                else:
+                    messagebox.showinfo("Success", f"{len(deleted_ids)} students deleted successfully!", parent=self.root)
+                self.show_admin_dashboard()
+
+            self.task_runner.run(lambda task: self.service.delete_students(student_ids, student_filter, archive_path, task),
+                                 on_success=deleted, owner=card_frame, progress_title="Deleting students...",
+                                 on_error=lambda e: messagebox.showerror("Error", error_message(e, "deleting students"), parent=self.root))
+
+        def delete_by_id():
+            try:
+                student_ids = parse_id_list(id_entry.get())
+            except ValidationError as e:
+                messagebox.showerror("Error", str(e), parent=self.root)
+                return
+            confirm_and_delete(student_ids=student_ids)
 
-        delete_btn = ttk.Button(card_frame, text="Delete", style="Danger.TButton", command=delete_student)
-        delete_btn.pack(pady=20, padx=20, fill="x", ipady=5)
+        def delete_by_filter():
+            try:
+                student_filter = StudentFilter.from_form(**{key: entry.get() for key, entry in filter_entries.items()})
+                student_filter.validate()
+            except ValidationError as e:
+                messagebox.showerror("Error", str(e), parent=self.root)
+                return
+            confirm_and_delete(student_filter=student_filter)
+
+        delete_btn = ttk.Button(card_frame, text="Delete by ID", style="Danger.TButton", command=delete_by_id)
+        delete_btn.pack(pady=10, padx=20, fill="x", ipady=5)
         self.button_bind(delete_btn)
+
+        ttk.Label(card_frame, text="Or delete every student matching", style="Heading.TLabel").pack(anchor="w", padx=20, pady=(20, 0))
+        filter_entries = {}
+        for key, label in [("batch_to_before", "Batch To before (year)"), ("department", "Department"),
+                           ("supervisor", "Supervisor"), ("registered_from", "Registered on or after (DD-MM-YYYY)"),
+                           ("registered_before", "Registered before (DD-MM-YYYY)"),
+                           ("min_extension", "Extended by at least (years)")]:
+            ttk.Label(card_frame, text=label).pack(anchor="w", padx=20, pady=(10, 0))
+            entry = ttk.Entry(card_frame)
+            entry.pack(pady=10, padx=20, fill="x", ipady=5)
+            filter_entries[key] = entry
+        filter_btn = ttk.Button(card_frame, text="Delete Matching Students", style="Danger.TButton", command=delete_by_filter)
+        filter_btn.pack(pady=10, padx=20, fill="x", ipady=5)
+        self.button_bind(filter_btn)
         back_btn = ttk.Button(card_frame, text="Back", style="TButton", command=self.show_admin_dashboard)
         back_btn.pack(pady=10, padx=20, fill="x", ipady=5)
         self.button_bind(back_btn)
 
-        canvas.bind_all("<MouseWheel>", lambda event: canvas.yview_scroll(int(-1 * (event.delta / 120)), "units"))
-        canvas.bind_all("<Button-4>", lambda event: canvas.yview_scroll(-1, "units"))
-        canvas.bind_all("<Button-5>", lambda event: canvas.yview_scroll(1, "units"))
+        self.screens.ready(screen, canvas)
         
         card_frame.update_idletasks()
         canvas.configure(scrollregion=canvas.bbox("all"))
 
+    @profile_screen
     def show_search_student(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        screen = self.screens.open("search_student")
+        if screen is None:
+            return
 
-        card_frame, canvas = self.create_scrollable_frame(self.root)
+        card_frame, canvas = self.create_scrollable_frame(screen.frame)
         card_frame.configure(padding=30)
 
         ttk.Label(card_frame, text="Search Student", style="Heading.TLabel").pack(pady=20)
-        ttk.Label(card_frame, text="Search by Name or Roll Number").pack(anchor="w", padx=20, pady=(10, 0))
+        ttk.Label(card_frame, text="Search by Name, Roll Number, Email, Supervisor, Thesis or Abstract").pack(anchor="w", padx=20, pady=(10, 0))
         search_entry = ttk.Entry(card_frame)
         search_entry.pack(pady=10, padx=20, fill="x", ipady=5)
 
         result_frame = ttk.Frame(card_frame, style="Card.TFrame")
         result_frame.pack(pady=10, fill="both", expand=True, padx=20)
+        last_search = {"term": None, "generation": None}
 
         selected_student_id = tk.StringVar()
   # To track the selected student  # To track the selected student
@@ -1324,159 +1700,136 @@ class AdminUI:
             if not search_term:
                 messagebox.showerror("Error", "Please enter a search term.", parent=self.root)
                 return
+            last_search.update(term=search_term, generation=self.service.generation)
 
-            try:
-                with sqlite3.connect(self.db_file) as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("SELECT * FROM students WHERE name LIKE ? OR roll_number LIKE ?", 
-                                  (f"%{search_term}%", f"%{search_term}%"))
-                    students = cursor.fetchall()
-
-                    if not students:
-                        ttk.Label(result_frame, text="No students found.", font=("Inter", 11)).pack(pady=10)
-                        return
+            def show_results(students):
+
+                if not students:
+                    ttk.Label(result_frame, text="No students found.", font=("Inter", 11)).pack(pady=10)
+                    return
 
-                    # Frame to hold student details in a vertical layout
-                    students_frame = ttk.Frame(result_frame, style="Card.TFrame")
-                    students_frame.pack(fill="both", expand=True, padx=20, pady=10)
-
-                    for idx, student in enumerate(students):
-                        # Create a frame for each student with a border
-                        student_frame = ttk.Frame(students_frame, style="Card.TFrame", borderwidth=1, relief="solid")
-                        student_frame.pack(fill="x", padx=10, pady=5, ipady=5)
-
-                        # Calculate batch display with extension
-                        dob = student[9] if student[9] else "N/A"
-                        title = student[12] if student[12] else "N/A"
-                        publications = student[13] if student[13] else "N/A"
-                        batch_from = student[2] if student[2] else None
-                        batch_to = student[3] if student[3] else None
-                        original_batch_to = student[4] if student[4] else None
-
-                        batch_display = "N/A"
-                        if batch_from and batch_to:
-                            batch_display = f"{batch_from}-{batch_to}"
-                            if original_batch_to:
-                                try:
-                                    batch_to_int = int(batch_to)
-                                    original_batch_to_int = int(original_batch_to)
-                                    extension_years = batch_to_int - original_batch_to_int
-                                    if extension_years > 0:
-                                        batch_display += f" (Extended by {extension_years} year{'s' if extension_years != 1 else ''})"
-                                except ValueError:
-                                    # If conversion fails, just show the batch range without extension
-                                    pass
-
-                        # Fields to display in a vertical layout
-                        fields = [
-                            f"ID: {student[0]}",
-                            f"Roll No: {student[1]}",
-                            f"Batch: {batch_display}",
-                            f"Name: {student[5]}",
-                            f"Email: {student[6]}",
-                            f"DOB: {dob}",
-                            f"Department: {student[7]}",
-                            f"Supervisor: {student[8]}",
-                            f"Registration Date: {student[9]}",
-                            f"Title: {title}",
-                            f"Publications: {publications}"
-                        ]
-
-                        # Display each field as a label in a row
-                        for field in fields:
-                            ttk.Label(
-                                student_frame,
-                                text=field,
-                                font=("Inter", 11),
-                                wraplength=600  # Allow wrapping for long text
-                            ).pack(anchor="w", padx=10, pady=2)
-
-                        # Add a radio button to select this student
-                        ttk.Radiobutton(
+                # Frame to hold student details in a vertical layout
+                students_frame = ttk.Frame(result_frame, style="Card.TFrame")
+                students_frame.pack(fill="both", expand=True, padx=20, pady=10)
+
+                for idx, student in enumerate(students):
+                    # Create a frame for each student with a border
+                    student_frame = ttk.Frame(students_frame, style="Card.TFrame", borderwidth=1, relief="solid")
+                    student_frame.pack(fill="x", padx=10, pady=5, ipady=5)
+
+                    dob = student.dob if student.dob else "N/A"
+                    title = student.title if student.title else "N/A"
+                    publications = student.publications if student.publications else "N/A"
+                    batch_display = format_batch(student.batch_from, student.batch_to, student.extension_years)
+
+                    # Fields to display in a vertical layout
+                    fields = [
+                        f"ID: {student.id}",
+                        f"Roll No: {student.roll_number}",
+                        f"Batch: {batch_display}",
+                        f"Name: {student.name}",
+                        f"Email: {student.email}",
+                        f"DOB: {dob}",
+                        f"Department: {student.department}",
+                        f"Supervisor: {student.supervisor}",
+                        f"Registration Date: {student.registration_date}",
+                        f"Title: {title}",
+                        f"Publications: {publications}"
+                    ]
+
+                    # Display each field as a label in a row
+                    for field in fields:
+                        ttk.Label(
                             student_frame,
-                            text="Select",
-                            variable=selected_student_id,
-                            value=str(student[0])
-                        ).pack(anchor="w", padx=10, pady=5)
-
-                    image_frame = ttk.Frame(result_frame, style="Card.TFrame")
-                    image_frame.pack(pady=10, fill="x", padx=20)
-
-                    def show_details():
-                        for widget in image_frame.winfo_children():
-                            widget.destroy()
-
-                        student_id = selected_student_id.get()
-                        if not student_id:
-                            return
-
-                        student_id = int(student_id)
-                        with sqlite3.connect(self.db_file) as conn:
-                            cursor = conn.cursor()
-                            cursor.execute("SELECT certificate_path, picture_path FROM students WHERE id = ?", (student_id,))
-                            cert_path, pic_path = cursor.fetchone()
-
-                        if pic_path and os.path.exists(pic_path):
-                            try:
-                                image = Image.open(pic_path)
-                                image = image.resize((150, 150), Image.LANCZOS)
-                                image = ImageTk.PhotoImage(image)
-                                img_label = ttk.Label(image_frame, image=image, background="#FFFFFF")
-                                img_label.image = image
-                                img_label.pack(pady=10)
-                            except Exception as e:
-                                ttk.Label(image_frame, text=f"Unable to load picture: {e}", font=("Inter", 11)).pack(pady=10)
-                        else:
-                            ttk.Label(image_frame, text="Picture not available", font=("Inter", 11)).pack(pady=10)
+                            text=field,
+                            font=("Inter", 11),
+                            wraplength=600  # Allow wrapping for long text
+                        ).pack(anchor="w", padx=10, pady=2)
+
+                    # Add a radio button to select this student
+                    ttk.Radiobutton(
+                        student_frame,
+                        text="Select",
+                        variable=selected_student_id,
+                        value=str(student.id)
+                    ).pack(anchor="w", padx=10, pady=5)
+
+                image_frame = ttk.Frame(result_frame, style="Card.TFrame")
+                image_frame.pack(pady=10, fill="x", padx=20)
+
+                def show_details():
+                    for widget in image_frame.winfo_children():
+                        widget.destroy()
 
-                        if cert_path and os.path.exists(cert_path):
-                            cert_btn = ttk.Button(image_frame, text="View Certificate", style="TButton",
-                                                 command=lambda: webbrowser.open(f"file://{os.path.abspath(cert_path)}"))
-                            cert_btn.pack(pady=10, padx=20, ipady=5)
-                            self.button_bind(cert_btn)
-                        else:
-                            ttk.Label(image_frame, text="Certificate not available", font=("Inter", 11)).pack(pady=10)
-
-                        synopsis = self.get_student_synopsis(student_id)
-                        if synopsis:
-                            ttk.Label(image_frame, text="Synopsis:", font=("Inter", 11, "bold")).pack(pady=5)
-                            synopsis_label = f"Title: {synopsis[2]}\nSubmission Date: {synopsis[3]}\nAbstract: {synopsis[4]}"
-                            ttk.Label(image_frame, text=synopsis_label, font=("Inter", 11), wraplength=600).pack(pady=2)
-                            if synopsis[5] and os.path.exists(synopsis[5]):
-                                synopsis_btn = ttk.Button(image_frame, text=f"View Synopsis PDF ({os.path.basename(synopsis[5])})", 
-                                                        style="TButton",
-                                                        command=lambda p=synopsis[5]: webbrowser.open(f"file://{os.path.abspath(p)}"))
-                                synopsis_btn.pack(pady=5, padx=20, ipady=5)
-                                self.button_bind(synopsis_btn)
+                    student_id = selected_student_id.get()
+                    if not student_id:
+                        return
+                    self.task_runner.run(lambda task: self.service.get_student(int(student_id)), owner=image_frame,
+                                         on_success=lambda details: details_loaded(student_id, details),
+                                         on_error=lambda e: messagebox.showerror("Error", error_message(e, "loading student"),
+                                                                                 parent=self.root))
+
+                def details_loaded(student_id, details):
+                    if not details or selected_student_id.get() != student_id:
+                        return
+                    for widget in image_frame.winfo_children():
+                        widget.destroy()
+
+                    show_picture(self.task_runner, image_frame, details.student.picture_path, self.thumb_dir)
+
+                    # Certificates live in their own table now, one button per certificate
+                    if details.certificates:
+                        for cert in details.certificates:
+                            if cert[2] and os.path.exists(cert[2]):
+                                cert_btn = ttk.Button(image_frame, text=f"View Certificate ({cert[1]})", style="TButton",
+                                                     command=lambda p=cert[2]: webbrowser.open(f"file://{os.path.abspath(p)}"))
+                                cert_btn.pack(pady=5, padx=20, ipady=5)
+                                self.button_bind(cert_btn)
                             else:
-                                ttk.Label(image_frame, text="Synopsis PDF not available", font=("Inter", 11)).pack(pady=2)
-                        else:
-                            ttk.Label(image_frame, text="No synopsis recorded", font=("Inter", 11)).pack(pady=5)
-
-                        presentations = self.get_student_presentations(student_id)
-                        if presentations:
-                            ttk.Label(image_frame, text="6-Month Presentations:", font=("Inter", 11, "bold")).pack(pady=5)
-                            for pres in presentations:
-                                pres_label = f"Date: {pres[2]}, Progress: {pres[3]}"
-                                ttk.Label(image_frame, text=pres_label, font=("Inter", 11)).pack(pady=2)
-                                if pres[4] and os.path.exists(pres[4]):
-                                    pres_btn = ttk.Button(image_frame, text=f"View Presentation ({os.path.basename(pres[4])})", 
-                                                         style="TButton",
-                                                         command=lambda p=pres[4]: webbrowser.open(f"file://{os.path.abspath(p)}"))
-                                    pres_btn.pack(pady=5, padx=20, ipady=5)
-                                    self.button_bind(pres_btn)
-                                else:
-                                    ttk.Label(image_frame, text="Presentation file not available", font=("Inter", 11)).pack(pady=2)
+                                ttk.Label(image_frame, text=f"Certificate {cert[1]} not available", font=("Inter", 11)).pack(pady=2)
+                    else:
+                        ttk.Label(image_frame, text="Certificate not available", font=("Inter", 11)).pack(pady=10)
+
+                    synopsis = details.synopsis
+                    if synopsis:
+                        ttk.Label(image_frame, text="Synopsis:", font=("Inter", 11, "bold")).pack(pady=5)
+                        synopsis_label = f"Title: {synopsis[2]}\nSubmission Date: {synopsis[3]}\nAbstract: {synopsis[4]}"
+                        ttk.Label(image_frame, text=synopsis_label, font=("Inter", 11), wraplength=600).pack(pady=2)
+                        if synopsis[5] and os.path.exists(synopsis[5]):
+                            synopsis_btn = ttk.Button(image_frame, text=f"View Synopsis PDF ({os.path.basename(synopsis[5])})", 
+                                                    style="TButton",
+                                                    command=lambda p=synopsis[5]: webbrowser.open(f"file://{os.path.abspath(p)}"))
+                            synopsis_btn.pack(pady=5, padx=20, ipady=5)
+                            self.button_bind(synopsis_btn)
                         else:
-                            ttk.Label(image_frame, text="No presentations recorded", font=("Inter", 11)).pack(pady=5)
+                            ttk.Label(image_frame, text="Synopsis PDF not available", font=("Inter", 11)).pack(pady=2)
+                    else:
+                        ttk.Label(image_frame, text="No synopsis recorded", font=("Inter", 11)).pack(pady=5)
 
-                    # Button to trigger showing details of the selected student
-                    show_details_btn = ttk.Button(result_frame, text="Show Details", style="TButton", command=show_details)
-                    show_details_btn.pack(pady=10, padx=20, fill="x", ipady=5)
-                    self.button_bind(show_details_btn)
+                    presentations = details.presentations
+                    if presentations:
+                        ttk.Label(image_frame, text="6-Month Presentations:", font=("Inter", 11, "bold")).pack(pady=5)
+                        for pres in presentations:
+                            pres_label = f"Date: {pres[2]}, Progress: {pres[3]}"
+                            ttk.Label(image_frame, text=pres_label, font=("Inter", 11)).pack(pady=2)
+                            if pres[4] and os.path.exists(pres[4]):
+                                pres_btn = ttk.Button(image_frame, text=f"View Presentation ({os.path.basename(pres[4])})", 
+                                                     style="TButton",
+                                                     command=lambda p=pres[4]: webbrowser.open(f"file://{os.path.abspath(p)}"))
+                                pres_btn.pack(pady=5, padx=20, ipady=5)
+                                self.button_bind(pres_btn)
+                            else:
+                                ttk.Label(image_frame, text="Presentation file not available", font=("Inter", 11)).pack(pady=2)
+                    else:
+                        ttk.Label(image_frame, text="No presentations recorded", font=("Inter", 11)).pack(pady=5)
 
-            except sqlite3.Error as e:
-                messagebox.showerror("Error", f"Error searching students: {e}", parent=self.root)
+                # Button to trigger showing details of the selected student
+                show_details_btn = ttk.Button(result_frame, text="Show Details", style="TButton", command=show_details)
+                show_details_btn.pack(pady=10, padx=20, fill="x", ipady=5)
+                self.button_bind(show_details_btn)
+
+            self.task_runner.run(lambda task: self.service.search_students(search_term), on_success=show_results, owner=result_frame,
+                                 on_error=lambda e: messagebox.showerror("Error", f"Error searching students: {e}", parent=self.root))
 
         search_btn = ttk.Button(card_frame, text="Search", style="TButton", command=search)
         search_btn.pack(pady=10, padx=20, fill="x", ipady=5)
@@ -1486,9 +1839,13 @@ class AdminUI:
         back_btn.pack(pady=10, padx=20, fill="x", ipady=5)
         self.button_bind(back_btn)
 
-        canvas.bind_all("<MouseWheel>", lambda event: canvas.yview_scroll(int(-1 * (event.delta / 120)), "units"))
-        canvas.bind_all("<Button-4>", lambda event: canvas.yview_scroll(-1, "units"))
-        canvas.bind_all("<Button-5>", lambda event: canvas.yview_scroll(1, "units"))
+        def refresh():
+            # Re-run the shown search only if records changed since it ran
+            if last_search["term"] and last_search["generation"] != self.service.generation \
+                    and search_entry.get().strip() == last_search["term"]:
+                search()
+
+        self.screens.ready(screen, canvas, refresh=refresh)
         
         card_frame.update_idletasks()
         canvas.configure(scrollregion=canvas.bbox("all"))
\ No newline at end of file
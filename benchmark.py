@@ -0,0 +1,321 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from connection_manager import close_all_connections, get_connection
+from dates import date_number, date_text
+from db_manager import DatabaseManager
+from exporter import export_data
+from blob_store import blob_transaction
+from services import StudentData
+from student_facets import FacetFilter
+from student_details import load_student_details
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; the process-wide peak is then left out of the results
+    resource = None
+
+PAGE_SIZE = 100
+WORDS = ("learning", "network", "quantum", "graph", "protein", "climate", "robotics", "vision", "language", "security",
+         "compiler", "sensor", "energy", "genome", "optimization", "distributed", "signal", "materials", "market",
+         "inference", "catalyst", "wireless", "storage", "ecology", "fluid", "imaging", "retrieval", "privacy")
+FIRST_NAMES = ("Aarav", "Meera", "Ishaan", "Priya", "Kabir", "Ananya", "Rohan", "Sara", "Vikram", "Nisha", "Arjun", "Leela")
+LAST_NAMES = ("Sharma", "Kaur", "Iyer", "Gupta", "Singh", "Nair", "Das", "Mehta", "Reddy", "Bose", "Khan", "Joshi")
+DEPARTMENTS = ("CSE", "ECE", "ME", "Physics", "Chemistry", "Mathematics", "Biotech", "Civil")
+
+
+class DatasetConfig:
+    def __init__(self, students=1000, presentations=4, certificates=2, abstract_words=200, files=50,
+                 file_size=64 * 1024, seed=42):
+        self.students = students
+        self.presentations = presentations
+        self.certificates = certificates
+        self.abstract_words = abstract_words
+        self.files = files
+        self.file_size = file_size
+        self.seed = seed
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+def random_date(rng, start_year, end_year):
+    # As stored: a YYYYMMDD integer
+    start = date(start_year, 1, 1)
+    return date_number(start + timedelta(days=rng.randrange((date(end_year, 12, 31) - start).days)))
+
+
+def random_text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def make_dummy_files(rng, directory, count, size):
+    # Distinct contents so the blob store keeps one blob per dummy file
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for index in range(count):
+        path = os.path.join(directory, f"upload_{index}{rng.choice(('.pdf', '.jpg', '.pptx'))}")
+        with open(path, "wb") as f:
+            f.write(rng.randbytes(size))
+        paths.append(path)
+    return paths
+
+
+def generate_dataset(workdir, config):
+    # Builds a fresh database through the normal create_or_migrate_table path, then fills it with
+    # synthetic students and records. Uploads are stored through the blob store like real ones.
+    rng = random.Random(config.seed)
+    manager = DatabaseManager(os.path.join(workdir, "phd_management.db"), os.path.join(workdir, "Uploads"))
+    uploads = make_dummy_files(rng, os.path.join(workdir, "source_files"), config.files, config.file_size)
+
+    def upload():
+        return rng.choice(uploads) if uploads else None
+
+    with blob_transaction(manager.db_file, manager.blob_dir) as (cursor, blobs):
+        for index in range(config.students):
+            batch_from = rng.randrange(2010, 2024)
+            cursor.execute('''
+                INSERT INTO students (roll_number, batch_from, batch_to, original_batch_to, name, email, department, supervisor,
+                                      registration_date, dob, picture_path, title, publications)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (f"PHD{index:07d}", batch_from, batch_from + 5, batch_from + 5,
+                  f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", f"student{index}@example.edu",
+                  rng.choice(DEPARTMENTS), f"Dr. {rng.choice(LAST_NAMES)}", random_date(rng, batch_from, batch_from),
+                  random_date(rng, 1985, 2000), blobs.add(upload()), random_text(rng, 6), random_text(rng, 20)))
+            student_id = cursor.lastrowid
+            cursor.executemany('''
+                INSERT INTO presentations (student_id, presentation_date, progress_notes, presentation_file)
+                VALUES (?, ?, ?, ?)
+            ''', [(student_id, random_date(rng, batch_from, batch_from + 5), random_text(rng, 40), blobs.add(upload()))
+                  for _ in range(config.presentations)])
+            cursor.execute('''
+                INSERT INTO synopsis (student_id, synopsis_title, submission_date, abstract, synopsis_file)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (student_id, random_text(rng, 8), random_date(rng, batch_from, batch_from + 2),
+                  random_text(rng, config.abstract_words), blobs.add(upload())))
+            cursor.executemany('''
+                INSERT INTO certificates (student_id, certificate_title, certificate_path)
+                VALUES (?, ?, ?)
+            ''', [(student_id, random_text(rng, 4), blobs.add(upload())) for _ in range(config.certificates) if uploads])
+    return manager
+
+
+def percentile(ordered, fraction):
+    # Nearest-rank percentile on an already sorted list
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def summarize(samples, peak):
+    ordered = sorted(samples)
+    return {
+        "iterations": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "min_ms": round(ordered[0] * 1000, 3),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p90_ms": round(percentile(ordered, 0.90) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def measure(operation, iterations):
+    # Timed runs first, then one extra run under tracemalloc so tracing doesn't skew the timings
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        operation(i)
+        samples.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        operation(iterations)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return summarize(samples, peak)
+
+
+def benchmark_operations(manager, config, workdir, iterations):
+    rng = random.Random(config.seed + 1)
+    service = manager.service
+    student_ids = [rng.randrange(1, config.students + 1) for _ in range(iterations + 1)]
+    export_dir = os.path.join(workdir, "exports")
+    os.makedirs(export_dir, exist_ok=True)
+    created = []
+    with get_connection(manager.db_file) as conn:
+        credentials = [conn.execute(f"SELECT email, {date_text('dob')} FROM students WHERE id = ?", (student_id,)).fetchone()
+                       for student_id in student_ids]
+    credentials = [(email, datetime.strptime(dob, "%Y-%m-%d").strftime("%d-%m-%Y")) for email, dob in credentials]
+
+    def login(i):
+        if not service.authenticate(*credentials[i]):
+            raise RuntimeError("Benchmark login failed")
+
+    def view_all(i):
+        after_id = 0
+        while True:
+            page = service.list_students(after_id, PAGE_SIZE)
+            if not page:
+                break
+            after_id = page[-1].id
+
+    def export(scope, suffix):
+        def run(i):
+            path = os.path.join(export_dir, f"{scope}_{i}{suffix}")
+            export_data(manager.db_file, path, scope)
+            os.remove(path)
+        return run
+
+    def student_data(i, name):
+        return StudentData(name, f"BENCH{i:06d}", f"bench{i}@example.edu", "CSE", "Dr. Bench", "2021-07-01",
+                           random_text(rng, 6), random_text(rng, 20), dob="1995-01-01", batch_from=2021, batch_to=2026)
+
+    def add_student(i):
+        created.append(service.add_student(student_data(i, "Bench Student")))
+
+    def update_student(i):
+        service.update_student(created[i], student_data(i, "Bench Student Updated"))
+
+    def delete_student(i):
+        service.delete_student(created[i])
+
+    operations = [
+        ("login", login),
+        ("search", lambda i: service.search_students(rng.choice(WORDS))),
+        ("search_name", lambda i: service.search_students(rng.choice(LAST_NAMES))),
+        ("detail_load", lambda i: load_student_details(manager.db_file, student_ids[i])),
+        ("detail_load_cached", lambda i: service.get_student(student_ids[i % 4])),
+        ("dashboard", lambda i: service.dashboard_counts()),
+        ("compliance_page", lambda i: service.presentation_compliance(limit=100)),
+        ("compliance_summary", lambda i: service.compliance_summary()),
+        ("view_all", view_all),
+        ("facet_counts", lambda i: service.student_facets(FacetFilter(department=rng.choice(DEPARTMENTS)))),
+        ("filter_page", lambda i: service.filter_students(FacetFilter(department=rng.choice(DEPARTMENTS), batch_from=2015),
+                                                          limit=100)),
+        ("export_students", export("students", ".csv")),
+        ("export_summary", export("summary", ".csv")),
+        ("export_all", export("all", ".zip")),
+        ("export_compliance", export("compliance", ".csv")),
+        ("add_student", add_student),
+        ("update_student", update_student),
+        ("delete_student", delete_student),
+    ]
+    results = {}
+    for name, operation in operations:
+        print(f"  {name}...", flush=True)
+        results[name] = measure(operation, iterations)
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def dataset_stats(manager):
+    with get_connection(manager.db_file) as conn:
+        counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                  for table in ("students", "presentations", "synopsis", "certificates", "files")}
+    counts["db_size_kib"] = round(os.path.getsize(manager.db_file) / 1024, 1)
+    return counts
+
+
+def run_benchmark(config, iterations=50, workdir=None, keep=False):
+    own_workdir = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix="phd_benchmark_")
+    try:
+        print(f"Generating {config.students} students in {workdir}...", flush=True)
+        start = time.perf_counter()
+        manager = generate_dataset(workdir, config)
+        generate_seconds = time.perf_counter() - start
+        print("Running operations:", flush=True)
+        operations = benchmark_operations(manager, config, workdir, iterations)
+        results = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "config": config.as_dict(),
+            "dataset": dataset_stats(manager),
+            "generate_seconds": round(generate_seconds, 3),
+            "operations": operations,
+        }
+        if resource:
+            # ru_maxrss is KiB on Linux and bytes on macOS
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            results["max_rss_kib"] = max_rss // 1024 if platform.system() == "Darwin" else max_rss
+        return results
+    finally:
+        close_all_connections()
+        if own_workdir and not keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+def print_results(results, baseline=None):
+    header = f"{'operation':<20}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}{'peak KiB':>12}"
+    if baseline:
+        header += f"{'p50 vs base':>14}"
+    print(header)
+    for name, stats in results["operations"].items():
+        line = (f"{name:<20}{stats['p50_ms']:>10.2f}{stats['p90_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+                f"{stats['max_ms']:>10.2f}{stats['peak_kib']:>12.1f}")
+        if baseline:
+            previous = baseline.get("operations", {}).get(name)
+            if previous and previous["p50_ms"]:
+                line += f"{stats['p50_ms'] / previous['p50_ms']:>13.2f}x"
+            else:
+                line += f"{'n/a':>14}"
+        print(line)
+    if "max_rss_kib" in results:
+        print(f"Process peak RSS: {results['max_rss_kib']} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the PhD Management System on a synthetic database.")
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--presentations", type=int, default=4, help="presentations per student")
+    parser.add_argument("--certificates", type=int, default=2, help="certificates per student")
+    parser.add_argument("--abstract-words", type=int, default=200, help="words per synopsis abstract")
+    parser.add_argument("--files", type=int, default=50, help="distinct dummy upload files")
+    parser.add_argument("--file-size", type=int, default=64 * 1024, help="bytes per dummy upload file")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--workdir", help="build the dataset here and keep it (default: a temporary directory)")
+    parser.add_argument("--keep", action="store_true", help="keep the temporary dataset after the run")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="earlier results JSON to compare p50 timings against")
+    args = parser.parse_args()
+
+    if args.workdir:
+        if os.path.exists(os.path.join(args.workdir, "phd_management.db")):
+            parser.error(f"{args.workdir} already holds a database; pick an empty directory")
+        os.makedirs(args.workdir, exist_ok=True)
+    config = DatasetConfig(args.students, args.presentations, args.certificates, args.abstract_words, args.files,
+                           args.file_size, args.seed)
+    results = run_benchmark(config, args.iterations, args.workdir, args.keep)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import socket
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from connection_manager import get_connection
+from file_manager import JOURNAL_DIR_NAME, STAGING_DIR_NAME, check_upload, upload_sibling
+from instrumentation import file_op
+
+# The write side of the upload store: single-pass hashing copies, staging and journalled blob
+# transactions. Imported where uploads are stored, so the app starts without it.
+COPY_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with file_op("hash", path), open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(COPY_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _kernel_copiers():
+    # Ways to copy a byte range between files without it passing through Python, best first
+    copiers = []
+    if hasattr(os, "copy_file_range"):
+        copiers.append(lambda src_fd, dst_fd, offset, count: os.copy_file_range(src_fd, dst_fd, count, offset, offset))
+    if hasattr(os, "sendfile") and sys.platform.startswith("linux"):
+        copiers.append(lambda src_fd, dst_fd, offset, count: os.sendfile(dst_fd, src_fd, offset, count))
+    return copiers
+
+
+KERNEL_COPIERS = _kernel_copiers()
+
+
+def _kernel_copy(fsrc, fdst, total, digest, task):
+    # Copies in the kernel and hashes each chunk from a read-only mapping of the source right after,
+    # while its pages are still cached. Returns how far it got; the caller finishes with plain reads.
+    try:
+        mapped = mmap.mmap(fsrc.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError, OverflowError):
+        return 0
+    done = 0
+    with mapped:
+        if hasattr(mapped, "madvise"):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        for copier in KERNEL_COPIERS:
+            # sendfile writes at the file position, copy_file_range at the offset it is given
+            os.lseek(fdst.fileno(), done, os.SEEK_SET)
+            try:
+                while done < total:
+                    copied = copier(fsrc.fileno(), fdst.fileno(), done, min(COPY_CHUNK_SIZE, total - done))
+                    if not copied:
+                        return done
+                    with memoryview(mapped)[done:done + copied] as chunk:
+                        digest.update(chunk)
+                    done += copied
+                    if task:
+                        task.report(done, total)
+                return done
+            except OSError:
+                # Not supported for this pair of files (e.g. across file systems); try the next way
+                continue
+    return done
+
+
+def copy_file(src, dst, task=None):
+    # Copies src to dst and returns (sha256, size) from a single pass over the data: kernel copies
+    # where available, otherwise large buffered chunks that go to both the hash and the write.
+    # Chunked so a worker can report progress and be cancelled mid-file; the copy is fsynced so a
+    # journalled staging file is really on disk before its rows commit.
+    digest = hashlib.sha256()
+    with file_op("copy", src), open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        total = os.fstat(fsrc.fileno()).st_size
+        if task:
+            task.report(0, total, f"Copying {os.path.basename(src)}...")
+        done = _kernel_copy(fsrc, fdst, total, digest, task) if total and KERNEL_COPIERS else 0
+        fsrc.seek(done)
+        fdst.seek(done)
+        buffer = bytearray(COPY_CHUNK_SIZE)
+        with memoryview(buffer) as view:
+            while True:
+                read = fsrc.readinto(buffer)
+                if not read:
+                    break
+                with view[:read] as chunk:
+                    digest.update(chunk)
+                    fdst.write(chunk)
+                done += read
+                if task:
+                    task.report(done, total)
+        fdst.flush()
+        os.fsync(fdst.fileno())
+    shutil.copymode(src, dst)
+    return digest.hexdigest(), done
+
+
+class BlobWriter:
+    # Stores uploads under <blob_dir>/<sha256[:2]>/<sha256><ext>, so identical files are kept once and
+    # two uploads can never overwrite each other. A `files` row per blob carries a ref_count that the
+    # triggers on the FILE_COLUMNS keep up to date, so records just store the returned path.
+    # Each upload is copied into a private staging folder, hashing it in the same pass, and only
+    # renamed into the store by publish() once the rows pointing at it have committed; a copy whose
+    # content is already stored is dropped again.
+    def __init__(self, cursor, blob_dir, task=None):
+        self.cursor = cursor
+        self.blob_dir = blob_dir
+        self.task = task
+        self.staging_dir = os.path.join(upload_sibling(blob_dir, STAGING_DIR_NAME), uuid.uuid4().hex)
+        self.staged = {}
+        self._stored = {}
+
+    def add(self, src):
+        if not src:
+            return None
+        if src not in self._stored:
+            self._stored[src] = self._store(src)
+        return self._stored[src]
+
+    def _store(self, src):
+        check_upload(src)
+        os.makedirs(self.staging_dir, exist_ok=True)
+        staged_path = os.path.join(self.staging_dir, uuid.uuid4().hex)
+        digest, size = copy_file(src, staged_path, self.task)
+        # An existing blob is reused if it still has the recorded size; checking costs a stat, not a read
+        self.cursor.execute("SELECT path, size FROM files WHERE sha256 = ? ORDER BY id", (digest,))
+        for path, recorded_size in self.cursor.fetchall():
+            if os.path.isfile(path) and os.path.getsize(path) == recorded_size:
+                os.remove(staged_path)
+                return path
+        path = os.path.join(self.blob_dir, digest[:2], digest + os.path.splitext(src)[1].lower())
+        if path in self.staged:
+            os.remove(staged_path)
+            return path
+        self.staged[path] = staged_path
+        self.cursor.execute("INSERT OR IGNORE INTO files (sha256, path, size) VALUES (?, ?, ?)", (digest, path, size))
+        return path
+
+    def journal_entries(self):
+        return [{"staged": os.path.abspath(staged_path), "path": path} for path, staged_path in self.staged.items()]
+
+    def publish(self):
+        for path, staged_path in self.staged.items():
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(staged_path, path)
+        self.staged = {}
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+
+    def discard(self):
+        self.staged = {}
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+
+
+class WriteJournal:
+    # One JSON file per transaction that staged uploads, written and fsynced before the commit. After
+    # a crash, recover_pending_writes() uses the files table to tell whether the commit happened and
+    # finishes or undoes the file side to match.
+    def __init__(self, blob_dir):
+        self.journal_dir = upload_sibling(blob_dir, JOURNAL_DIR_NAME)
+        self.path = os.path.join(self.journal_dir, f"{uuid.uuid4().hex}.json")
+
+    def write(self, entries):
+        os.makedirs(self.journal_dir, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"created": time.time(), "pid": os.getpid(), "host": socket.gethostname(), "entries": entries}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def close(self):
+        for path in (self.path, f"{self.path}.tmp"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+@contextmanager
+def blob_transaction(db_file, blob_dir, task=None):
+    # Yields (cursor, writer). Uploads are staged, the journal is written, the rows commit and only
+    # then are the blobs renamed into place, so a failure at any point leaves either the old state or
+    # a journal that recovery completes. Blobs staged by a failed or cancelled transaction are removed.
+    conn = get_connection(db_file)
+    writer = BlobWriter(conn.cursor(), blob_dir, task)
+    journal = WriteJournal(blob_dir)
+    try:
+        with conn:
+            yield writer.cursor, writer
+            if writer.staged:
+                journal.write(writer.journal_entries())
+    except BaseException:
+        writer.discard()
+        journal.close()
+        raise
+    try:
+        writer.publish()
+    except OSError as e:
+        # The rows are committed, so this is not the caller's failure; the journal stays behind and
+        # the next startup moves the remaining files into place
+        print(f"Error moving uploads into place, left for recovery at next start: {e}")
+        return
+    journal.close()
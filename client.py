@@ -0,0 +1,106 @@
+import json
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+
+class ClientError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class PhDClient:
+    # Minimal stand-in client for server.py, using only the standard library. login() keeps the
+    # session token and every later request sends it.
+    def __init__(self, base_url="http://127.0.0.1:8080", timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.token = None
+
+    def request(self, method, path, body=None, **query):
+        url = self.base_url + path
+        if query:
+            url += "?" + urlencode(query)
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        request = Request(url, data=data, method=method, headers=headers)
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except HTTPError as e:
+            try:
+                message = json.loads(e.read()).get("error", e.reason)
+            except ValueError:
+                message = e.reason
+            raise ClientError(e.code, message)
+
+    def login(self, username, password):
+        session = self.request("POST", "/login", {"username": username, "password": password})
+        self.token = session["token"]
+        return session
+
+    def logout(self):
+        if self.token:
+            self.request("POST", "/logout", {})
+            self.token = None
+
+    def dashboard(self):
+        return self.request("GET", "/dashboard")
+
+    def compliance(self, **options):
+        # compliance(status="overdue", department="Physics", sort="days_overdue", desc=1, limit=100, offset=0)
+        return self.request("GET", "/compliance", **options)
+
+    def compliance_summary(self, **options):
+        return self.request("GET", "/compliance/summary", **options)
+
+    def list_students(self, after_id=0, limit=100):
+        return self.request("GET", "/students", after_id=after_id, limit=limit)
+
+    def search_students(self, term, limit=200):
+        return self.request("GET", "/students/search", q=term, limit=limit)
+
+    def student_facets(self, **filters):
+        # student_facets(department="Physics", batch_from=2015, batch_to=2020, extension="extended",
+        # synopsis="pending", certificates=0) -> {"total": ..., "facets": {facet: [[value, students], ...]}}
+        return self.request("GET", "/students/facets", **filters)
+
+    def filter_students(self, after_id=0, limit=100, **filters):
+        return self.request("GET", "/students/filter", after_id=after_id, limit=limit, **filters)
+
+    def get_student(self, student_id):
+        return self.request("GET", f"/students/{student_id}")
+
+    def add_student(self, student):
+        return self.request("POST", "/students", student)["id"]
+
+    def update_student(self, student_id, student):
+        return self.request("PUT", f"/students/{student_id}", student)
+
+    def delete_student(self, student_id):
+        return self.request("DELETE", f"/students/{student_id}")
+
+    def delete_students(self, ids=None, **criteria):
+        # delete_students([4, 7]) or delete_students(batch_to_before=2015); returns the deleted ids
+        body = {"filter": criteria} if criteria else {"ids": list(ids or ())}
+        return self.request("POST", "/students/delete", body)["deleted"]
+
+    def list_presentations(self, student_id):
+        return self.request("GET", f"/students/{student_id}/presentations")
+
+    def add_presentation(self, student_id, presentation_date, progress_notes):
+        return self.request("POST", f"/students/{student_id}/presentations",
+                            {"presentation_date": presentation_date, "progress_notes": progress_notes})["id"]
+
+    def get_synopsis(self, student_id):
+        return self.request("GET", f"/students/{student_id}/synopsis")
+
+    def save_synopsis(self, student_id, synopsis_title, submission_date, abstract):
+        return self.request("PUT", f"/students/{student_id}/synopsis",
+                            {"synopsis_title": synopsis_title, "submission_date": submission_date, "abstract": abstract})
+
+    def list_certificates(self, student_id):
+        return self.request("GET", f"/students/{student_id}/certificates")
@@ -0,0 +1,163 @@
+from datetime import date
+from connection_manager import get_connection
+from dates import date_text
+
+PRESENTATION_INTERVAL_MONTHS = 6
+DUE_SOON_DAYS = 30
+COMPLIANCE_STATUSES = ("overdue", "due soon", "on track", "unknown")
+
+COMPLIANCE_COLUMNS = ("student_id", "roll_number", "name", "department", "supervisor", "registration_date",
+                      "presentations", "last_presentation", "next_due", "days_overdue", "missed", "status")
+COMPLIANCE_HEADERS = ["Student ID", "Roll Number", "Name", "Department", "Supervisor", "Registration Date",
+                      "Presentations", "Last Presentation", "Next Due", "Days Overdue", "Missed", "Status"]
+
+# Whitelisted ORDER BY clauses for the report's sortable columns; ties fall back to the student id
+COMPLIANCE_SORTS = {
+    "student_id": "student_id",
+    "roll_number": "roll_number",
+    "name": "name",
+    "department": "department",
+    "supervisor": "supervisor",
+    "registration_date": "registration_date",
+    "presentations": "presentations",
+    "last_presentation": "last_presentation",
+    "next_due": "next_due",
+    "days_overdue": "days_overdue",
+    "missed": "missed",
+    "status": "status_rank",
+}
+
+# Whole months from a YYYYMMDD `start` to the report date, counting a month only once its day
+# has been reached; the report date's month number and day are bound as parameters
+MONTHS_SINCE = '''(
+    :as_of_month - ({start} / 10000 * 12 + {start} / 100 % 100) - (:as_of_day < {start} % 100)
+)'''
+
+# Each student's latest presentation and presentation count come from idx_presentations_student_date:
+# MAX() is a single seek and COUNT() a short range scan per student, so the report reads no
+# presentation rows at all. The per-student values are materialized once because the later steps
+# refer to them several times. Undated presentations don't count, and students without a
+# registration date get NULL due dates, reported as "unknown". Dates are YYYYMMDD integers up to
+# the due date, which is worked out as YYYY-MM-DD text.
+COMPLIANCE_QUERY = '''
+    WITH held AS MATERIALIZED (
+        SELECT s.id AS student_id, s.roll_number, s.name, s.department, s.supervisor, s.registration_date,
+               (SELECT COUNT(p.presentation_date) FROM presentations p
+                WHERE p.student_id = s.id) AS presentations,
+               (SELECT MAX(p.presentation_date) FROM presentations p
+                WHERE p.student_id = s.id) AS last_presentation
+        FROM students s
+        {student_where}
+    ),
+    due AS (
+        SELECT student_id, roll_number, name, department, supervisor, registration_date, presentations,
+               last_presentation,
+               date({last_or_registered}, '+{interval} months') AS next_due,
+               CASE WHEN registration_date IS NULL THEN 0 ELSE MAX({months_since} / {interval}, 0) END AS expected
+        FROM held
+    ),
+    report AS (
+        SELECT student_id, roll_number, name, department, supervisor, registration_date, presentations,
+               last_presentation, next_due,
+               CAST(julianday(:as_of) - julianday(next_due) AS INTEGER) AS days_overdue,
+               MAX(expected - presentations, 0) AS missed,
+               CASE WHEN next_due IS NULL THEN 3
+                    WHEN next_due < :as_of THEN 0
+                    WHEN next_due <= date(:as_of, '+{due_soon} days') THEN 1
+                    ELSE 2 END AS status_rank
+        FROM due
+    )
+    SELECT student_id, roll_number, name, department, supervisor, {registration_date} AS registration_date,
+           presentations, {last_presentation} AS last_presentation, next_due, days_overdue, missed,
+           CASE status_rank WHEN 0 THEN 'overdue' WHEN 1 THEN 'due soon' WHEN 2 THEN 'on track' ELSE 'unknown' END AS status
+    FROM report
+    {where}
+    {order}
+    {limit}
+'''
+
+COMPLIANCE_SUMMARY = '''
+    SELECT status, COUNT(*) FROM ({report}) GROUP BY status
+'''
+
+
+class ComplianceRecord:
+    __slots__ = COMPLIANCE_COLUMNS
+
+    def __init__(self, student_id, roll_number, name, department, supervisor, registration_date, presentations,
+                 last_presentation, next_due, days_overdue, missed, status):
+        self.student_id = student_id
+        self.roll_number = roll_number
+        self.name = name
+        self.department = department
+        self.supervisor = supervisor
+        self.registration_date = registration_date
+        self.presentations = presentations
+        self.last_presentation = last_presentation
+        self.next_due = next_due
+        self.days_overdue = days_overdue
+        self.missed = missed
+        self.status = status
+
+    def as_dict(self):
+        return {column: getattr(self, column) for column in COMPLIANCE_COLUMNS}
+
+
+def compliance_query(as_of=None, department=None, status=None, sort="days_overdue", descending=True, limit=None,
+                     offset=0):
+    # Returns (sql, params) for the report as of `as_of` (YYYY-MM-DD, default today), optionally
+    # limited to one department and/or status, and to one page of `limit` rows
+    if sort is not None and sort not in COMPLIANCE_SORTS:
+        raise ValueError(f"Unknown sort column: {sort}")
+    if status and status not in COMPLIANCE_STATUSES:
+        raise ValueError(f"Unknown status: {status}")
+    try:
+        report_date = date.fromisoformat(as_of) if as_of else date.today()
+    except ValueError:
+        raise ValueError("Report date must be YYYY-MM-DD.")
+    params = {"as_of": report_date.isoformat(), "as_of_month": report_date.year * 12 + report_date.month,
+              "as_of_day": report_date.day}
+    conditions = []
+    if department:
+        params["department"] = department
+    if status:
+        conditions.append("status_rank = :status_rank")
+        params["status_rank"] = COMPLIANCE_STATUSES.index(status)
+    order = ""
+    if sort:
+        # NULLs (no date yet) sort last either way
+        column = COMPLIANCE_SORTS[sort]
+        order = f"ORDER BY {column} IS NULL, {column} {'DESC' if descending else 'ASC'}, student_id"
+    sql = COMPLIANCE_QUERY.format(
+        interval=PRESENTATION_INTERVAL_MONTHS,
+        due_soon=DUE_SOON_DAYS,
+        months_since=MONTHS_SINCE.format(start="registration_date"),
+        last_or_registered=date_text("COALESCE(last_presentation, registration_date)"),
+        registration_date=date_text("registration_date"),
+        last_presentation=date_text("last_presentation"),
+        student_where="WHERE s.department = :department" if department else "",
+        where=f"WHERE {' AND '.join(conditions)}" if conditions else "",
+        order=order,
+        limit="LIMIT :limit OFFSET :offset" if limit else "",
+    )
+    if limit:
+        params.update(limit=limit, offset=offset)
+    return sql, params
+
+
+def compliance_report(db_file, as_of=None, department=None, status=None, sort="days_overdue", descending=True, limit=None,
+                      offset=0):
+    sql, params = compliance_query(as_of, department, status, sort, descending, limit, offset)
+    with get_connection(db_file) as conn:
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        return [ComplianceRecord(*row) for row in cursor.fetchall()]
+
+
+def compliance_summary(db_file, as_of=None, department=None):
+    # {status: number of students} for the same report, without fetching its rows
+    sql, params = compliance_query(as_of, department, sort=None)
+    with get_connection(db_file) as conn:
+        cursor = conn.cursor()
+        cursor.execute(COMPLIANCE_SUMMARY.format(report=sql), params)
+        return dict(cursor.fetchall())
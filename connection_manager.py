@@ -0,0 +1,80 @@
+import os
+import sqlite3
+import threading
+from instrumentation import connect
+
+# Applied once per connection. WAL lets readers run alongside a writer, NORMAL
+# sync is safe under WAL, and the cache/mmap sizes keep hot pages in memory.
+# SQLite leaves foreign keys off by default, so without the last one the
+# ON DELETE CASCADE clauses on the child tables would never fire.
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -20000",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 30000",
+    "PRAGMA foreign_keys = ON",
+)
+
+
+class ConnectionManager:
+    def __init__(self, db_file, cached_statements=256):
+        self.db_file = db_file
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+
+    def get(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # One long-lived connection per thread; check_same_thread is off only so
+            # close_all() can run from the main thread at shutdown.
+            conn = connect(self.db_file, timeout=30, check_same_thread=False,
+                           cached_statements=self.cached_statements)
+            for pragma in PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close_all(self):
+        with self._lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
+
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def get_manager(db_file):
+    key = os.path.abspath(db_file)
+    manager = _managers.get(key)
+    if manager is None:
+        with _managers_lock:
+            manager = _managers.get(key)
+            if manager is None:
+                manager = ConnectionManager(db_file)
+                _managers[key] = manager
+    return manager
+
+
+def get_connection(db_file):
+    # Drop-in replacement for sqlite3.connect(db_file): use it as `with get_connection(...) as conn`
+    # to get commit/rollback on the shared connection without closing it.
+    return get_manager(db_file).get()
+
+
+def close_all_connections():
+    with _managers_lock:
+        for manager in _managers.values():
+            manager.close_all()
+        _managers.clear()
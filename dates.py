@@ -0,0 +1,26 @@
+from datetime import date
+
+# Dates are stored as YYYYMMDD integers (20240115): they compare and sort as numbers, so range
+# filters are plain index range scans, and they still read as dates in a database browser.
+# Everything above the SQL works with YYYY-MM-DD strings; these convert at the boundary.
+DATE_MIN = 10000101
+DATE_MAX = 99991231
+
+
+def date_number(value):
+    # "YYYY-MM-DD" (or a date) -> 20240115; None and "" -> None; ValueError for anything else
+    if value is None or value == "":
+        return None
+    if not isinstance(value, date):
+        value = date.fromisoformat(value)
+    return value.year * 10000 + value.month * 100 + value.day
+
+
+def date_text(column):
+    # SQL expression reading a YYYYMMDD column back as YYYY-MM-DD; NULL stays NULL
+    return f"(substr({column}, 1, 4) || '-' || substr({column}, 5, 2) || '-' || substr({column}, 7, 2))"
+
+
+def date_check(column):
+    # CHECK constraint keeping a column to NULL or a YYYYMMDD integer; text never passes BETWEEN
+    return f"CHECK ({column} IS NULL OR {column} BETWEEN {DATE_MIN} AND {DATE_MAX})"
@@ -1,158 +1,159 @@
 import sqlite3
+from connection_manager import get_connection
+from file_manager import recover_pending_writes
+from migrations import SCHEMA_VERSION, apply_migrations, get_schema_version
+from services import PhDService
 import os
-from tkinter import messagebox
 
 class DatabaseManager:
-    def __init__(self):
-        self.db_file = "phd_management.db"
-        self.upload_dir = "Uploads"
+    def __init__(self, db_file="phd_management.db", upload_dir="Uploads"):
+        self.db_file = db_file
+        self.upload_dir = upload_dir
         self.cert_dir = os.path.join(self.upload_dir, "certificates")
         self.pic_dir = os.path.join(self.upload_dir, "pictures")
+        self.thumb_dir = os.path.join(self.pic_dir, "thumbs")
+        self.blob_dir = os.path.join(self.upload_dir, "blobs")
         self.present_dir = os.path.join(self.upload_dir, "presentations")
         self.synopsis_dir = os.path.join(self.upload_dir, "synopsis")
-        os.makedirs(self.cert_dir, exist_ok=True)
-        os.makedirs(self.pic_dir, exist_ok=True)
-        os.makedirs(self.present_dir, exist_ok=True)
-        os.makedirs(self.synopsis_dir, exist_ok=True)
         self.create_or_migrate_table()
+        # Finish or undo uploads a crash interrupted between the database commit and the file renames
+        recover_pending_writes(self.db_file, self.blob_dir)
+        self.service = PhDService(self.db_file, self.blob_dir, self.thumb_dir)
 
     def create_or_migrate_table(self):
-        with sqlite3.connect(self.db_file) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS students (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    roll_number TEXT NOT NULL,
-                    batch_from TEXT,
-                    batch_to TEXT,
-                    original_batch_to TEXT,
-                    name TEXT NOT NULL,
-                    email TEXT NOT NULL,
-                    department TEXT NOT NULL,
-                    supervisor TEXT NOT NULL,
-                    registration_date TEXT NOT NULL,
-                    dob TEXT,
-                    picture_path TEXT,
-                    title TEXT NOT NULL,
-                    publications TEXT NOT NULL
-                )
-            ''')
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS presentations (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    student_id INTEGER NOT NULL,
-                    presentation_date TEXT NOT NULL,
-                    progress_notes TEXT NOT NULL,
-                    presentation_file TEXT,
-                    FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE
-                )
-            ''')
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS synopsis (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    student_id INTEGER NOT NULL,
-                    synopsis_title TEXT NOT NULL,
-                    submission_date TEXT NOT NULL,
-                    abstract TEXT NOT NULL,
-                    synopsis_file TEXT,
-                    FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE
-                )
-            ''')
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS certificates (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    student_id INTEGER NOT NULL,
-                    certificate_title TEXT NOT NULL,
-                    certificate_path TEXT NOT NULL,
-                    FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE
-                )
-            ''')
-            cursor.execute("PRAGMA table_info(students)")
-            columns = [col[1] for col in cursor.fetchall()]
-            if 'title' not in columns:
-                cursor.execute("ALTER TABLE students ADD COLUMN title TEXT NOT NULL DEFAULT ''")
-            if 'publications' not in columns:
-                cursor.execute("ALTER TABLE students ADD COLUMN publications TEXT NOT NULL DEFAULT ''")
-            if 'registration_date' not in columns and 'enrollment_date' in columns:
-                cursor.execute("ALTER TABLE students RENAME COLUMN enrollment_date TO registration_date")
-            if 'batch_from' not in columns:
-                cursor.execute("ALTER TABLE students ADD COLUMN batch_from TEXT")
-            if 'batch_to' not in columns:
-                cursor.execute("ALTER TABLE students ADD COLUMN batch_to TEXT")
-            if 'original_batch_to' not in columns:
-                cursor.execute("ALTER TABLE students ADD COLUMN original_batch_to TEXT")
-                cursor.execute("UPDATE students SET original_batch_to = batch_to WHERE original_batch_to IS NULL")
-            if 'certificate_path' in columns:
-                cursor.execute("SELECT id, certificate_path FROM students WHERE certificate_path IS NOT NULL")
-                existing_certs = cursor.fetchall()
-                for student_id, cert_path in existing_certs:
-                    cursor.execute('''
-                        INSERT INTO certificates (student_id, certificate_title, certificate_path)
-                        VALUES (?, ?, ?)
-                    ''', (student_id, "Default Certificate", cert_path))
-                cursor.execute("ALTER TABLE students DROP COLUMN certificate_path")
-            conn.commit()
+        conn = get_connection(self.db_file)
+        # Migrations rebuild tables, and with foreign keys on, dropping students would cascade into
+        # every child row. The pragma is ignored inside a transaction, so it is switched off before
+        # the first statement and back on once the migration has committed or rolled back.
+        conn.execute("PRAGMA foreign_keys = OFF")
+        try:
+            with conn:
+                cursor = conn.cursor()
+                # The legacy column checks below only need to run until the schema is current
+                if get_schema_version(cursor) >= SCHEMA_VERSION:
+                    return
+                # First run or an older schema; blob and thumbnail folders are also created on demand.
+                # The tables are created in their original layout and the migrations bring them up to date.
+                for directory in (self.cert_dir, self.pic_dir, self.present_dir, self.synopsis_dir, self.blob_dir):
+                    os.makedirs(directory, exist_ok=True)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS students (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        roll_number TEXT NOT NULL,
+                        batch_from TEXT,
+                        batch_to TEXT,
+                        original_batch_to TEXT,
+                        name TEXT NOT NULL,
+                        email TEXT NOT NULL,
+                        department TEXT NOT NULL,
+                        supervisor TEXT NOT NULL,
+                        registration_date TEXT NOT NULL,
+                        dob TEXT,
+                        picture_path TEXT,
+                        title TEXT NOT NULL,
+                        publications TEXT NOT NULL
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS presentations (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        student_id INTEGER NOT NULL,
+                        presentation_date TEXT NOT NULL,
+                        progress_notes TEXT NOT NULL,
+                        presentation_file TEXT,
+                        FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS synopsis (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        student_id INTEGER NOT NULL,
+                        synopsis_title TEXT NOT NULL,
+                        submission_date TEXT NOT NULL,
+                        abstract TEXT NOT NULL,
+                        synopsis_file TEXT,
+                        FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS certificates (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        student_id INTEGER NOT NULL,
+                        certificate_title TEXT NOT NULL,
+                        certificate_path TEXT NOT NULL,
+                        FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE
+                    )
+                ''')
+                cursor.execute("PRAGMA table_info(students)")
+                columns = [col[1] for col in cursor.fetchall()]
+                if 'title' not in columns:
+                    cursor.execute("ALTER TABLE students ADD COLUMN title TEXT NOT NULL DEFAULT ''")
+                if 'publications' not in columns:
+                    cursor.execute("ALTER TABLE students ADD COLUMN publications TEXT NOT NULL DEFAULT ''")
+                if 'registration_date' not in columns and 'enrollment_date' in columns:
+                    cursor.execute("ALTER TABLE students RENAME COLUMN enrollment_date TO registration_date")
+                if 'batch_from' not in columns:
+                    cursor.execute("ALTER TABLE students ADD COLUMN batch_from TEXT")
+                if 'batch_to' not in columns:
+                    cursor.execute("ALTER TABLE students ADD COLUMN batch_to TEXT")
+                if 'original_batch_to' not in columns:
+                    cursor.execute("ALTER TABLE students ADD COLUMN original_batch_to TEXT")
+                    cursor.execute("UPDATE students SET original_batch_to = batch_to WHERE original_batch_to IS NULL")
+                if 'certificate_path' in columns:
+                    cursor.execute("SELECT id, certificate_path FROM students WHERE certificate_path IS NOT NULL")
+                    existing_certs = cursor.fetchall()
+                    for student_id, cert_path in existing_certs:
+                        cursor.execute('''
+                            INSERT INTO certificates (student_id, certificate_title, certificate_path)
+                            VALUES (?, ?, ?)
+                        ''', (student_id, "Default Certificate", cert_path))
+                    cursor.execute("ALTER TABLE students DROP COLUMN certificate_path")
+                apply_migrations(cursor)
+                conn.commit()
+        finally:
+            conn.execute("PRAGMA foreign_keys = ON")
 
     def login(self, username, password):
-        from datetime import datetime
-        if username == "admin" and password == "admin":
-            self.is_admin = True
-            self.current_user = "admin"
-            return True
         try:
-            try:
-                dob = datetime.strptime(password, "%d-%m-%Y").strftime("%Y-%m-%d")
-            except ValueError:
-                return False
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM students WHERE email = ? AND (dob = ? OR dob IS NULL)", (username, dob))
-                student = cursor.fetchone()
-                if student:
-                    self.is_admin = False
-                    self.current_user = student[0]
-                    return True
-                return False
+            session = self.service.authenticate(username, password)
         except sqlite3.Error:
             return False
+        if not session:
+            return False
+        self.is_admin = session.is_admin
+        self.current_user = "admin" if session.is_admin else session.student_id
+        return True
 
     def view_own_details(self):
         try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM students WHERE id = ?", (self.current_user,))
-                student = cursor.fetchone()
-                return student
+            return self.service.find_student(self.current_user)
         except sqlite3.Error as e:
-            messagebox.showerror("Error", f"Error fetching student details: {e}", parent=self.root)
+            print(f"Error fetching student details: {e}")
             return None
 
     def get_student_synopsis(self, student_id):
         try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM synopsis WHERE student_id = ?", (student_id,))
-                return cursor.fetchone()
+            return self.service.get_synopsis(student_id)
         except sqlite3.Error as e:
             print(f"Error fetching synopsis: {e}")
             return None
 
     def get_student_presentations(self, student_id):
         try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM presentations WHERE student_id = ?", (student_id,))
-                return cursor.fetchall()
+            return self.service.list_presentations(student_id)
         except sqlite3.Error as e:
             print(f"Error fetching presentations: {e}")
             return []
 
     def get_student_certificates(self, student_id):
         try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT id, certificate_title, certificate_path FROM certificates WHERE student_id = ?", (student_id,))
-                return cursor.fetchall()
+            return self.service.list_certificates(student_id)
         except sqlite3.Error as e:
             print(f"Error fetching certificates: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    def get_students_page(self, after_id=0, limit=100):
+        return self.service.list_students(after_id, limit)
+
+    def search_students(self, term, limit=200):
+        return self.service.search_students(term, limit)
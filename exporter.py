@@ -0,0 +1,182 @@
+import csv
+import gzip
+import io
+import os
+import zipfile
+from compliance import COMPLIANCE_HEADERS, compliance_query
+from connection_manager import get_connection
+from dates import date_text
+
+EXPORT_BATCH_SIZE = 1000
+
+# Explicit column lists keep the CSV layout stable whatever order the columns have on disk; dates
+# are written as YYYY-MM-DD, the format the importer reads back
+EXPORT_TABLES = {
+    "students": (
+        "id, roll_number, batch_from, batch_to, original_batch_to, name, email, department, supervisor, "
+        f"{date_text('registration_date')}, {date_text('dob')}, picture_path, title, publications",
+        ["ID", "Roll Number", "Batch From", "Batch To", "Original Batch To", "Name", "Email", "Department", "Supervisor",
+         "Registration Date", "DOB", "Picture Path", "Title", "Publications"],
+    ),
+    "presentations": (
+        f"id, student_id, {date_text('presentation_date')}, progress_notes, presentation_file",
+        ["ID", "Student ID", "Presentation Date", "Progress Notes", "Presentation File"],
+    ),
+    "synopsis": (
+        f"id, student_id, synopsis_title, {date_text('submission_date')}, abstract, synopsis_file",
+        ["ID", "Student ID", "Synopsis Title", "Submission Date", "Abstract", "Synopsis File"],
+    ),
+    "certificates": (
+        "id, student_id, certificate_title, certificate_path",
+        ["ID", "Student ID", "Certificate Title", "Certificate Path"],
+    ),
+}
+
+# One row per student; the correlated subqueries are index lookups on student_id
+SUMMARY_QUERY = f'''
+    SELECT s.id, s.roll_number, s.name, s.email, s.department, s.supervisor, s.batch_from, s.batch_to,
+           (SELECT COUNT(*) FROM presentations p WHERE p.student_id = s.id),
+           (SELECT {date_text("MAX(presentation_date)")} FROM presentations p WHERE p.student_id = s.id),
+           EXISTS (SELECT 1 FROM synopsis y WHERE y.student_id = s.id),
+           (SELECT COUNT(*) FROM certificates c WHERE c.student_id = s.id)
+    FROM students s
+    {{where}}
+    ORDER BY s.id
+'''
+SUMMARY_HEADERS = ["ID", "Roll Number", "Name", "Email", "Department", "Supervisor", "Batch From", "Batch To",
+                   "Presentations", "Last Presentation", "Synopsis Submitted", "Certificates"]
+
+EXPORT_SCOPES = ("students", "summary", "all", "compliance")
+
+
+class ExportProgress:
+    def __init__(self, task, total):
+        self.task = task
+        self.total = total
+        self.done = 0
+
+    def advance(self, rows, message=None):
+        self.done += rows
+        if self.task:
+            self.task.report(self.done, self.total, message)
+
+
+def open_text_output(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "wt", newline="", encoding="utf-8")
+    return open(path, "w", newline="", encoding="utf-8")
+
+
+def write_query(cursor, query, headers, output, progress, label, params=()):
+    writer = csv.writer(output)
+    writer.writerow(headers)
+    cursor.execute(query, params)
+    while True:
+        rows = cursor.fetchmany(EXPORT_BATCH_SIZE)
+        if not rows:
+            break
+        writer.writerows(rows)
+        progress.advance(len(rows), f"Exporting {label}...")
+
+
+def selection_filter(table, selection):
+    # `selection` is a subquery returning student ids, e.g. the ids staged for a bulk delete
+    if not selection:
+        return ""
+    key = "id" if table == "students" else "student_id"
+    return f"WHERE {key} IN ({selection})"
+
+
+def table_query(table, selection=None):
+    columns, _ = EXPORT_TABLES[table]
+    return f"SELECT {columns} FROM {table} {selection_filter(table, selection)} ORDER BY id"
+
+
+def summary_query(selection=None):
+    return SUMMARY_QUERY.format(where=f"WHERE s.id IN ({selection})" if selection else "")
+
+
+def count_rows(cursor, tables, selection=None):
+    total = 0
+    for table in tables:
+        cursor.execute(f"SELECT COUNT(*) FROM {table} {selection_filter(table, selection)}")
+        total += cursor.fetchone()[0]
+    return total
+
+
+def export_data(db_file, path, scope="students", task=None, selection=None):
+    # Streams rows from the cursor in EXPORT_BATCH_SIZE batches straight to disk, so memory stays
+    # flat however large the archive is. "students" and "summary" write one CSV (gzipped when the
+    # path ends in .gz); "all" writes every table plus the summary into a ZIP archive; "compliance"
+    # writes the whole presentation compliance report (export_compliance for a filtered one).
+    # `selection` limits the table exports to some students (see selection_filter).
+    # Returns the number of students, and writes nothing when there are none.
+    if scope not in EXPORT_SCOPES:
+        raise ValueError(f"Unknown export scope: {scope}")
+    if scope == "compliance":
+        return export_compliance(db_file, path, task)
+    return _write_or_remove(path, _export, db_file, path, scope, task, selection)
+
+
+def export_compliance(db_file, path, task=None, **report_options):
+    # The presentation compliance report as one CSV, in the order and with the department/status
+    # filters the report screen shows (see compliance.compliance_query)
+    return _write_or_remove(path, _export_compliance, db_file, path, task, report_options)
+
+
+def _write_or_remove(path, export, *args):
+    try:
+        return export(*args)
+    except BaseException:
+        # Don't leave a truncated export behind after an error or a cancel
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+
+def _export(db_file, path, scope, task, selection):
+    with get_connection(db_file) as conn:
+        cursor = conn.cursor()
+        student_count = count_rows(cursor, ["students"], selection)
+        if not student_count:
+            return 0
+
+        if scope == "students":
+            progress = ExportProgress(task, student_count)
+            with open_text_output(path) as output:
+                write_query(cursor, table_query("students", selection), EXPORT_TABLES["students"][1], output, progress, "students")
+        elif scope == "summary":
+            progress = ExportProgress(task, student_count)
+            with open_text_output(path) as output:
+                write_query(cursor, summary_query(selection), SUMMARY_HEADERS, output, progress, "summary")
+        else:
+            progress = ExportProgress(task, count_rows(cursor, EXPORT_TABLES, selection) + student_count)
+            with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                for table, (_, headers) in EXPORT_TABLES.items():
+                    with archive.open(f"{table}.csv", "w", force_zip64=True) as member:
+                        with io.TextIOWrapper(member, encoding="utf-8", newline="") as output:
+                            write_query(cursor, table_query(table, selection), headers, output, progress, table)
+                with archive.open("summary.csv", "w", force_zip64=True) as member:
+                    with io.TextIOWrapper(member, encoding="utf-8", newline="") as output:
+                        write_query(cursor, summary_query(selection), SUMMARY_HEADERS, output, progress, "summary")
+    return student_count
+
+
+def _export_compliance(db_file, path, task, report_options):
+    query, params = compliance_query(**report_options)
+    with get_connection(db_file) as conn:
+        cursor = conn.cursor()
+        if report_options.get("department"):
+            cursor.execute("SELECT COUNT(*) FROM students WHERE department = ?", (report_options["department"],))
+        else:
+            cursor.execute("SELECT COUNT(*) FROM students")
+        student_count = cursor.fetchone()[0]
+        if not student_count:
+            return 0
+        progress = ExportProgress(task, student_count)
+        with open_text_output(path) as output:
+            write_query(cursor, query, COMPLIANCE_HEADERS, output, progress, "compliance report", params)
+    if not progress.done:
+        # Nobody matched the filters
+        os.remove(path)
+    return progress.done
@@ -1,58 +1,178 @@
+import json
 import os
-import shutil
-import sqlite3
+import time
+from connection_manager import get_connection
+from instrumentation import file_op
+
+# Upload limits, locations and cleanup. Everything that copies or hashes uploads lives in blob_store,
+# which startup doesn't need.
+MB = 1024 * 1024
+# Largest upload accepted per file type; other types get DEFAULT_UPLOAD_LIMIT
+UPLOAD_LIMITS = {
+    ".jpg": 20 * MB,
+    ".jpeg": 20 * MB,
+    ".png": 20 * MB,
+    ".pdf": 100 * MB,
+    ".ppt": 500 * MB,
+    ".pptx": 500 * MB,
+}
+DEFAULT_UPLOAD_LIMIT = 100 * MB
+# Staged uploads and write journals live next to the blob store, so publishing is a same-disk rename
+STAGING_DIR_NAME = "staging"
+JOURNAL_DIR_NAME = "journal"
+# A staging folder with no journal this old belongs to a transaction that never committed
+STALE_STAGING_SECONDS = 3600
+# A journal whose writer can't be checked (another host, or Windows) is only recovered once this old;
+# until then the transaction may still be in flight in another process sharing the database
+STALE_JOURNAL_SECONDS = 3600
+REMOVE_BATCH_SIZE = 500
+
+# Every column that points at a stored file; the ref-count triggers in migrations.py use the same map
+FILE_COLUMNS = {
+    "students": "picture_path",
+    "presentations": "presentation_file",
+    "synopsis": "synopsis_file",
+    "certificates": "certificate_path",
+}
+
+
+def stored_digest(path):
+    # Blobs are named after their SHA-256, so their hash is known without reading them
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return stem if len(stem) == 64 and all(c in "0123456789abcdef" for c in stem) else None
+
+
+class UploadTooLargeError(ValueError):
+    pass
+
+
+def check_upload(path):
+    size = os.path.getsize(path)
+    extension = os.path.splitext(path)[1].lower()
+    limit = UPLOAD_LIMITS.get(extension, DEFAULT_UPLOAD_LIMIT)
+    if size > limit:
+        raise UploadTooLargeError(f"{os.path.basename(path)} is {size / MB:.1f} MB; "
+                                  f"{extension or 'these'} files are limited to {limit // MB} MB.")
+    return size
+
+
+def upload_sibling(blob_dir, name):
+    return os.path.join(os.path.dirname(os.path.abspath(blob_dir)), name)
+
+
+def remove_tree(path):
+    # shutil is only loaded when startup finds something left over to clean up
+    import shutil
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def writer_gone(journal):
+    # Whether the process that wrote a journal has exited, so its transaction can't still commit.
+    # Only a local process can be checked (signal 0 on POSIX); otherwise wait for the journal to age.
+    import socket
+    pid = journal.get("pid")
+    if os.name == "posix" and pid and journal.get("host") == socket.gethostname() and pid != os.getpid():
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            return False
+        return False
+    return time.time() - journal.get("created", 0) > STALE_JOURNAL_SECONDS
+
+
+def recover_pending_writes(db_file, blob_dir):
+    # Run at startup. A journal whose blobs have files rows committed is rolled forward by moving the
+    # staged files into place; otherwise the commit never happened and the staged files are dropped.
+    # The desktop app and the server can share a database, so journals whose writer may still be
+    # running are left alone.
+    journal_dir = upload_sibling(blob_dir, JOURNAL_DIR_NAME)
+    staging_root = upload_sibling(blob_dir, STAGING_DIR_NAME)
+    recovered = 0
+    in_flight = set()
+    if os.path.isdir(journal_dir):
+        for name in os.listdir(journal_dir):
+            journal_path = os.path.join(journal_dir, name)
+            if name.endswith(".tmp"):
+                # Never completed, so its transaction hasn't reached the commit; once it is stale
+                # nothing is writing it any more
+                if os.path.getmtime(journal_path) < time.time() - STALE_JOURNAL_SECONDS:
+                    os.remove(journal_path)
+                continue
+            try:
+                with open(journal_path, encoding="utf-8") as f:
+                    journal = json.load(f)
+                entries = journal["entries"]
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Skipping unreadable write journal {name}: {e}")
+                continue
+            if not writer_gone(journal):
+                in_flight.update(os.path.dirname(entry["staged"]) for entry in entries)
+                continue
+            with get_connection(db_file) as conn:
+                cursor = conn.cursor()
+                for entry in entries:
+                    cursor.execute("SELECT 1 FROM files WHERE path = ?", (entry["path"],))
+                    committed = cursor.fetchone() is not None
+                    if committed and os.path.exists(entry["staged"]) and not os.path.exists(entry["path"]):
+                        os.makedirs(os.path.dirname(entry["path"]), exist_ok=True)
+                        os.replace(entry["staged"], entry["path"])
+                    elif os.path.exists(entry["staged"]):
+                        os.remove(entry["staged"])
+            for entry in entries:
+                remove_tree(os.path.dirname(entry["staged"]))
+            os.remove(journal_path)
+            recovered += 1
+    if os.path.isdir(staging_root):
+        cutoff = time.time() - STALE_STAGING_SECONDS
+        for name in os.listdir(staging_root):
+            path = os.path.join(staging_root, name)
+            if os.path.abspath(path) not in in_flight and os.path.getmtime(path) < cutoff:
+                remove_tree(path)
+    if recovered:
+        print(f"Recovered {recovered} interrupted write(s).")
+    return recovered
+
+
+def remove_unreferenced_files(db_file, thumb_dir=None, task=None, batch_size=REMOVE_BATCH_SIZE):
+    # Drops blobs no record points at any more, along with their thumbnails. Works a batch at a time
+    # so a cohort delete doesn't hold the write lock while thousands of files are unlinked.
+    removed = 0
+    while True:
+        with get_connection(db_file) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, sha256, path FROM files WHERE ref_count <= 0 LIMIT ?", (batch_size,))
+            unreferenced = cursor.fetchall()
+            if not unreferenced:
+                break
+            cursor.executemany("DELETE FROM files WHERE id = ?", [(file_id,) for file_id, _, _ in unreferenced])
+            digests = list({digest for _, digest, _ in unreferenced})
+            cursor.execute(f"SELECT DISTINCT sha256 FROM files WHERE sha256 IN ({', '.join('?' * len(digests))})", digests)
+            kept_hashes = {row[0] for row in cursor.fetchall()}
+        for _, digest, path in unreferenced:
+            if os.path.exists(path):
+                with file_op("remove", path):
+                    os.remove(path)
+            if thumb_dir and digest not in kept_hashes:
+                thumb_path = os.path.join(thumb_dir, f"{digest}.jpg")
+                if os.path.exists(thumb_path):
+                    with file_op("remove", thumb_path):
+                        os.remove(thumb_path)
+        removed += len(unreferenced)
+        if task:
+            task.report(removed, None, f"Removed {removed} files...")
+    return removed
 
 class FileManager:
-    def __init__(self, upload_dir="Uploads"):
+    # Upload locations for the screens. The folders are created by DatabaseManager on first start and
+    # the blob and thumbnail folders on demand, so nothing is created here.
+    def __init__(self, db_file, upload_dir="Uploads"):
+        self.db_file = db_file
         self.upload_dir = upload_dir
         self.cert_dir = os.path.join(upload_dir, "certificates")
         self.pic_dir = os.path.join(upload_dir, "pictures")
+        self.thumb_dir = os.path.join(self.pic_dir, "thumbs")
+        self.blob_dir = os.path.join(upload_dir, "blobs")
         self.present_dir = os.path.join(upload_dir, "presentations")
         self.synopsis_dir = os.path.join(upload_dir, "synopsis")
-        os.makedirs(self.cert_dir, exist_ok=True)
-        os.makedirs(self.pic_dir, exist_ok=True)
-        os.makedirs(self.present_dir, exist_ok=True)
-        os.makedirs(self.synopsis_dir, exist_ok=True)
-        self.db_file = "phd_management.db"
-
-    def delete_student_files(self, student_id):
-        try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                # Get student picture path
-                cursor.execute("SELECT picture_path FROM students WHERE id = ?", (student_id,))
-                picture_path = cursor.fetchone()
-                
-                # Get all certificate paths
-                cursor.execute("SELECT certificate_path FROM certificates WHERE student_id = ?", (student_id,))
-                certificate_paths = [row[0] for row in cursor.fetchall()]
-                
-                # Get presentation paths
-                cursor.execute("SELECT presentation_file FROM presentations WHERE student_id = ?", (student_id,))
-                presentation_paths = [row[0] for row in cursor.fetchall()]
-                
-                # Get synopsis path
-                cursor.execute("SELECT synopsis_file FROM synopsis WHERE student_id = ?", (student_id,))
-                synopsis_path = cursor.fetchone()
-                
-                # Delete picture file if exists                if picture_path and picture_path[0] and os.path.exists(picture_path[0]):
-                os.remove(picture_path[0])
-                
-                # Delete certificate files if exists
-                for cert_path in certificate_paths:
-                    if cert_path and os.path.exists(cert_path):
-                        os.remove(cert_path[0])
-                
-                # Delete presentation files if exists
-                for presentation_path in presentation_paths:
-                    if presentation_path and os.path.exists(presentation_path):
-                        os.remove(presentation_path)
-                
-                # Delete synopsis file if exists
-                if synopsis_path and synopsis_path[0] and os.path.exists(synopsis_path[0]):
-                    os.remove(synopsis_path[0])
-                    
-        except sqlite3.Error as e:
-            print(f"Error accessing database: {e}")
-        except OSError as e:
-            print(f"Error deleting files: {e}")
\ No newline at end of file
@@ -0,0 +1,295 @@
+import csv
+import io
+import os
+import zipfile
+from datetime import date, datetime
+from dates import date_number
+from blob_store import blob_transaction
+from file_manager import UploadTooLargeError, check_upload
+
+IMPORT_TABLES = ("students", "presentations", "synopsis", "certificates")
+REQUIRED_STUDENT_FIELDS = ("Name", "Roll Number", "Email", "Department", "Supervisor", "Registration Date", "Title", "Publications")
+
+
+class RowError:
+    def __init__(self, table, row_number, message):
+        self.table = table
+        self.row_number = row_number
+        self.message = message
+
+    def __str__(self):
+        return f"{self.table} row {self.row_number}: {self.message}"
+
+
+class ImportResult:
+    def __init__(self):
+        self.counts = {table: 0 for table in IMPORT_TABLES}
+        self.errors = []
+
+    def error(self, table, row_number, message):
+        self.errors.append(RowError(table, row_number, message))
+
+
+def parse_date(value):
+    # Exports carry YYYY-MM-DD, the forms use DD-MM-YYYY; both are accepted. Returns the stored
+    # YYYYMMDD integer.
+    value = (value or "").strip()
+    if not value:
+        return None
+    for fmt in ("%Y-%m-%d", "%d-%m-%Y"):
+        try:
+            return date_number(datetime.strptime(value, fmt).date())
+        except ValueError:
+            pass
+    raise ValueError(f"invalid date '{value}' (use YYYY-MM-DD or DD-MM-YYYY)")
+
+
+def parse_year(value):
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"invalid year '{value}'")
+
+
+def file_problem(path, label):
+    # Why `path` can't be imported, or None. Checked while validating, so a missing, oversized or
+    # unreadable file costs only its own row instead of failing blobs.add mid-transaction.
+    if not os.path.isfile(path):
+        return f"{label} {path} not found"
+    try:
+        check_upload(path)
+        with open(path, "rb"):
+            pass
+    except UploadTooLargeError as e:
+        return str(e)
+    except OSError as e:
+        return f"{label} {path} can't be read: {e.strerror}"
+    return None
+
+
+def clean(row, field):
+    value = row.get(field)
+    return "" if value is None else str(value).strip()
+
+
+def read_csv_rows(text_stream):
+    return list(csv.DictReader(text_stream))
+
+
+def read_import_file(path):
+    # Returns {table: [row dicts]} keyed by the export headers. A .zip is the "all tables" export,
+    # an .xlsx has one sheet per table, anything else is a students CSV.
+    if path.lower().endswith(".zip"):
+        tables = {}
+        with zipfile.ZipFile(path) as archive:
+            names = set(archive.namelist())
+            for table in IMPORT_TABLES:
+                if f"{table}.csv" in names:
+                    with archive.open(f"{table}.csv") as member:
+                        tables[table] = read_csv_rows(io.TextIOWrapper(member, encoding="utf-8-sig", newline=""))
+        return tables
+    if path.lower().endswith((".xlsx", ".xlsm")):
+        return read_excel(path)
+    with open(path, newline="", encoding="utf-8-sig") as csvfile:
+        return {"students": read_csv_rows(csvfile)}
+
+
+def cell_text(value):
+    # openpyxl gives real date cells as datetimes and numbers as floats; turn them into the text a
+    # CSV export would hold (2015-07-01, 2015) so the same parsing applies
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def read_excel(path):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise RuntimeError("Importing Excel files requires openpyxl (pip install openpyxl).")
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    tables = {}
+    try:
+        for index, sheet in enumerate(workbook.worksheets):
+            table = sheet.title.strip().lower()
+            if table not in IMPORT_TABLES:
+                if index != 0:
+                    continue
+                table = "students"
+            rows = sheet.iter_rows(values_only=True)
+            headers = [str(h).strip() if h is not None else "" for h in next(rows, [])]
+            tables[table] = [
+                {header: cell_text(value) for header, value in zip(headers, values)}
+                for values in rows if any(value is not None for value in values)
+            ]
+    finally:
+        workbook.close()
+    return tables
+
+
+def import_students(db_file, path, blob_dir, task=None):
+    # Validates every row up front and reports problems per row instead of aborting, then writes all
+    # valid students and their presentations, synopsis and certificates with executemany in one
+    # transaction. Referenced files go into the blob store, so a certificate shared by a whole
+    # batch is stored once.
+    tables = read_import_file(path)
+    result = ImportResult()
+    students = tables.get("students", [])
+    total = sum(len(rows) for rows in tables.values())
+    if task:
+        task.report(0, total, "Validating rows...")
+
+    with blob_transaction(db_file, blob_dir, task) as (cursor, blobs):
+        cursor.execute("SELECT roll_number FROM students")
+        taken_rolls = {row[0] for row in cursor.fetchall()}
+
+        student_rows = []
+        pictures = {}
+        source_ids = {}
+        for row_number, row in enumerate(students, start=2):
+            missing = [field for field in REQUIRED_STUDENT_FIELDS if not clean(row, field)]
+            if missing:
+                result.error("students", row_number, f"missing {', '.join(missing)}")
+                continue
+            roll_number = clean(row, "Roll Number")
+            if roll_number in taken_rolls:
+                result.error("students", row_number, f"roll number {roll_number} already exists")
+                continue
+            try:
+                batch_from = parse_year(clean(row, "Batch From"))
+                batch_to = parse_year(clean(row, "Batch To"))
+                original_batch_to = parse_year(clean(row, "Original Batch To")) or batch_to
+                registration_date = parse_date(clean(row, "Registration Date"))
+                dob = parse_date(clean(row, "DOB"))
+            except ValueError as e:
+                result.error("students", row_number, str(e))
+                continue
+            picture = clean(row, "Picture Path")
+            problem = picture and file_problem(picture, "picture")
+            if problem:
+                result.error("students", row_number, problem)
+                continue
+            taken_rolls.add(roll_number)
+            if picture:
+                pictures[roll_number] = picture
+            if clean(row, "ID"):
+                source_ids[clean(row, "ID")] = roll_number
+            student_rows.append((roll_number, batch_from, batch_to, original_batch_to, clean(row, "Name"), clean(row, "Email"),
+                                 clean(row, "Department"), clean(row, "Supervisor"), registration_date, dob,
+                                 clean(row, "Title"), clean(row, "Publications")))
+
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM students")
+        last_id = cursor.fetchone()[0]
+        cursor.executemany('''
+            INSERT INTO students (roll_number, batch_from, batch_to, original_batch_to, name, email, department, supervisor,
+                                  registration_date, dob, title, publications)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', student_rows)
+        result.counts["students"] = len(student_rows)
+        if task:
+            task.report(len(students), total, "Importing records...")
+
+        # Every new row got an id above the previous maximum, so one range scan maps roll numbers to ids
+        cursor.execute("SELECT id, roll_number FROM students WHERE id > ?", (last_id,))
+        new_ids = {roll: student_id for student_id, roll in cursor.fetchall()}
+
+        def student_for(table, row_number, row):
+            roll_number = source_ids.get(clean(row, "Student ID"))
+            if roll_number not in new_ids:
+                result.error(table, row_number, f"student {clean(row, 'Student ID') or '?'} was not imported")
+                return None
+            return new_ids[roll_number]
+
+        # blobs.add stores each distinct source file once, before the rows whose triggers count references to it
+        picture_rows = [(blobs.add(picture), new_ids[roll_number]) for roll_number, picture in pictures.items()]
+        cursor.executemany("UPDATE students SET picture_path = ? WHERE id = ?", picture_rows)
+
+        presentation_rows = []
+        for row_number, row in enumerate(tables.get("presentations", []), start=2):
+            student_id = student_for("presentations", row_number, row)
+            if student_id is None:
+                continue
+            try:
+                pres_date = parse_date(clean(row, "Presentation Date"))
+            except ValueError as e:
+                result.error("presentations", row_number, str(e))
+                continue
+            progress = clean(row, "Progress Notes")
+            pres_file = clean(row, "Presentation File")
+            if not (pres_date and progress):
+                result.error("presentations", row_number, "presentation date and progress notes are required")
+                continue
+            problem = pres_file and file_problem(pres_file, "presentation file")
+            if problem:
+                result.error("presentations", row_number, problem)
+                continue
+            presentation_rows.append((student_id, pres_date, progress, blobs.add(pres_file)))
+
+        synopsis_rows = []
+        with_synopsis = set()
+        for row_number, row in enumerate(tables.get("synopsis", []), start=2):
+            student_id = student_for("synopsis", row_number, row)
+            if student_id is None:
+                continue
+            if student_id in with_synopsis:
+                result.error("synopsis", row_number, "student already has a synopsis")
+                continue
+            try:
+                submission_date = parse_date(clean(row, "Submission Date"))
+            except ValueError as e:
+                result.error("synopsis", row_number, str(e))
+                continue
+            synopsis_title = clean(row, "Synopsis Title")
+            abstract = clean(row, "Abstract")
+            synopsis_file = clean(row, "Synopsis File")
+            if not all([synopsis_title, submission_date, abstract]):
+                result.error("synopsis", row_number, "synopsis title, submission date and abstract are required")
+                continue
+            problem = synopsis_file and file_problem(synopsis_file, "synopsis file")
+            if problem:
+                result.error("synopsis", row_number, problem)
+                continue
+            with_synopsis.add(student_id)
+            synopsis_rows.append((student_id, synopsis_title, submission_date, abstract, blobs.add(synopsis_file)))
+
+        certificate_rows = []
+        for row_number, row in enumerate(tables.get("certificates", []), start=2):
+            student_id = student_for("certificates", row_number, row)
+            if student_id is None:
+                continue
+            cert_title = clean(row, "Certificate Title")
+            cert_path = clean(row, "Certificate Path")
+            if not (cert_title and cert_path):
+                result.error("certificates", row_number, "certificate title and file are required")
+                continue
+            problem = file_problem(cert_path, "certificate file")
+            if problem:
+                result.error("certificates", row_number, problem)
+                continue
+            certificate_rows.append((student_id, cert_title, blobs.add(cert_path)))
+
+        cursor.executemany('''
+            INSERT INTO presentations (student_id, presentation_date, progress_notes, presentation_file)
+            VALUES (?, ?, ?, ?)
+        ''', presentation_rows)
+        cursor.executemany('''
+            INSERT INTO synopsis (student_id, synopsis_title, submission_date, abstract, synopsis_file)
+            VALUES (?, ?, ?, ?, ?)
+        ''', synopsis_rows)
+        cursor.executemany('''
+            INSERT INTO certificates (student_id, certificate_title, certificate_path)
+            VALUES (?, ?, ?)
+        ''', certificate_rows)
+        result.counts["presentations"] = len(presentation_rows)
+        result.counts["synopsis"] = len(synopsis_rows)
+        result.counts["certificates"] = len(certificate_rows)
+    return result
@@ -0,0 +1,295 @@
+import collections
+import contextlib
+import functools
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+SLOW_QUERY_MS = float(os.environ.get("PHD_SLOW_QUERY_MS", 100))
+EXPLAIN_PREFIXES = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+SQL_KINDS = ("connect", "execute", "executemany", "executescript", "fetch")
+MAX_SLOW_QUERIES = 200
+_SKIP_FILES = {__file__, contextlib.__file__}
+_NO_TIMER = contextlib.nullcontext()
+
+
+def call_site():
+    # First frame outside this module, e.g. "admin_ui.py:712 in load_page"
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_filename in _SKIP_FILES:
+        frame = frame.f_back
+    if frame is None:
+        return "?"
+    return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno} in {frame.f_code.co_name}"
+
+
+def statement_label(sql):
+    return " ".join(sql.split())[:200]
+
+
+class Profiler:
+    # Off by default: every hook checks `enabled` first and goes straight to the real call, so the
+    # cost when off is one attribute lookup per SQL call or file operation. When on, it aggregates
+    # duration and rows per (kind, statement or file type, call site), keeps the slow queries with their
+    # query plans, and attributes SQL and file time to the screen being shown.
+    def __init__(self, slow_query_ms=SLOW_QUERY_MS):
+        self.enabled = False
+        self.slow_query_ms = slow_query_ms
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._ops = {}
+            self._screens = {}
+            self._slow = collections.deque(maxlen=MAX_SLOW_QUERIES)
+            self._screen = None
+
+    def enable(self, slow_query_ms=None):
+        if slow_query_ms is not None:
+            self.slow_query_ms = slow_query_ms
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        return self.enabled
+
+    def _thread_totals(self):
+        totals = getattr(self._local, "totals", None)
+        if totals is None:
+            totals = self._local.totals = {"sql": 0.0, "file": 0.0}
+        return totals
+
+    def record(self, kind, label, seconds, rows=None, site=None):
+        group = "sql" if kind in SQL_KINDS else "file"
+        self._thread_totals()[group] += seconds
+        key = (kind, label, site or call_site())
+        with self._lock:
+            stats = self._ops.get(key)
+            if stats is None:
+                stats = self._ops[key] = {"count": 0, "total": 0.0, "max": 0.0, "rows": 0}
+            stats["count"] += 1
+            stats["total"] += seconds
+            stats["max"] = max(stats["max"], seconds)
+            if rows is not None and rows >= 0:
+                stats["rows"] += rows
+            screen = self._screens.get(self._screen)
+            if screen is not None:
+                screen[group] += seconds
+
+    def record_sql(self, conn, kind, sql, parameters, seconds, rows):
+        site = call_site()
+        label = statement_label(sql)
+        self.record(kind, label, seconds, rows, site)
+        if seconds * 1000 >= self.slow_query_ms:
+            plan = self.explain(conn, sql, parameters) if kind == "execute" else []
+            with self._lock:
+                self._slow.append({"sql": label, "ms": round(seconds * 1000, 3), "site": site, "plan": plan})
+            print(f"Slow query ({seconds * 1000:.1f} ms) at {site}: {label}")
+            for line in plan:
+                print(f"    {line}")
+
+    def explain(self, conn, sql, parameters):
+        if not sql.lstrip().upper().startswith(EXPLAIN_PREFIXES):
+            return []
+        try:
+            rows = sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + sql, parameters).fetchall()
+        except sqlite3.Error as e:
+            return [f"(no plan: {e})"]
+        return [row[-1] for row in rows]
+
+    @contextlib.contextmanager
+    def screen(self, name):
+        totals = self._thread_totals()
+        sql_before, file_before = totals["sql"], totals["file"]
+        with self._lock:
+            previous = self._screen
+            self._screen = name
+            if name not in self._screens:
+                self._screens[name] = {"visits": 0, "render": 0.0, "render_sql": 0.0, "render_file": 0.0,
+                                       "sql": 0.0, "file": 0.0}
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stats = self._screens[name]
+                stats["visits"] += 1
+                stats["render"] += elapsed
+                stats["render_sql"] += totals["sql"] - sql_before
+                stats["render_file"] += totals["file"] - file_before
+                # Nested screens hand "current" back; top-level ones stay current so the SQL their
+                # background tasks run afterwards is still attributed to them
+                if previous is not None:
+                    self._screen = previous
+
+    def report(self):
+        with self._lock:
+            operations = [{
+                "kind": kind, "label": label, "site": site, "count": stats["count"],
+                "total_ms": round(stats["total"] * 1000, 3),
+                "mean_ms": round(stats["total"] / stats["count"] * 1000, 3),
+                "max_ms": round(stats["max"] * 1000, 3), "rows": stats["rows"],
+            } for (kind, label, site), stats in self._ops.items()]
+            screens = {name: {
+                "visits": stats["visits"],
+                "render_ms": round(stats["render"] * 1000, 3),
+                "render_sql_ms": round(stats["render_sql"] * 1000, 3),
+                "render_file_ms": round(stats["render_file"] * 1000, 3),
+                "widgets_ms": round((stats["render"] - stats["render_sql"] - stats["render_file"]) * 1000, 3),
+                "background_sql_ms": round((stats["sql"] - stats["render_sql"]) * 1000, 3),
+                "background_file_ms": round((stats["file"] - stats["render_file"]) * 1000, 3),
+            } for name, stats in self._screens.items()}
+            slow = list(self._slow)
+        operations.sort(key=lambda op: op["total_ms"], reverse=True)
+        return {"slow_query_ms": self.slow_query_ms, "screens": screens, "operations": operations, "slow_queries": slow}
+
+    def dump(self, path):
+        report = self.report()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        for name, stats in report["screens"].items():
+            print(f"{name}: {stats['visits']} visits, {stats['render_ms']:.1f} ms total, "
+                  f"{stats['render_sql_ms']:.1f} ms in SQL, {stats['render_file_ms']:.1f} ms in files, "
+                  f"{stats['widgets_ms']:.1f} ms in widgets; {stats['background_sql_ms']:.1f} ms background SQL")
+        for op in report["operations"][:10]:
+            print(f"{op['total_ms']:>10.1f} ms  {op['count']:>6}x  {op['kind']:<12} {op['site']}  {op['label'][:80]}")
+        print(f"Profile written to {path}")
+        return report
+
+
+profiler = Profiler()
+if os.environ.get("PHD_PROFILE"):
+    profiler.enable()
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=()):
+        if not profiler.enabled:
+            return super().execute(sql, parameters)
+        self._sql = sql
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            profiler.record_sql(self.connection, "execute", sql, parameters, time.perf_counter() - start, self.rowcount)
+
+    def executemany(self, sql, seq_of_parameters):
+        if not profiler.enabled:
+            return super().executemany(sql, seq_of_parameters)
+        self._sql = sql
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            profiler.record_sql(self.connection, "executemany", sql, None, time.perf_counter() - start, self.rowcount)
+
+    def executescript(self, sql_script):
+        if not profiler.enabled:
+            return super().executescript(sql_script)
+        self._sql = sql_script
+        start = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            profiler.record_sql(self.connection, "executescript", sql_script, None, time.perf_counter() - start, None)
+
+    def _fetched(self, start, rows):
+        profiler.record("fetch", statement_label(getattr(self, "_sql", "?")), time.perf_counter() - start, rows)
+
+    def fetchone(self):
+        if not profiler.enabled:
+            return super().fetchone()
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(start, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, size=None):
+        if size is None:
+            size = self.arraysize
+        if not profiler.enabled:
+            return super().fetchmany(size)
+        start = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._fetched(start, len(rows))
+        return rows
+
+    def fetchall(self):
+        if not profiler.enabled:
+            return super().fetchall()
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(start, len(rows))
+        return rows
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    # With profiling on, cursors are InstrumentedCursors and Connection.execute and friends go through
+    # cursor() so the shortcut methods are timed too. With it off they are plain sqlite3 cursors and
+    # calls; a cursor created before profiling was turned on stays untimed.
+    def cursor(self, factory=None):
+        if factory is None:
+            factory = InstrumentedCursor if profiler.enabled else sqlite3.Cursor
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        if not profiler.enabled:
+            return super().execute(sql, parameters)
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        if not profiler.enabled:
+            return super().executemany(sql, seq_of_parameters)
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        if not profiler.enabled:
+            return super().executescript(sql_script)
+        return self.cursor().executescript(sql_script)
+
+
+def connect(db_file, **kwargs):
+    if not profiler.enabled:
+        return sqlite3.connect(db_file, factory=InstrumentedConnection, **kwargs)
+    start = time.perf_counter()
+    conn = sqlite3.connect(db_file, factory=InstrumentedConnection, **kwargs)
+    profiler.record("connect", db_file, time.perf_counter() - start)
+    return conn
+
+
+class _FileTimer:
+    def __init__(self, kind, path):
+        self.kind = kind
+        self.path = path
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        profiler.record(self.kind, os.path.splitext(self.path)[1].lower() or "(none)", time.perf_counter() - self.start)
+        return False
+
+
+def file_op(kind, path):
+    # `with file_op("copy", src): ...` times the block when profiling is on
+    return _FileTimer(kind, path) if profiler.enabled else _NO_TIMER
+
+
+def profile_screen(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not profiler.enabled:
+            return func(*args, **kwargs)
+        with profiler.screen(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
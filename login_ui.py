@@ -1,13 +1,19 @@
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
+from instrumentation import profile_screen
 
 class LoginUI:
+    @profile_screen
     def show_login(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        # A new session starts from fresh data and freshly built screens
+        self.service.new_session()
+        self.screens.clear(keep=("login",))
+        screen = self.screens.open("login")
+        if screen is None:
+            return
 
-        card_frame, canvas = self.create_scrollable_frame(self.root, include_buttons=False)
+        card_frame, canvas = self.create_scrollable_frame(screen.frame, include_buttons=False)
         card_frame.configure(padding=30)
 
         ttk.Label(card_frame, text="PhD Management System", style="Heading.TLabel").pack(pady=20)
@@ -19,21 +25,29 @@ class LoginUI:
         password_entry.pack(pady=10, padx=20, fill="x", ipady=5)
 
         def try_login():
-            if self.login(username_entry.get(), password_entry.get()):
-                if self.is_admin:
-                    self.show_admin_dashboard()
+            username, password = username_entry.get(), password_entry.get()
+
+            def logged_in(success):
+                if success:
+                    if self.is_admin:
+                        self.show_admin_dashboard()
+                    else:
+                        self.show_student_dashboard()
                 else:
-                    self.show_student_dashboard()
-            else:
-                messagebox.showerror("Error", "Invalid credentials.", parent=self.root)
+                    messagebox.showerror("Error", "Invalid credentials.", parent=self.root)
+
+            self.task_runner.run(lambda task: self.login(username, password), on_success=logged_in, owner=card_frame)
 
         login_btn = ttk.Button(card_frame, text="Login", style="Danger.TButton", command=try_login)
         login_btn.pack(pady=20, padx=20, fill="x", ipady=5)
         self.button_bind(login_btn)
 
-        canvas.bind_all("<MouseWheel>", lambda event: canvas.yview_scroll(int(-1 * (event.delta / 120)), "units"))
-        canvas.bind_all("<Button-4>", lambda event: canvas.yview_scroll(-1, "units"))
-        canvas.bind_all("<Button-5>", lambda event: canvas.yview_scroll(1, "units"))
+        def reset():
+            username_entry.delete(0, "end")
+            password_entry.delete(0, "end")
+            username_entry.focus_set()
+
+        self.screens.ready(screen, canvas, refresh=reset)
         
         card_frame.update_idletasks()
         canvas.configure(scrollregion=canvas.bbox("all"))
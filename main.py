@@ -1,12 +1,17 @@
+import time
+STARTED = time.perf_counter()  # before the other imports, so startup timing includes them
 import tkinter as tk
 from db_manager import DatabaseManager
 from ui_utils import UIUtils
 from login_ui import LoginUI
-from admin_ui import AdminUI
-from student_ui import StudentUI
 from file_manager import FileManager
+from connection_manager import close_all_connections
+from task_runner import TaskRunner
+from screen_manager import ScreenManager
+from instrumentation import profiler
+from datetime import datetime
 
-class PhDManagement(DatabaseManager, UIUtils, LoginUI, AdminUI, FileManager):
+class PhDManagement(DatabaseManager, UIUtils, LoginUI, FileManager):
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("PhD Management System")
@@ -18,17 +23,48 @@ class PhDManagement(DatabaseManager, UIUtils, LoginUI, AdminUI, FileManager):
         self.upload_dir = "Uploads"
         self.current_user = None
         self.is_admin = False
+        self.admin_ui = None
+        self.task_runner = TaskRunner(self.root)
+        self.screens = ScreenManager(self.root)
         super().__init__()
         self.setup_styles()
+        # F12 toggles SQL/file/screen profiling, Shift+F12 writes what has been collected so far
+        self.root.bind_all("<F12>", self.toggle_profiling)
+        self.root.bind_all("<Shift-F12>", self.dump_profile)
         self.show_login()
+        self.root.after_idle(self.report_startup)
+
+    def report_startup(self):
+        if profiler.enabled:
+            print(f"Login window ready in {(time.perf_counter() - STARTED) * 1000:.0f} ms")
+
+    def show_admin_dashboard(self):
+        # admin_ui is only imported once an admin logs in; the AdminUI is then kept for the session
+        if self.admin_ui is None:
+            from admin_ui import AdminUI
+            self.admin_ui = AdminUI(self.root, self.db_file, FileManager(self.db_file, self.upload_dir), self.show_login,
+                                    task_runner=self.task_runner, service=self.service, screens=self.screens)
+        self.admin_ui.show_admin_dashboard()
 
     def show_student_dashboard(self):
+        from student_ui import StudentUI
         # Create a StudentUI instance with the current user's ID
-        student_ui = StudentUI(self.root, self.db_file, FileManager(self.upload_dir), self.show_login, self.current_user)
+        student_ui = StudentUI(self.root, self.db_file, FileManager(self.db_file, self.upload_dir), self.show_login, self.current_user,
+                               task_runner=self.task_runner, service=self.service, screens=self.screens)
         student_ui.show_student_dashboard()
 
+    def toggle_profiling(self, event=None):
+        print(f"Profiling {'enabled' if profiler.toggle() else 'disabled'}")
+
+    def dump_profile(self, event=None):
+        profiler.dump(f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+
     def run(self):
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.task_runner.shutdown()
+            close_all_connections()
 
 if __name__ == "__main__":
     app = PhDManagement()
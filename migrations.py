@@ -0,0 +1,397 @@
+import os
+import sqlite3
+from dates import DATE_MAX, DATE_MIN, date_check
+from file_manager import FILE_COLUMNS
+
+
+def migrate_add_indexes(cursor):
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_presentations_student_id ON presentations(student_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_synopsis_student_id ON synopsis(student_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_certificates_student_id ON certificates(student_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_students_email_dob ON students(email, dob)")
+    create_roll_number_index(cursor)
+
+
+def create_roll_number_index(cursor):
+    try:
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_students_roll_number ON students(roll_number)")
+    except sqlite3.IntegrityError:
+        # Older databases may already hold duplicate roll numbers; keep the lookup fast anyway.
+        print("Duplicate roll numbers found; creating a non-unique roll number index instead.")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_students_roll_number ON students(roll_number)")
+
+
+SEARCH_COLUMNS = "name, roll_number, email, supervisor, department, title, publications, synopsis, progress_notes"
+
+
+def search_row_select(student_id_expr=None):
+    # One search document per student, folding in the synopsis and all presentation notes
+    where = f"WHERE s.id = {student_id_expr}" if student_id_expr else ""
+    return f'''
+        SELECT s.id, s.name, s.roll_number, s.email, s.supervisor, s.department, s.title, s.publications,
+               (SELECT group_concat(synopsis_title || ' ' || abstract, ' ') FROM synopsis WHERE student_id = s.id),
+               (SELECT group_concat(progress_notes, ' ') FROM presentations WHERE student_id = s.id)
+        FROM students s {where}
+    '''
+
+
+def search_refresh_sql(student_id_expr):
+    return f'''
+        DELETE FROM student_search WHERE rowid = {student_id_expr};
+        INSERT INTO student_search (rowid, {SEARCH_COLUMNS}) {search_row_select(student_id_expr)};
+    '''
+
+
+def fts5_available(cursor):
+    try:
+        cursor.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        cursor.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def create_search_triggers(cursor):
+    triggers = {
+        "students_search_ai": f"AFTER INSERT ON students BEGIN {search_refresh_sql('new.id')} END",
+        "students_search_au": f"""AFTER UPDATE OF name, roll_number, email, supervisor, department, title, publications
+            ON students BEGIN {search_refresh_sql('old.id')} {search_refresh_sql('new.id')} END""",
+        "students_search_ad": "AFTER DELETE ON students BEGIN DELETE FROM student_search WHERE rowid = old.id; END",
+    }
+    for table in ("synopsis", "presentations"):
+        triggers[f"{table}_search_ai"] = f"AFTER INSERT ON {table} BEGIN {search_refresh_sql('new.student_id')} END"
+        triggers[f"{table}_search_au"] = (f"AFTER UPDATE ON {table} BEGIN {search_refresh_sql('old.student_id')} "
+                                          f"{search_refresh_sql('new.student_id')} END")
+        triggers[f"{table}_search_ad"] = f"AFTER DELETE ON {table} BEGIN {search_refresh_sql('old.student_id')} END"
+    for name, body in triggers.items():
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"CREATE TRIGGER {name} {body}")
+
+
+def migrate_add_search_index(cursor):
+    if not fts5_available(cursor):
+        # search_students falls back to LIKE queries when the index is missing
+        print("SQLite was built without FTS5; full-text search is disabled.")
+        return
+    cursor.execute(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS student_search USING fts5(
+            {SEARCH_COLUMNS},
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    ''')
+    create_search_triggers(cursor)
+    cursor.execute("DELETE FROM student_search")
+    cursor.execute(f"INSERT INTO student_search (rowid, {SEARCH_COLUMNS}) {search_row_select()}")
+
+
+def create_file_ref_triggers(cursor):
+    # Keeps files.ref_count equal to the number of record columns pointing at each stored file
+    triggers = {}
+    for table, column in FILE_COLUMNS.items():
+        triggers[f"{table}_files_ai"] = (f"AFTER INSERT ON {table} WHEN new.{column} IS NOT NULL BEGIN "
+                                         f"UPDATE files SET ref_count = ref_count + 1 WHERE path = new.{column}; END")
+        triggers[f"{table}_files_au"] = (f"AFTER UPDATE OF {column} ON {table} WHEN old.{column} IS NOT new.{column} BEGIN "
+                                         f"UPDATE files SET ref_count = ref_count - 1 WHERE path = old.{column}; "
+                                         f"UPDATE files SET ref_count = ref_count + 1 WHERE path = new.{column}; END")
+        triggers[f"{table}_files_ad"] = (f"AFTER DELETE ON {table} WHEN old.{column} IS NOT NULL BEGIN "
+                                         f"UPDATE files SET ref_count = ref_count - 1 WHERE path = old.{column}; END")
+    for name, body in triggers.items():
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"CREATE TRIGGER {name} {body}")
+
+
+def migrate_add_file_store(cursor):
+    from blob_store import file_sha256
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS files (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sha256 TEXT NOT NULL,
+            path TEXT NOT NULL UNIQUE,
+            size INTEGER NOT NULL,
+            ref_count INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_files_sha256 ON files(sha256)")
+    create_file_ref_triggers(cursor)
+    # Register the files uploaded before the store existed where they are, so new uploads with the
+    # same content reuse them and deletes go through the same reference counting
+    for table, column in FILE_COLUMNS.items():
+        cursor.execute(f"SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL")
+        for (path,) in cursor.fetchall():
+            if os.path.isfile(path):
+                cursor.execute("INSERT OR IGNORE INTO files (sha256, path, size) VALUES (?, ?, ?)",
+                               (file_sha256(path), path, os.path.getsize(path)))
+    counts = " + ".join(f"(SELECT COUNT(*) FROM {table} WHERE {column} = files.path)" for table, column in FILE_COLUMNS.items())
+    cursor.execute(f"UPDATE files SET ref_count = {counts}")
+
+
+def migrate_add_scan_cache(cursor):
+    # Directory listings from the last storage scan, keyed by absolute path; a directory whose mtime
+    # is unchanged is not listed again
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS scan_dirs (
+            path TEXT PRIMARY KEY,
+            mtime_ns INTEGER NOT NULL,
+            entries TEXT NOT NULL
+        )
+    ''')
+
+
+# Student attributes the dashboard counts by, as SQL over a students row alias
+DASHBOARD_FACETS = {
+    "department": "{row}.department",
+    "supervisor": "{row}.supervisor",
+    "batch": "CASE WHEN {row}.batch_from IS NOT NULL AND {row}.batch_to IS NOT NULL "
+             "THEN {row}.batch_from || '-' || {row}.batch_to END",
+    "extension": "CASE WHEN CAST({row}.batch_to AS INTEGER) > CAST({row}.original_batch_to AS INTEGER) "
+                 "THEN 'extended' ELSE 'on time' END",
+}
+SYNOPSIS_STATUS = "CASE WHEN EXISTS (SELECT 1 FROM synopsis WHERE student_id = {row}.id) THEN 'submitted' ELSE 'pending' END"
+DASHBOARD_UPSERT = "ON CONFLICT(facet, value) DO UPDATE SET total = total + excluded.total"
+
+
+def dashboard_change(row, sign, with_totals=True):
+    # One upsert adding `sign` to every facet value of the given students row (new or old)
+    facets = dict(DASHBOARD_FACETS)
+    if with_totals:
+        facets.update(students="''", synopsis=SYNOPSIS_STATUS)
+    values = ", ".join(f"('{facet}', COALESCE({expr.format(row=row)}, ''), {sign})" for facet, expr in facets.items())
+    return f"INSERT INTO dashboard_counts (facet, value, total) VALUES {values} {DASHBOARD_UPSERT};"
+
+
+def create_dashboard_triggers(cursor):
+    # Keeps dashboard_counts current so the dashboard reads a few rows instead of scanning tables.
+    # Student deletes are counted BEFORE the row goes: ON DELETE CASCADE removes the synopsis ahead
+    # of AFTER triggers, and the synopsis triggers skip rows whose student is already gone.
+    student_exists = "EXISTS (SELECT 1 FROM students WHERE id = {row}.student_id)"
+    synopsis_moved = "INSERT INTO dashboard_counts (facet, value, total) VALUES ('synopsis', 'submitted', {sign}), " \
+                     "('synopsis', 'pending', {opposite}) " + DASHBOARD_UPSERT + ";"
+    triggers = {
+        "students_dashboard_ai": f"AFTER INSERT ON students BEGIN {dashboard_change('new', 1)} END",
+        "students_dashboard_bd": f"BEFORE DELETE ON students BEGIN {dashboard_change('old', -1)} END",
+        "students_dashboard_au": (f"AFTER UPDATE OF department, supervisor, batch_from, batch_to, original_batch_to "
+                                  f"ON students BEGIN {dashboard_change('old', -1, False)} "
+                                  f"{dashboard_change('new', 1, False)} END"),
+        "synopsis_dashboard_ai": (f"AFTER INSERT ON synopsis WHEN {student_exists.format(row='new')} "
+                                  f"AND (SELECT COUNT(*) FROM synopsis WHERE student_id = new.student_id) = 1 "
+                                  f"BEGIN {synopsis_moved.format(sign=1, opposite=-1)} END"),
+        "synopsis_dashboard_ad": (f"AFTER DELETE ON synopsis WHEN {student_exists.format(row='old')} "
+                                  f"AND NOT EXISTS (SELECT 1 FROM synopsis WHERE student_id = old.student_id) "
+                                  f"BEGIN {synopsis_moved.format(sign=-1, opposite=1)} END"),
+    }
+    for table in ("presentations", "certificates"):
+        for event, sign in (("insert", 1), ("delete", -1)):
+            triggers[f"{table}_dashboard_a{event[0]}"] = (
+                f"AFTER {event.upper()} ON {table} BEGIN INSERT INTO dashboard_counts (facet, value, total) "
+                f"VALUES ('{table}', '', {sign}) {DASHBOARD_UPSERT}; END")
+    for name, body in triggers.items():
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"CREATE TRIGGER {name} {body}")
+
+
+def rebuild_dashboard_counts(cursor):
+    cursor.execute("DELETE FROM dashboard_counts")
+    facets = dict(DASHBOARD_FACETS, students="''", synopsis=SYNOPSIS_STATUS)
+    for facet, expr in facets.items():
+        cursor.execute(f'''
+            INSERT INTO dashboard_counts (facet, value, total)
+            SELECT '{facet}', COALESCE({expr.format(row="s")}, ''), COUNT(*) FROM students s GROUP BY 2
+        ''')
+    for table in ("presentations", "certificates"):
+        cursor.execute(f"INSERT INTO dashboard_counts (facet, value, total) SELECT '{table}', '', COUNT(*) FROM {table}")
+
+
+def migrate_add_dashboard_counts(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS dashboard_counts (
+            facet TEXT NOT NULL,
+            value TEXT NOT NULL,
+            total INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (facet, value)
+        ) WITHOUT ROWID
+    ''')
+    create_dashboard_triggers(cursor)
+    rebuild_dashboard_counts(cursor)
+
+
+def migrate_add_presentation_date_index(cursor):
+    # Covers the compliance report's per-student window over presentation dates; student_id lookups
+    # use its leading column, so the single-column index is no longer needed
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_presentations_student_date ON presentations(student_id, presentation_date)")
+    cursor.execute("DROP INDEX IF EXISTS idx_presentations_student_id")
+
+
+def stored_date_sql(column):
+    # Legacy TEXT date -> YYYYMMDD integer. YYYY-MM-DD (optionally with a time) and the forms'
+    # DD-MM-YYYY convert; anything that isn't a real calendar date becomes NULL. date() alone lets
+    # 2020-02-30 through, a '+0 days' round trip normalizes it so it no longer matches.
+    iso = f"substr({column}, 1, 10)"
+    dmy = f"(substr({column}, 7, 4) || '-' || substr({column}, 4, 2) || '-' || substr({column}, 1, 2))"
+    return f'''CASE
+        WHEN typeof({column}) = 'integer' AND {column} BETWEEN {DATE_MIN} AND {DATE_MAX} THEN {column}
+        WHEN {column} GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]*' AND date({iso}, '+0 days') = {iso}
+            THEN CAST(replace({iso}, '-', '') AS INTEGER)
+        WHEN {column} GLOB '[0-9][0-9]-[0-9][0-9]-[0-9][0-9][0-9][0-9]' AND date({dmy}, '+0 days') = {dmy}
+            THEN CAST(replace({dmy}, '-', '') AS INTEGER)
+    END'''
+
+
+def stored_year_sql(column):
+    return f'''CASE
+        WHEN typeof({column}) = 'integer' THEN {column}
+        WHEN trim({column}) GLOB '[0-9][0-9][0-9][0-9]' THEN CAST(trim({column}) AS INTEGER)
+    END'''
+
+
+def year_check(column):
+    return f"CHECK ({column} IS NULL OR typeof({column}) = 'integer')"
+
+
+# The typed layout of the tables holding dates: {table: (column definitions, {column: converter})}.
+# Columns without a converter are copied as they are.
+TYPED_TABLES = {
+    "students": (f'''
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        roll_number TEXT NOT NULL,
+        batch_from INTEGER {year_check("batch_from")},
+        batch_to INTEGER {year_check("batch_to")},
+        original_batch_to INTEGER {year_check("original_batch_to")},
+        name TEXT NOT NULL,
+        email TEXT NOT NULL,
+        department TEXT NOT NULL,
+        supervisor TEXT NOT NULL,
+        registration_date INTEGER {date_check("registration_date")},
+        dob INTEGER {date_check("dob")},
+        picture_path TEXT,
+        title TEXT NOT NULL,
+        publications TEXT NOT NULL,
+        extension_years INTEGER GENERATED ALWAYS AS (
+            CASE WHEN batch_to > original_batch_to THEN batch_to - original_batch_to ELSE 0 END
+        ) STORED
+    ''', {"batch_from": stored_year_sql, "batch_to": stored_year_sql, "original_batch_to": stored_year_sql,
+          "registration_date": stored_date_sql, "dob": stored_date_sql}),
+    "presentations": (f'''
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        student_id INTEGER NOT NULL,
+        presentation_date INTEGER {date_check("presentation_date")},
+        progress_notes TEXT NOT NULL,
+        presentation_file TEXT,
+        FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE
+    ''', {"presentation_date": stored_date_sql}),
+    "synopsis": (f'''
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        student_id INTEGER NOT NULL,
+        synopsis_title TEXT NOT NULL,
+        submission_date INTEGER {date_check("submission_date")},
+        abstract TEXT NOT NULL,
+        synopsis_file TEXT,
+        FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE
+    ''', {"submission_date": stored_date_sql}),
+}
+TYPED_COLUMNS = {
+    "students": ("id", "roll_number", "batch_from", "batch_to", "original_batch_to", "name", "email", "department",
+                 "supervisor", "registration_date", "dob", "picture_path", "title", "publications"),
+    "presentations": ("id", "student_id", "presentation_date", "progress_notes", "presentation_file"),
+    "synopsis": ("id", "student_id", "synopsis_title", "submission_date", "abstract", "synopsis_file"),
+}
+
+
+def migrate_typed_dates(cursor):
+    # Rebuilds students, presentations and synopsis with YYYYMMDD integer dates, integer batch years
+    # and a stored extension_years column, so date and batch filters are index range scans instead of
+    # string comparisons and casts. Dropping students would cascade into the child tables, so this
+    # has to run with foreign keys off (create_or_migrate_table does that).
+    cursor.execute("PRAGMA foreign_keys")
+    if cursor.fetchone()[0]:
+        raise RuntimeError("The typed dates migration must run with foreign keys off.")
+    # sqlite3 leaves DDL in autocommit; one explicit transaction makes the rebuild all-or-nothing
+    if not cursor.connection.in_transaction:
+        cursor.execute("BEGIN")
+    # Triggers on the rebuilt tables would block the renames; they are recreated at the end
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+    for (name,) in cursor.fetchall():
+        cursor.execute(f"DROP TRIGGER {name}")
+    for table, (definition, converters) in TYPED_TABLES.items():
+        columns = TYPED_COLUMNS[table]
+        for column, converter in converters.items():
+            # Values that don't convert are cleared, so their original text is kept in unconverted_values
+            # to be corrected by hand
+            cursor.execute(f"SELECT id, {column} FROM {table} WHERE {column} IS NOT NULL AND trim({column}) <> '' "
+                           f"AND ({converter(column)}) IS NULL")
+            unreadable = cursor.fetchall()
+            if unreadable:
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS unconverted_values (
+                        table_name TEXT NOT NULL,
+                        row_id INTEGER NOT NULL,
+                        column_name TEXT NOT NULL,
+                        value TEXT
+                    )
+                ''')
+                cursor.executemany("INSERT INTO unconverted_values VALUES (?, ?, ?, ?)",
+                                   [(table, row_id, column, value) for row_id, value in unreadable])
+                ids = ", ".join(str(row_id) for row_id, value in unreadable)
+                print(f"{len(unreadable)} unreadable {table}.{column} values were cleared (ids {ids}); "
+                      f"the originals are kept in unconverted_values.")
+        cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,))
+        row = cursor.fetchone()
+        cursor.execute(f"CREATE TABLE {table}_typed ({definition})")
+        values = ", ".join(converters[column](column) if column in converters else column for column in columns)
+        cursor.execute(f"INSERT INTO {table}_typed ({', '.join(columns)}) SELECT {values} FROM {table}")
+        cursor.execute(f"DROP TABLE {table}")
+        cursor.execute(f"ALTER TABLE {table}_typed RENAME TO {table}")
+        if row:
+            # Keep AUTOINCREMENT from handing out ids of rows deleted before the rebuild
+            cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (row[0], table))
+            if not cursor.rowcount:
+                cursor.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (table, row[0]))
+    cursor.execute("CREATE INDEX idx_presentations_student_date ON presentations(student_id, presentation_date)")
+    cursor.execute("CREATE INDEX idx_synopsis_student_id ON synopsis(student_id)")
+    cursor.execute("CREATE INDEX idx_students_email_dob ON students(email, dob)")
+    create_roll_number_index(cursor)
+    cursor.execute("CREATE INDEX idx_students_registration_date ON students(registration_date)")
+    cursor.execute("CREATE INDEX idx_students_batch_to ON students(batch_to)")
+    cursor.execute("CREATE INDEX idx_students_extension_years ON students(extension_years)")
+    create_file_ref_triggers(cursor)
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'student_search'")
+    if cursor.fetchone():
+        create_search_triggers(cursor)
+    create_dashboard_triggers(cursor)
+    rebuild_dashboard_counts(cursor)
+
+
+def migrate_add_facet_indexes(cursor):
+    # The student filter counts by department, supervisor and batch with GROUP BY over these
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_students_department ON students(department)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_students_supervisor ON students(supervisor)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_students_batch_from ON students(batch_from)")
+
+
+# Each entry upgrades the schema by one version; the index + 1 is stored in PRAGMA user_version.
+MIGRATIONS = [
+    migrate_add_indexes,
+    migrate_add_search_index,
+    migrate_add_file_store,
+    migrate_add_scan_cache,
+    migrate_add_dashboard_counts,
+    migrate_add_presentation_date_index,
+    migrate_typed_dates,
+    migrate_add_facet_indexes,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(cursor):
+    cursor.execute("PRAGMA user_version")
+    return cursor.fetchone()[0]
+
+
+def apply_migrations(cursor):
+    version = get_schema_version(cursor)
+    for target, migration in enumerate(MIGRATIONS, start=1):
+        if version < target:
+            migration(cursor)
+            cursor.execute(f"PRAGMA user_version = {target}")
@@ -1,25 +1,29 @@
 CREATE TABLE students (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     roll_number TEXT NOT NULL UNIQUE,
-    batch_from INTEGER,
-    batch_to INTEGER,
+    batch_from INTEGER CHECK (batch_from IS NULL OR typeof(batch_from) = 'integer'),
+    batch_to INTEGER CHECK (batch_to IS NULL OR typeof(batch_to) = 'integer'),
+    original_batch_to INTEGER CHECK (original_batch_to IS NULL OR typeof(original_batch_to) = 'integer'),
     name TEXT NOT NULL,
     email TEXT NOT NULL,
     department TEXT NOT NULL,
     supervisor TEXT NOT NULL,
-    registration_date TEXT NOT NULL,
-    dob TEXT,
-    certificate_path TEXT,
+    -- Dates are YYYYMMDD integers (20240115)
+    registration_date INTEGER CHECK (registration_date IS NULL OR registration_date BETWEEN 10000101 AND 99991231),
+    dob INTEGER CHECK (dob IS NULL OR dob BETWEEN 10000101 AND 99991231),
     picture_path TEXT,
     title TEXT NOT NULL,
-    publications TEXT NOT NULL
+    publications TEXT NOT NULL,
+    extension_years INTEGER GENERATED ALWAYS AS (
+        CASE WHEN batch_to > original_batch_to THEN batch_to - original_batch_to ELSE 0 END
+    ) STORED
 );
 
 CREATE TABLE synopsis (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     student_id INTEGER NOT NULL,
     synopsis_title TEXT NOT NULL,
-    submission_date TEXT NOT NULL,
+    submission_date INTEGER CHECK (submission_date IS NULL OR submission_date BETWEEN 10000101 AND 99991231),
     abstract TEXT NOT NULL,
     synopsis_file TEXT,
     FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE
@@ -28,8 +32,52 @@ CREATE TABLE synopsis (
 CREATE TABLE presentations (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     student_id INTEGER NOT NULL,
-    presentation_date TEXT NOT NULL,
+    presentation_date INTEGER CHECK (presentation_date IS NULL OR presentation_date BETWEEN 10000101 AND 99991231),
     progress_notes TEXT NOT NULL,
     presentation_file TEXT,
     FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE
 );
+
+CREATE TABLE certificates (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    student_id INTEGER NOT NULL,
+    certificate_title TEXT NOT NULL,
+    certificate_path TEXT NOT NULL,
+    FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE
+);
+
+CREATE INDEX idx_presentations_student_date ON presentations(student_id, presentation_date);
+CREATE INDEX idx_synopsis_student_id ON synopsis(student_id);
+CREATE INDEX idx_certificates_student_id ON certificates(student_id);
+CREATE INDEX idx_students_email_dob ON students(email, dob);
+CREATE UNIQUE INDEX idx_students_roll_number ON students(roll_number);
+CREATE INDEX idx_students_registration_date ON students(registration_date);
+CREATE INDEX idx_students_batch_to ON students(batch_to);
+CREATE INDEX idx_students_extension_years ON students(extension_years);
+CREATE INDEX idx_students_department ON students(department);
+CREATE INDEX idx_students_supervisor ON students(supervisor);
+CREATE INDEX idx_students_batch_from ON students(batch_from);
+
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sha256 TEXT NOT NULL,
+    path TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL,
+    ref_count INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_files_sha256 ON files(sha256);
+
+CREATE TABLE scan_dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    entries TEXT NOT NULL
+);
+
+CREATE TABLE dashboard_counts (
+    facet TEXT NOT NULL,
+    value TEXT NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (facet, value)
+) WITHOUT ROWID;
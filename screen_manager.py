@@ -0,0 +1,72 @@
+from tkinter import ttk
+
+
+class Screen:
+    def __init__(self, frame, cached):
+        self.frame = frame
+        self.cached = cached
+        self.canvas = None
+        self.refresh = None
+        self.built = False
+
+
+class ScreenManager:
+    # Each screen is built once into its own frame and kept. Navigating hides the current frame and
+    # shows the cached one, calling its refresh hook so only the data is reloaded. Forms that should
+    # start empty are opened with cache=False and destroyed when left. The mouse wheel is bound
+    # once here and scrolls whichever screen is showing.
+    def __init__(self, root):
+        self.root = root
+        self.screens = {}
+        self.current = None
+        root.bind_all("<MouseWheel>", lambda event: self.scroll(int(-1 * (event.delta / 120))))
+        root.bind_all("<Button-4>", lambda event: self.scroll(-1))
+        root.bind_all("<Button-5>", lambda event: self.scroll(1))
+
+    def scroll(self, units):
+        screen = self.screens.get(self.current)
+        if screen and screen.canvas and screen.canvas.winfo_exists():
+            screen.canvas.yview_scroll(units, "units")
+
+    def open(self, name, cache=True):
+        # Returns a fresh Screen to build into, or None when the cached one was shown and refreshed
+        self._hide_current()
+        screen = self.screens.get(name)
+        if screen is not None and screen.built:
+            screen.frame.pack(fill="both", expand=True)
+            self.current = name
+            if screen.refresh:
+                screen.refresh()
+            return None
+        if screen is not None:
+            screen.frame.destroy()
+        screen = Screen(ttk.Frame(self.root), cache)
+        screen.frame.pack(fill="both", expand=True)
+        self.screens[name] = screen
+        self.current = name
+        return screen
+
+    def ready(self, screen, canvas, refresh=None):
+        # Called at the end of a screen's build with the canvas the mouse wheel should scroll
+        screen.canvas = canvas
+        screen.refresh = refresh
+        screen.built = screen.cached
+
+    def _hide_current(self):
+        screen = self.screens.get(self.current)
+        if screen is None:
+            return
+        if screen.built:
+            screen.frame.pack_forget()
+        else:
+            screen.frame.destroy()
+            del self.screens[self.current]
+        self.current = None
+
+    def clear(self, keep=()):
+        # Drops cached screens, e.g. on logout so the next user starts from fresh widgets
+        for name in list(self.screens):
+            if name not in keep:
+                self.screens.pop(name).frame.destroy()
+                if name == self.current:
+                    self.current = None
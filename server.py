@@ -0,0 +1,370 @@
+import argparse
+import asyncio
+import json
+import secrets
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+from connection_manager import close_all_connections, get_connection
+from db_manager import DatabaseManager
+from services import (NotFoundError, PresentationData, ServiceError, StudentData, StudentFilter, SynopsisData,
+                      ValidationError)
+from student_facets import FacetFilter
+
+MAX_BODY_SIZE = 1024 * 1024
+SESSION_TTL = 8 * 60 * 60
+STATUS_TEXT = {200: "OK", 201: "Created", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden", 404: "Not Found",
+               405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error",
+               503: "Service Unavailable"}
+
+# Who may call a route: anyone (only /login), admins, or admins and the student the path's id names
+PUBLIC, ADMIN, OWNER = "public", "admin", "owner"
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def column_names(db_file, table):
+    with get_connection(db_file) as conn:
+        cursor = conn.execute(f"SELECT * FROM {table} LIMIT 0")
+        return [column[0] for column in cursor.description]
+
+
+def student_from_json(data):
+    # JSON clients send ISO dates (YYYY-MM-DD), the same format the API returns
+    try:
+        return StudentData(data["name"], data["roll_number"], data["email"], data["department"], data["supervisor"],
+                           data["registration_date"], data["title"], data["publications"], dob=data.get("dob"),
+                           batch_from=data.get("batch_from"), batch_to=data.get("batch_to"))
+    except KeyError as e:
+        raise ValidationError(f"Missing field {e.args[0]}.")
+
+
+def facet_filter_from_query(query):
+    # ?department=...&supervisor=...&batch_from=2015&batch_to=2020&extension=extended&synopsis=pending&certificates=0
+    def number(key):
+        return int(query[key]) if query.get(key) else None
+
+    return FacetFilter(query.get("department"), query.get("supervisor"), number("batch_from"), number("batch_to"),
+                       query.get("extension"), query.get("synopsis"), number("certificates"))
+
+
+class PhDServer:
+    # Reads run on a bounded thread pool, each worker with its own WAL connection, so clients read
+    # concurrently; every write goes through a single writer thread, so clerks queue instead of
+    # hitting "database is locked". Requests beyond max_pending get a 503 rather than piling up.
+    # /login hands out a bearer token; every other route needs one, writes need an admin session and
+    # a student session can only read that student's own records.
+    def __init__(self, manager, read_workers=4, max_pending=64):
+        self.service = manager.service
+        self.readers = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix="phd-read")
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="phd-write")
+        self.slots = asyncio.Semaphore(max_pending)
+        self.columns = {table: column_names(manager.db_file, table) for table in ("presentations", "synopsis")}
+        self.sessions = {}
+        self.routes = [
+            ("POST", ["login"], self.login, PUBLIC),
+            ("POST", ["logout"], self.logout, OWNER),
+            ("GET", ["dashboard"], self.dashboard, ADMIN),
+            ("GET", ["compliance"], self.compliance, ADMIN),
+            ("GET", ["compliance", "summary"], self.compliance_summary, ADMIN),
+            ("GET", ["students"], self.list_students, ADMIN),
+            ("POST", ["students"], self.add_student, ADMIN),
+            ("GET", ["students", "search"], self.search_students, ADMIN),
+            ("GET", ["students", "facets"], self.student_facets, ADMIN),
+            ("GET", ["students", "filter"], self.filter_students, ADMIN),
+            ("POST", ["students", "delete"], self.delete_students, ADMIN),
+            ("GET", ["students", None], self.get_student, OWNER),
+            ("PUT", ["students", None], self.update_student, ADMIN),
+            ("DELETE", ["students", None], self.delete_student, ADMIN),
+            ("GET", ["students", None, "presentations"], self.list_presentations, OWNER),
+            ("POST", ["students", None, "presentations"], self.add_presentation, ADMIN),
+            ("GET", ["students", None, "synopsis"], self.get_synopsis, OWNER),
+            ("PUT", ["students", None, "synopsis"], self.save_synopsis, ADMIN),
+            ("GET", ["students", None, "certificates"], self.list_certificates, OWNER),
+        ]
+
+    def row(self, table, row):
+        return dict(zip(self.columns[table], row)) if row else None
+
+    def certificate(self, row):
+        return {"id": row[0], "certificate_title": row[1], "certificate_path": row[2]}
+
+    async def read(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.readers, func, *args)
+
+    async def write(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.writer, func, *args)
+
+    # Handlers: (params, query, body) -> (status, payload)
+
+    async def login(self, params, query, body):
+        session = await self.read(self.service.authenticate, body.get("username", ""), body.get("password", ""))
+        if not session:
+            raise HTTPError(401, "Invalid credentials.")
+        now = time.monotonic()
+        for stale in [token for token, (_, expires) in self.sessions.items() if expires < now]:
+            del self.sessions[stale]
+        token = secrets.token_urlsafe(32)
+        self.sessions[token] = (session, now + SESSION_TTL)
+        return 200, {"token": token, "is_admin": session.is_admin, "student_id": session.student_id}
+
+    async def logout(self, params, query, body, token=None):
+        self.sessions.pop(token, None)
+        return 200, {}
+
+    async def dashboard(self, params, query, body):
+        counts = await self.read(self.service.dashboard_counts)
+        return 200, {facet: dict(values) for facet, values in counts.items()}
+
+    async def compliance(self, params, query, body):
+        # ?as_of=YYYY-MM-DD&department=...&status=overdue&sort=days_overdue&desc=1&limit=...&offset=...
+        rows = await self.read(self.service.presentation_compliance, query.get("as_of"), query.get("department"),
+                               query.get("status"), query.get("sort", "days_overdue"), query.get("desc", "1") != "0",
+                               min(int(query.get("limit", 1000)), 10000), int(query.get("offset", 0)))
+        return 200, [record.as_dict() for record in rows]
+
+    async def compliance_summary(self, params, query, body):
+        summary = await self.read(self.service.compliance_summary, query.get("as_of"), query.get("department"))
+        return 200, summary
+
+    async def list_students(self, params, query, body):
+        after_id = int(query.get("after_id", 0))
+        limit = min(int(query.get("limit", 100)), 1000)
+        rows = await self.read(self.service.list_students, after_id, limit)
+        return 200, [record.as_dict() for record in rows]
+
+    async def search_students(self, params, query, body):
+        rows = await self.read(self.service.search_students, query.get("q", ""), min(int(query.get("limit", 200)), 1000))
+        return 200, [record.as_dict() for record in rows]
+
+    async def student_facets(self, params, query, body):
+        total, counts = await self.read(self.service.student_facets, facet_filter_from_query(query))
+        return 200, {"total": total, "facets": counts}
+
+    async def filter_students(self, params, query, body):
+        after_id = int(query.get("after_id", 0))
+        limit = min(int(query.get("limit", 100)), 1000)
+        rows = await self.read(self.service.filter_students, facet_filter_from_query(query), after_id, limit)
+        return 200, [record.as_dict() for record in rows]
+
+    async def get_student(self, params, query, body):
+        details = await self.read(self.service.get_student, int(params[0]))
+        if not details:
+            raise NotFoundError("Student not found.")
+        return 200, {
+            "student": details.student.as_dict(),
+            "synopsis": self.row("synopsis", details.synopsis),
+            "presentations": [self.row("presentations", pres) for pres in details.presentations],
+            "certificates": [self.certificate(cert) for cert in details.certificates],
+        }
+
+    async def add_student(self, params, query, body):
+        student_id = await self.write(self.service.add_student, student_from_json(body))
+        return 201, {"id": student_id}
+
+    async def update_student(self, params, query, body):
+        await self.write(self.service.update_student, int(params[0]), student_from_json(body))
+        return 200, {"id": int(params[0])}
+
+    async def delete_student(self, params, query, body):
+        name = await self.write(self.service.delete_student, int(params[0]))
+        return 200, {"id": int(params[0]), "name": name}
+
+    async def delete_students(self, params, query, body):
+        # {"ids": [...]} or {"filter": {"batch_to_before": 2015, "department": ..., "supervisor": ...,
+        # "registered_from": "YYYY-MM-DD", "registered_before": "YYYY-MM-DD", "min_extension": 1}}
+        student_filter = None
+        if "filter" in body:
+            criteria = body["filter"] if isinstance(body["filter"], dict) else {}
+            student_filter = StudentFilter(criteria.get("batch_to_before"), criteria.get("department"),
+                                           criteria.get("supervisor"), criteria.get("registered_before"),
+                                           criteria.get("registered_from"), criteria.get("min_extension"))
+        student_ids = body.get("ids")
+        if student_ids is not None and not (isinstance(student_ids, list) and all(isinstance(i, int) for i in student_ids)):
+            raise ValidationError("ids must be a list of integers.")
+        deleted = await self.write(self.service.delete_students, student_ids, student_filter)
+        return 200, {"deleted": deleted}
+
+    async def list_presentations(self, params, query, body):
+        rows = await self.read(self.service.list_presentations, int(params[0]))
+        return 200, [self.row("presentations", row) for row in rows]
+
+    async def add_presentation(self, params, query, body):
+        presentation = PresentationData(body.get("presentation_date"), body.get("progress_notes", ""))
+        presentation_id = await self.write(self.service.add_presentation, int(params[0]), presentation)
+        return 201, {"id": presentation_id}
+
+    async def get_synopsis(self, params, query, body):
+        row = await self.read(self.service.get_synopsis, int(params[0]))
+        if not row:
+            raise NotFoundError("No synopsis recorded.")
+        return 200, self.row("synopsis", row)
+
+    async def save_synopsis(self, params, query, body):
+        synopsis = SynopsisData(body.get("synopsis_title", ""), body.get("submission_date"), body.get("abstract", ""))
+        await self.write(self.service.save_synopsis, int(params[0]), synopsis)
+        return 200, {"student_id": int(params[0])}
+
+    async def list_certificates(self, params, query, body):
+        rows = await self.read(self.service.list_certificates, int(params[0]))
+        return 200, [self.certificate(row) for row in rows]
+
+    # HTTP plumbing
+
+    def session(self, headers):
+        # The Session behind an "Authorization: Bearer <token>" header, with its token
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        entry = self.sessions.get(token) if scheme.lower() == "bearer" else None
+        if entry is None:
+            raise HTTPError(401, "Log in first.")
+        session, expires = entry
+        if time.monotonic() > expires:
+            del self.sessions[token]
+            raise HTTPError(401, "Session expired, log in again.")
+        return session, token
+
+    def authorize(self, access, params, headers):
+        if access == PUBLIC:
+            return None
+        session, token = self.session(headers)
+        if session.is_admin:
+            return token
+        # Student sessions only reach their own records, and only to read them
+        if access != OWNER or (params and int(params[0]) != session.student_id):
+            raise HTTPError(403, "Not allowed.")
+        return token
+
+    def route(self, method, path):
+        parts = [part for part in path.split("/") if part]
+        allowed = False
+        for route_method, pattern, handler, access in self.routes:
+            if len(pattern) != len(parts):
+                continue
+            params = []
+            for expected, actual in zip(pattern, parts):
+                if expected is None and actual.isdigit():
+                    params.append(actual)
+                elif expected != actual:
+                    break
+            else:
+                if route_method == method:
+                    return handler, params, access
+                allowed = True
+        raise HTTPError(405 if allowed else 404, "Method not allowed." if allowed else "Not found.")
+
+    async def dispatch(self, method, target, body, headers=None):
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            handler, params, access = self.route(method, url.path)
+            token = self.authorize(access, params, headers or {})
+            if self.slots.locked():
+                raise HTTPError(503, "Server busy, try again.")
+            async with self.slots:
+                if handler == self.logout:
+                    # The only handler that needs the caller's token rather than the request alone
+                    return await handler(params, query, body, token)
+                return await handler(params, query, body)
+        except HTTPError as e:
+            return e.status, {"error": str(e)}
+        except ValidationError as e:
+            return 400, {"error": str(e)}
+        except NotFoundError as e:
+            return 404, {"error": str(e)}
+        except ServiceError as e:
+            return 400, {"error": str(e)}
+        except ValueError as e:
+            return 400, {"error": f"Invalid parameter: {e}"}
+        except sqlite3.Error as e:
+            return 500, {"error": f"Database error: {e}"}
+        except Exception as e:
+            return 500, {"error": f"Unexpected error: {e}"}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                # A body that can't be framed is never read, so the connection is closed after the reply
+                length = headers.get("content-length", "0")
+                length = int(length) if length.isascii() and length.isdigit() else None
+                if length is None:
+                    status, payload = 400, {"error": "Content-Length must be a non-negative integer."}
+                    body = None
+                elif length > MAX_BODY_SIZE:
+                    status, payload = 413, {"error": "Request body too large."}
+                    body = None
+                else:
+                    raw = await reader.readexactly(length) if length else b""
+                    try:
+                        body = json.loads(raw) if raw else {}
+                    except json.JSONDecodeError:
+                        body = None
+                    if not isinstance(body, dict):
+                        body = None
+                        status, payload = 400, {"error": "Body must be a JSON object."}
+                if body is not None:
+                    status, payload = await self.dispatch(method.upper(), target, body, headers)
+                keep_alive = (version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                              and length is not None and length <= MAX_BODY_SIZE)
+                data = json.dumps(payload).encode("utf-8")
+                writer.write(f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                             f"Content-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def close(self):
+        self.readers.shutdown(wait=True)
+        self.writer.shutdown(wait=True)
+
+
+async def serve(host, port, read_workers):
+    server = PhDServer(DatabaseManager(), read_workers=read_workers)
+    listener = await asyncio.start_server(server.handle, host, port)
+    print(f"Serving PhD Management System on http://{host}:{port}")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+        close_all_connections()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the PhD Management System database over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--read-workers", type=int, default=4)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.read_workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
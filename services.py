@@ -0,0 +1,584 @@
+import os
+import re
+import sqlite3
+from datetime import datetime
+from compliance import compliance_report, compliance_summary
+from connection_manager import get_connection
+from dates import date_number, date_text
+from file_manager import UploadTooLargeError, check_upload, remove_unreferenced_files
+from student_details import StudentDetailsCache
+from student_facets import facet_counts, matching_ids
+from student_index import StudentIndex
+
+# bm25 column weights, in SEARCH_COLUMNS order: identity fields rank above free text
+SEARCH_WEIGHTS = (10.0, 10.0, 5.0, 2.0, 2.0, 3.0, 1.0, 1.0, 1.0)
+
+# Child rows in their table's column order, with the stored YYYYMMDD dates read back as YYYY-MM-DD
+PRESENTATION_SELECT = (f"SELECT id, student_id, {date_text('presentation_date')}, progress_notes, presentation_file "
+                       f"FROM presentations")
+SYNOPSIS_SELECT = (f"SELECT id, student_id, synopsis_title, {date_text('submission_date')}, abstract, synopsis_file "
+                   f"FROM synopsis")
+
+
+def build_match_query(term):
+    # Every word must match, each as a prefix; quoting keeps FTS5 operators out of user input
+    return " ".join(f'"{token}"*' for token in re.findall(r"\w+", term))
+
+
+class ServiceError(Exception):
+    pass
+
+
+class ValidationError(ServiceError):
+    pass
+
+
+class NotFoundError(ServiceError):
+    pass
+
+
+def parse_form_date(value):
+    # The forms take DD-MM-YYYY; everything past the forms works in YYYY-MM-DD
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%d-%m-%Y").strftime("%Y-%m-%d")
+    except ValueError:
+        raise ValidationError("Invalid date format. Use DD-MM-YYYY.")
+
+
+def parse_batch_year(value):
+    return stored_year((value or "").strip())
+
+
+def stored_date(value, label):
+    # The YYYYMMDD integer a YYYY-MM-DD value is stored as; None stays None
+    try:
+        return date_number(value)
+    except (TypeError, ValueError):
+        raise ValidationError(f"{label} must be a valid date.")
+
+
+def stored_year(value):
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValidationError("Batch From and To must be valid years.")
+
+
+def validate_upload(path):
+    # Checked before anything is copied; BlobWriter enforces the same limits for imports
+    if not path:
+        return
+    try:
+        check_upload(path)
+    except UploadTooLargeError as e:
+        raise ValidationError(str(e))
+    except OSError:
+        raise ValidationError(f"Cannot read {os.path.basename(path)}.")
+
+
+def parse_id_list(value):
+    # "4, 7, 10-15" -> [4, 7, 10, 11, 12, 13, 14, 15]
+    ids = []
+    for part in (value or "").replace(" ", "").split(","):
+        if not part:
+            continue
+        try:
+            if "-" in part:
+                first, last = (int(bound) for bound in part.split("-", 1))
+                ids.extend(range(first, last + 1))
+            else:
+                ids.append(int(part))
+        except ValueError:
+            raise ValidationError("Invalid ID list. Use numbers and ranges, e.g. 4, 7, 10-15.")
+    if not ids:
+        raise ValidationError("Please enter at least one student ID.")
+    return ids
+
+
+class Session:
+    def __init__(self, is_admin, student_id=None):
+        self.is_admin = is_admin
+        self.student_id = student_id
+
+
+class StudentData:
+    def __init__(self, name, roll_number, email, department, supervisor, registration_date, title, publications,
+                 dob=None, batch_from=None, batch_to=None):
+        self.name = name
+        self.roll_number = roll_number
+        self.email = email
+        self.department = department
+        self.supervisor = supervisor
+        self.registration_date = registration_date
+        self.title = title
+        self.publications = publications
+        self.dob = dob
+        self.batch_from = batch_from
+        self.batch_to = batch_to
+
+    @classmethod
+    def from_form(cls, name, roll_number, email, department, supervisor, registration_date, title, publications,
+                  dob="", batch_from="", batch_to=""):
+        return cls(name.strip(), roll_number.strip(), email.strip(), department.strip(), supervisor.strip(),
+                   parse_form_date(registration_date), title.strip(), publications.strip(),
+                   dob=parse_form_date(dob), batch_from=parse_batch_year(batch_from), batch_to=parse_batch_year(batch_to))
+
+    def validate(self):
+        if not all([self.name, self.roll_number, self.email, self.department, self.supervisor,
+                    self.registration_date, self.title, self.publications]):
+            raise ValidationError("All fields except DOB and Batch are required.")
+        stored_date(self.registration_date, "Registration Date")
+        stored_date(self.dob, "DOB")
+        stored_year(self.batch_from)
+        stored_year(self.batch_to)
+
+
+class PresentationData:
+    def __init__(self, presentation_date, progress_notes, file_path=None):
+        self.presentation_date = presentation_date
+        self.progress_notes = progress_notes
+        self.file_path = file_path or None
+
+    @classmethod
+    def from_form(cls, presentation_date, progress_notes, file_path=None):
+        return cls(parse_form_date(presentation_date), progress_notes.strip(), file_path)
+
+    def validate(self):
+        if not (self.presentation_date and self.progress_notes):
+            raise ValidationError("Presentation date and progress notes are required.")
+        stored_date(self.presentation_date, "Presentation date")
+        validate_upload(self.file_path)
+
+
+class SynopsisData:
+    def __init__(self, title, submission_date, abstract, file_path=None):
+        self.title = title
+        self.submission_date = submission_date
+        self.abstract = abstract
+        self.file_path = file_path or None
+
+    @classmethod
+    def from_form(cls, title, submission_date, abstract, file_path=None):
+        return cls(title.strip(), parse_form_date(submission_date), abstract.strip(), file_path)
+
+    def validate(self):
+        if not all([self.title, self.submission_date, self.abstract]):
+            raise ValidationError("Synopsis Title, Submission Date, and Abstract are required.")
+        stored_date(self.submission_date, "Submission Date")
+        validate_upload(self.file_path)
+
+
+class CertificateData:
+    def __init__(self, title, file_path):
+        self.title = title
+        self.file_path = file_path
+
+    def validate(self):
+        if not (self.title and self.file_path):
+            raise ValidationError("Certificate title and file are required.")
+        validate_upload(self.file_path)
+
+
+class StudentFilter:
+    # Selects students for bulk operations; the criteria that are set all have to match. Dates are
+    # YYYY-MM-DD, registered_from inclusive and registered_before exclusive. Each criterion compares
+    # a typed, indexed column, so the whole filter runs in SQL.
+    def __init__(self, batch_to_before=None, department=None, supervisor=None, registered_before=None,
+                 registered_from=None, min_extension=None):
+        self.batch_to_before = batch_to_before
+        self.department = department or None
+        self.supervisor = supervisor or None
+        self.registered_before = registered_before or None
+        self.registered_from = registered_from or None
+        self.min_extension = min_extension
+
+    @classmethod
+    def from_form(cls, batch_to_before="", department="", supervisor="", registered_before="", registered_from="",
+                  min_extension=""):
+        min_extension = min_extension.strip()
+        if min_extension and not min_extension.isdigit():
+            raise ValidationError("Extension must be a whole number of years.")
+        return cls(parse_batch_year(batch_to_before), department.strip(), supervisor.strip(),
+                   parse_form_date(registered_before), parse_form_date(registered_from),
+                   int(min_extension) if min_extension else None)
+
+    def validate(self):
+        # An empty filter would match every student
+        if not any([self.batch_to_before, self.department, self.supervisor, self.registered_before,
+                    self.registered_from, self.min_extension]):
+            raise ValidationError("Enter at least one filter.")
+        self.where()
+
+    def where(self):
+        clauses, params = [], []
+        if self.batch_to_before is not None:
+            clauses.append("batch_to < ?")
+            params.append(stored_year(self.batch_to_before))
+        if self.department:
+            clauses.append("department = ?")
+            params.append(self.department)
+        if self.supervisor:
+            clauses.append("supervisor = ?")
+            params.append(self.supervisor)
+        if self.registered_from:
+            clauses.append("registration_date >= ?")
+            params.append(stored_date(self.registered_from, "Registered from"))
+        if self.registered_before:
+            clauses.append("registration_date < ?")
+            params.append(stored_date(self.registered_before, "Registered before"))
+        if self.min_extension:
+            clauses.append("extension_years >= ?")
+            params.append(stored_year(self.min_extension))
+        return " AND ".join(clauses), params
+
+
+class PhDService:
+    # Everything the screens do to the database and the upload store, without any Tk: methods
+    # return ids, rows or StudentDetails and raise ServiceError subclasses for the UI to report.
+    # Methods that store files take an optional task for progress and cancellation. They import the
+    # upload pipeline (blob_store) and the exporter themselves, so startup loads neither.
+    def __init__(self, db_file, blob_dir, thumb_dir=None, cache=None, index=None):
+        self.db_file = db_file
+        self.blob_dir = blob_dir
+        self.thumb_dir = thumb_dir
+        self.cache = cache or StudentDetailsCache(db_file)
+        self.index = index or StudentIndex(db_file)
+        self.generation = 0
+
+    def data_changed(self, student_id=None):
+        # Every write bumps the generation, so cached screens can tell whether their rows are stale.
+        # Without a student_id (bulk imports) the caches start over.
+        self.generation += 1
+        if student_id is None:
+            self.cache.invalidate()
+            self.index.reset()
+        else:
+            self.cache.invalidate(student_id)
+            self.index.refresh(student_id)
+
+    def new_session(self):
+        # Logging out drops everything cached, so rows written by other processes show up again
+        self.cache.invalidate()
+        self.index.reset()
+
+    def _refresh_thumbnail(self, pic_path):
+        if not self.thumb_dir:
+            return
+        try:
+            from thumbnail_cache import get_thumbnail_cache
+        except ImportError:
+            # Without Pillow the picture is simply not pre-rendered
+            return
+        get_thumbnail_cache(self.thumb_dir).refresh(pic_path)
+
+    def _require_student(self, cursor, student_id):
+        cursor.execute("SELECT name FROM students WHERE id = ?", (student_id,))
+        row = cursor.fetchone()
+        if not row:
+            raise NotFoundError("Student not found.")
+        return row[0]
+
+    # Auth
+
+    def authenticate(self, username, password):
+        if username == "admin" and password == "admin":
+            return Session(True)
+        try:
+            dob = datetime.strptime(password, "%d-%m-%Y").strftime("%Y-%m-%d")
+        except ValueError:
+            return None
+        for record in self.index.find_by_email(username):
+            # A student without a date of birth has no password, so can't log in
+            if record.dob == dob:
+                return Session(False, record.id)
+        return None
+
+    # Students
+
+    def get_student(self, student_id):
+        # StudentDetails with synopsis, presentations and certificates; find_student for just the record
+        return self.cache.get(student_id)
+
+    def find_student(self, student_id):
+        return self.index.get(student_id)
+
+    def list_students(self, after_id=0, limit=100):
+        # Keyset pagination over the index's sorted ids
+        return self.index.page(after_id, limit)
+
+    def dashboard_counts(self):
+        # {facet: [(value, total), ...]} from the trigger-maintained dashboard_counts table, largest
+        # first: a handful of rows however many students there are
+        with get_connection(self.db_file) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT facet, value, total FROM dashboard_counts WHERE total > 0 ORDER BY facet, total DESC, value")
+            counts = {}
+            for facet, value, total in cursor.fetchall():
+                counts.setdefault(facet, []).append((value, total))
+        return counts
+
+    def student_facets(self, facet_filter):
+        # (matching students, {facet: [(value, students), ...]}) for the filter panel
+        try:
+            return facet_counts(self.db_file, facet_filter)
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+    def filter_students(self, facet_filter, after_id=0, limit=100):
+        # One page of the students matching a FacetFilter; the query picks the ids and the records
+        # come from the in-memory index
+        if facet_filter.is_empty():
+            return self.list_students(after_id, limit)
+        try:
+            ids = matching_ids(self.db_file, facet_filter, after_id, limit)
+        except ValueError as e:
+            raise ValidationError(str(e))
+        return [record for record in map(self.index.get, ids) if record is not None]
+
+    def search_students(self, term, limit=200):
+        # The full-text index ranks the ids; the records themselves come from the in-memory index
+        match = build_match_query(term)
+        with get_connection(self.db_file) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'student_search'")
+            if not (match and cursor.fetchone()):
+                return self.index.matching(term, limit)
+            weights = ", ".join(str(w) for w in SEARCH_WEIGHTS)
+            cursor.execute(f'''
+                SELECT rowid FROM student_search
+                WHERE student_search MATCH ?
+                ORDER BY bm25(student_search, {weights})
+                LIMIT ?
+            ''', (match, limit))
+            ids = [row[0] for row in cursor.fetchall()]
+        return [record for record in map(self.index.get, ids) if record is not None]
+
+    def add_student(self, student, picture=None, presentation=None, synopsis=None, certificates=(), task=None):
+        from blob_store import blob_transaction
+        student.validate()
+        validate_upload(picture)
+        for record in [presentation, synopsis, *certificates]:
+            if record is not None:
+                record.validate()
+        try:
+            with blob_transaction(self.db_file, self.blob_dir, task) as (cursor, blobs):
+                pic_path = blobs.add(picture)
+                cursor.execute('''
+                    INSERT INTO students (roll_number, batch_from, batch_to, original_batch_to, name, email, department, supervisor,
+                                          registration_date, dob, picture_path, title, publications)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (student.roll_number, stored_year(student.batch_from), stored_year(student.batch_to),
+                      stored_year(student.batch_to), student.name, student.email, student.department, student.supervisor,
+                      stored_date(student.registration_date, "Registration Date"), stored_date(student.dob, "DOB"), pic_path,
+                      student.title, student.publications))
+                student_id = cursor.lastrowid
+                if presentation is not None:
+                    self._insert_presentation(cursor, blobs, student_id, presentation)
+                if synopsis is not None:
+                    self._save_synopsis(cursor, blobs, student_id, synopsis)
+                for certificate in certificates:
+                    self._insert_certificate(cursor, blobs, student_id, certificate)
+        except sqlite3.IntegrityError as e:
+            if "roll_number" not in str(e):
+                raise
+            raise ValidationError(f"Roll number {student.roll_number} already exists.")
+        self.data_changed(student_id)
+        if pic_path:
+            self._refresh_thumbnail(pic_path)
+        return student_id
+
+    def update_student(self, student_id, student, picture=None, synopsis=None, certificates=None, task=None):
+        # picture, synopsis and certificates are only replaced when given
+        from blob_store import blob_transaction
+        student.validate()
+        validate_upload(picture)
+        for record in [synopsis, *(certificates or [])]:
+            if record is not None:
+                record.validate()
+        try:
+            with blob_transaction(self.db_file, self.blob_dir, task) as (cursor, blobs):
+                cursor.execute("SELECT picture_path FROM students WHERE id = ?", (student_id,))
+                row = cursor.fetchone()
+                if not row:
+                    raise NotFoundError("Student not found.")
+                pic_path = blobs.add(picture) if picture else row[0]
+                cursor.execute('''
+                    UPDATE students
+                    SET roll_number = ?, batch_from = ?, batch_to = ?, name = ?, email = ?, department = ?,
+                        supervisor = ?, registration_date = ?, dob = ?, picture_path = ?,
+                        title = ?, publications = ?
+                    WHERE id = ?
+                ''', (student.roll_number, stored_year(student.batch_from), stored_year(student.batch_to), student.name,
+                      student.email, student.department, student.supervisor,
+                      stored_date(student.registration_date, "Registration Date"), stored_date(student.dob, "DOB"), pic_path,
+                      student.title, student.publications,
+                      student_id))
+                if certificates is not None:
+                    cursor.execute("DELETE FROM certificates WHERE student_id = ?", (student_id,))
+                    for certificate in certificates:
+                        self._insert_certificate(cursor, blobs, student_id, certificate)
+                if synopsis is not None:
+                    self._save_synopsis(cursor, blobs, student_id, synopsis)
+        except sqlite3.IntegrityError as e:
+            if "roll_number" not in str(e):
+                raise
+            raise ValidationError(f"Roll number {student.roll_number} already exists.")
+        self.data_changed(student_id)
+        if picture:
+            self._refresh_thumbnail(pic_path)
+        # Replaced pictures, certificates and synopses may have been their blob's last reference
+        remove_unreferenced_files(self.db_file, self.thumb_dir)
+
+    def delete_student(self, student_id):
+        with get_connection(self.db_file) as conn:
+            cursor = conn.cursor()
+            name = self._require_student(cursor, student_id)
+            # Presentations, synopsis and certificates go with it through ON DELETE CASCADE
+            cursor.execute("DELETE FROM students WHERE id = ?", (student_id,))
+        self.data_changed(student_id)
+        remove_unreferenced_files(self.db_file, self.thumb_dir)
+        return name
+
+    def select_students(self, student_ids=None, student_filter=None):
+        # Stages the matching ids in the connection's temp.selected_students table and returns them
+        # sorted; delete_students and the archive export read the table back
+        if student_filter is not None:
+            student_filter.validate()
+        elif not student_ids:
+            raise ValidationError("Select students by ID or by filter.")
+        with get_connection(self.db_file) as conn:
+            cursor = conn.cursor()
+            cursor.execute("CREATE TEMP TABLE IF NOT EXISTS selected_students (id INTEGER PRIMARY KEY)")
+            cursor.execute("DELETE FROM selected_students")
+            if student_filter is not None:
+                clause, params = student_filter.where()
+                cursor.execute(f"INSERT INTO selected_students (id) SELECT id FROM students WHERE {clause}", params)
+            else:
+                cursor.executemany("INSERT OR IGNORE INTO selected_students (id) SELECT id FROM students WHERE id = ?",
+                                   [(student_id,) for student_id in student_ids])
+            cursor.execute("SELECT id FROM selected_students ORDER BY id")
+            return [row[0] for row in cursor.fetchall()]
+
+    def delete_students(self, student_ids=None, student_filter=None, archive_path=None, task=None):
+        # Deletes a set of students, or every student matching a filter, in one statement: foreign keys
+        # cascade to their presentations, synopsis and certificates, and the ref-count triggers fire
+        # for the cascaded rows too. With archive_path their rows are first exported to a ZIP; if that
+        # fails nothing is deleted. Unreferenced files are then removed in batches.
+        # Returns the deleted ids.
+        from exporter import export_data
+        ids = self.select_students(student_ids, student_filter)
+        if not ids:
+            return ids
+        if archive_path:
+            export_data(self.db_file, archive_path, "all", task, selection="SELECT id FROM temp.selected_students")
+        if task:
+            task.report(0, len(ids), f"Deleting {len(ids)} students...")
+        with get_connection(self.db_file) as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM students WHERE id IN (SELECT id FROM temp.selected_students)")
+            cursor.execute("DELETE FROM selected_students")
+        self.data_changed(ids[0] if len(ids) == 1 else None)
+        remove_unreferenced_files(self.db_file, self.thumb_dir, task)
+        return ids
+
+    # Presentations
+
+    def list_presentations(self, student_id):
+        with get_connection(self.db_file) as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"{PRESENTATION_SELECT} WHERE student_id = ? ORDER BY id", (student_id,))
+            return cursor.fetchall()
+
+    def presentation_compliance(self, as_of=None, department=None, status=None, sort="days_overdue", descending=True,
+                                limit=None, offset=0):
+        # ComplianceRecords for every student (or one department), most overdue first by default;
+        # as_of is YYYY-MM-DD and defaults to today
+        try:
+            return compliance_report(self.db_file, as_of, department, status, sort, descending, limit, offset)
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+    def compliance_summary(self, as_of=None, department=None):
+        # {status: number of students} for the same report
+        try:
+            return compliance_summary(self.db_file, as_of, department)
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+    def add_presentation(self, student_id, presentation, task=None):
+        from blob_store import blob_transaction
+        presentation.validate()
+        with blob_transaction(self.db_file, self.blob_dir, task) as (cursor, blobs):
+            self._require_student(cursor, student_id)
+            presentation_id = self._insert_presentation(cursor, blobs, student_id, presentation)
+        self.data_changed(student_id)
+        return presentation_id
+
+    def _insert_presentation(self, cursor, blobs, student_id, presentation):
+        cursor.execute('''
+            INSERT INTO presentations (student_id, presentation_date, progress_notes, presentation_file)
+            VALUES (?, ?, ?, ?)
+        ''', (student_id, stored_date(presentation.presentation_date, "Presentation date"), presentation.progress_notes,
+              blobs.add(presentation.file_path)))
+        return cursor.lastrowid
+
+    # Synopsis
+
+    def get_synopsis(self, student_id):
+        with get_connection(self.db_file) as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"{SYNOPSIS_SELECT} WHERE student_id = ?", (student_id,))
+            return cursor.fetchone()
+
+    def save_synopsis(self, student_id, synopsis, task=None):
+        from blob_store import blob_transaction
+        synopsis.validate()
+        with blob_transaction(self.db_file, self.blob_dir, task) as (cursor, blobs):
+            self._require_student(cursor, student_id)
+            self._save_synopsis(cursor, blobs, student_id, synopsis)
+        self.data_changed(student_id)
+        remove_unreferenced_files(self.db_file, self.thumb_dir)
+
+    def _save_synopsis(self, cursor, blobs, student_id, synopsis):
+        # One synopsis per student. An upsert rather than INSERT OR REPLACE, so the update triggers
+        # keep the search index and file reference counts right; no new file keeps the current one.
+        cursor.execute('''
+            INSERT INTO synopsis (id, student_id, synopsis_title, submission_date, abstract, synopsis_file)
+            VALUES ((SELECT id FROM synopsis WHERE student_id = ?), ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET synopsis_title = excluded.synopsis_title,
+                submission_date = excluded.submission_date, abstract = excluded.abstract,
+                synopsis_file = COALESCE(excluded.synopsis_file, synopsis_file)
+        ''', (student_id, student_id, synopsis.title, stored_date(synopsis.submission_date, "Submission Date"),
+              synopsis.abstract, blobs.add(synopsis.file_path)))
+
+    # Certificates
+
+    def list_certificates(self, student_id):
+        with get_connection(self.db_file) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, certificate_title, certificate_path FROM certificates WHERE student_id = ? ORDER BY id",
+                           (student_id,))
+            return cursor.fetchall()
+
+    def replace_certificates(self, student_id, certificates, task=None):
+        from blob_store import blob_transaction
+        for certificate in certificates:
+            certificate.validate()
+        with blob_transaction(self.db_file, self.blob_dir, task) as (cursor, blobs):
+            self._require_student(cursor, student_id)
+            cursor.execute("DELETE FROM certificates WHERE student_id = ?", (student_id,))
+            for certificate in certificates:
+                self._insert_certificate(cursor, blobs, student_id, certificate)
+        self.data_changed(student_id)
+        remove_unreferenced_files(self.db_file, self.thumb_dir)
+
+    def _insert_certificate(self, cursor, blobs, student_id, certificate):
+        cursor.execute('''
+            INSERT INTO certificates (student_id, certificate_title, certificate_path)
+            VALUES (?, ?, ?)
+        ''', (student_id, certificate.title, blobs.add(certificate.file_path)))
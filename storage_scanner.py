@@ -0,0 +1,222 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from connection_manager import get_connection
+from file_manager import FILE_COLUMNS, JOURNAL_DIR_NAME, STAGING_DIR_NAME
+from instrumentation import file_op
+
+SCAN_WORKERS = 8
+DELETE_BATCH_SIZE = 500
+# Listings of directories modified this recently are not cached: a file added within the same
+# mtime tick would otherwise be missed on the next scan
+SETTLE_NS = 2 * 1_000_000_000
+# Staging folders and write journals belong to recover_pending_writes(), not to the scanner
+SKIPPED_DIRS = {STAGING_DIR_NAME, JOURNAL_DIR_NAME}
+
+
+def path_key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def format_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class StorageReport:
+    def __init__(self):
+        self.orphaned = []
+        self.missing = []
+        self.stale_rows = []
+        self.damaged = []
+        self.total_files = 0
+        self.total_bytes = 0
+        self.listed_dirs = 0
+        self.cached_dirs = 0
+
+    @property
+    def orphaned_bytes(self):
+        return sum(size for _, size in self.orphaned)
+
+    def summary(self):
+        return (f"{self.total_files} files ({format_size(self.total_bytes)}) in Uploads; "
+                f"{len(self.orphaned)} orphaned ({format_size(self.orphaned_bytes)}), "
+                f"{len(self.missing)} missing, {len(self.damaged)} damaged, {len(self.stale_rows)} stale file records. "
+                f"{self.listed_dirs} folders listed, {self.cached_dirs} unchanged.")
+
+
+class StorageScanner:
+    # Compares everything under Uploads/ with the paths the database points at. The walk lists
+    # folders in parallel and remembers each folder's listing in scan_dirs: a folder whose mtime
+    # hasn't changed still has the same entries, so a repeat scan of a large tree only stats folders.
+    # Stored files are written once and never edited in place, so cached sizes stay correct.
+    def __init__(self, db_file, upload_dir="Uploads", thumb_dir=None, workers=SCAN_WORKERS):
+        self.db_file = db_file
+        self.upload_dir = upload_dir
+        self.thumb_dir = thumb_dir or os.path.join(upload_dir, "pictures", "thumbs")
+        self.workers = workers
+
+    def _load_cache(self):
+        with get_connection(self.db_file) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT path, mtime_ns, entries FROM scan_dirs")
+            return {path: (mtime_ns, entries) for path, mtime_ns, entries in cursor.fetchall()}
+
+    def _list_dir(self, path, cached):
+        # Returns (path, mtime_ns, {name: size}, [subdir names], listed)
+        mtime_ns = os.stat(path).st_mtime_ns
+        if cached is not None and cached[0] == mtime_ns:
+            entries = json.loads(cached[1])
+            return path, mtime_ns, entries["files"], entries["dirs"], False
+        files, dirs = {}, []
+        with file_op("scandir", path), os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(entry.name)
+                elif entry.is_file(follow_symlinks=False):
+                    files[entry.name] = entry.stat(follow_symlinks=False).st_size
+        return path, mtime_ns, files, dirs, True
+
+    def walk(self, task=None, full=False):
+        # Returns {path key: (path, size)} for every file under the upload folder
+        cache = {} if full else self._load_cache()
+        # Paths are built from upload_dir as given, which is how the records store them
+        root = self.upload_dir
+        found, changed, seen = {}, [], set()
+        listed = cached = 0
+        frontier = [root] if os.path.isdir(root) else []
+        settled_before = time.time_ns() - SETTLE_NS
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="phd-scan") as executor:
+            while frontier:
+                results = executor.map(lambda path: self._list_dir(path, cache.get(path_key(path))), frontier)
+                frontier = []
+                for path, mtime_ns, files, dirs, was_listed in results:
+                    seen.add(path_key(path))
+                    if was_listed:
+                        listed += 1
+                        if mtime_ns < settled_before:
+                            changed.append((path_key(path), mtime_ns, json.dumps({"files": files, "dirs": dirs})))
+                    else:
+                        cached += 1
+                    for name, size in files.items():
+                        file_path = os.path.join(path, name)
+                        found[path_key(file_path)] = (file_path, size)
+                    skipped = SKIPPED_DIRS if path == root else ()
+                    frontier.extend(os.path.join(path, name) for name in dirs if name not in skipped)
+                if task:
+                    task.report(listed + cached, None, f"Scanned {listed + cached} folders, {len(found)} files...")
+        with get_connection(self.db_file) as conn:
+            cursor = conn.cursor()
+            cursor.executemany("INSERT OR REPLACE INTO scan_dirs (path, mtime_ns, entries) VALUES (?, ?, ?)", changed)
+            cursor.executemany("DELETE FROM scan_dirs WHERE path = ?", [(path,) for path in cache.keys() - seen])
+        return found, listed, cached
+
+    def _references(self, cursor):
+        # (table, student id, path) for every record column that points at a file
+        references = []
+        for table, column in FILE_COLUMNS.items():
+            owner = "id" if table == "students" else "student_id"
+            cursor.execute(f"SELECT {owner}, {column} FROM {table} WHERE {column} IS NOT NULL AND {column} != ''")
+            references.extend((table, student_id, path) for student_id, path in cursor.fetchall())
+        return references
+
+    def scan(self, task=None, full=False):
+        found, listed, cached = self.walk(task, full)
+        report = StorageReport()
+        report.listed_dirs, report.cached_dirs = listed, cached
+        report.total_files = len(found)
+        report.total_bytes = sum(size for _, size in found.values())
+        if task:
+            task.report(0, None, "Comparing with the database...")
+        with get_connection(self.db_file) as conn:
+            cursor = conn.cursor()
+            references = self._references(cursor)
+            cursor.execute("SELECT path, sha256, ref_count, size FROM files")
+            file_rows = cursor.fetchall()
+        referenced = {path_key(path) for _, _, path in references}
+        referenced.update(path_key(path) for path, _, ref_count, _ in file_rows if ref_count > 0)
+        # A thumbnail is named after the content hash of a picture that is still stored
+        kept_thumbs = {path_key(os.path.join(self.thumb_dir, f"{digest}.jpg"))
+                       for _, digest, ref_count, _ in file_rows if ref_count > 0}
+        # Sizes were recorded at upload, so truncated or replaced files show up without reading them
+        for path, _, _, recorded_size in file_rows:
+            on_disk = found.get(path_key(path))
+            if on_disk and on_disk[1] != recorded_size:
+                report.damaged.append((path, recorded_size, on_disk[1]))
+        for key, (path, size) in found.items():
+            if key not in referenced and key not in kept_thumbs:
+                report.orphaned.append((path, size))
+        report.orphaned.sort()
+        for table, student_id, path in references:
+            key = path_key(path)
+            if key not in found and not os.path.isfile(path):
+                report.missing.append((table, student_id, path))
+        report.stale_rows = [path for path, _, ref_count, _ in file_rows
+                             if ref_count <= 0 and path_key(path) not in found]
+        return report
+
+    def reclaim(self, report, task=None, batch_size=DELETE_BATCH_SIZE):
+        # Deletes the report's orphans in batches. Each batch is re-checked inside a transaction so a
+        # file that an upload started pointing at since the scan is kept, and the unreferenced files
+        # rows are dropped before the files themselves. Returns (files removed, bytes freed).
+        candidates = [(path, size) for path, size in report.orphaned] + [(path, 0) for path in report.stale_rows]
+        removed = freed = 0
+        for start in range(0, len(candidates), batch_size):
+            batch = candidates[start:start + batch_size]
+            with get_connection(self.db_file) as conn:
+                cursor = conn.cursor()
+                paths = [path for path, _ in batch]
+                placeholders = ", ".join("?" * len(paths))
+                still_used = set()
+                for table, column in FILE_COLUMNS.items():
+                    cursor.execute(f"SELECT {column} FROM {table} WHERE {column} IN ({placeholders})", paths)
+                    still_used.update(path_key(path) for (path,) in cursor.fetchall())
+                cursor.execute(f"SELECT path FROM files WHERE ref_count > 0 AND path IN ({placeholders})", paths)
+                still_used.update(path_key(path) for (path,) in cursor.fetchall())
+                batch = [(path, size) for path, size in batch if path_key(path) not in still_used]
+                cursor.executemany("DELETE FROM files WHERE path = ? AND ref_count <= 0", [(path,) for path, _ in batch])
+            for path, size in batch:
+                if os.path.exists(path):
+                    with file_op("remove", path):
+                        os.remove(path)
+                    removed += 1
+                    freed += size
+            if task:
+                task.report(min(start + batch_size, len(candidates)), len(candidates),
+                            f"Removed {removed} files ({format_size(freed)})...")
+        return removed, freed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report orphaned and missing upload files and reclaim space")
+    parser.add_argument("--db", default="phd_management.db")
+    parser.add_argument("--uploads", default="Uploads")
+    parser.add_argument("--full", action="store_true", help="ignore cached folder listings and list everything")
+    parser.add_argument("--reclaim", action="store_true", help="delete the orphaned files after reporting them")
+    parser.add_argument("--verbose", action="store_true", help="list every orphaned and missing file")
+    args = parser.parse_args()
+
+    # Brings the schema up to date and finishes interrupted uploads before anything is judged orphaned
+    from db_manager import DatabaseManager
+    DatabaseManager(args.db, args.uploads)
+    scanner = StorageScanner(args.db, args.uploads)
+    report = scanner.scan(full=args.full)
+    print(report.summary())
+    if args.verbose:
+        for path, size in report.orphaned:
+            print(f"orphaned  {format_size(size):>10}  {path}")
+        for table, student_id, path in report.missing:
+            print(f"missing   {table} (student {student_id})  {path}")
+        for path, recorded_size, size in report.damaged:
+            print(f"damaged   {format_size(size):>10}  {path} (recorded {format_size(recorded_size)})")
+    if args.reclaim:
+        removed, freed = scanner.reclaim(report)
+        print(f"Removed {removed} files, freed {format_size(freed)}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import json
+import threading
+import time
+from connection_manager import get_connection
+from dates import date_text
+from student_index import StudentRecord, student_select_list
+
+# The student comes back as a StudentRecord; the child rows come back as JSON arrays in the same
+# column order as SELECT * on their tables, so callers index them like the per-table getters' rows
+DETAILS_QUERY = f'''
+    SELECT {student_select_list("s.")},
+           (SELECT json_array(id, student_id, synopsis_title, {date_text("submission_date")}, abstract, synopsis_file)
+            FROM synopsis WHERE student_id = s.id ORDER BY id LIMIT 1),
+           (SELECT json_group_array(json_array(id, student_id, {date_text("presentation_date")}, progress_notes,
+                                               presentation_file))
+            FROM (SELECT * FROM presentations WHERE student_id = s.id ORDER BY id)),
+           (SELECT json_group_array(json_array(id, certificate_title, certificate_path))
+            FROM (SELECT * FROM certificates WHERE student_id = s.id ORDER BY id))
+    FROM students s
+    WHERE s.id = ?
+'''
+
+
+class StudentDetails:
+    def __init__(self, student, synopsis, presentations, certificates):
+        self.student = student
+        self.synopsis = synopsis
+        self.presentations = presentations
+        self.certificates = certificates
+
+
+def load_student_details(db_file, student_id):
+    # Student row, synopsis, presentations and certificates in one statement on one connection;
+    # returns None when there is no such student
+    with get_connection(db_file) as conn:
+        cursor = conn.cursor()
+        cursor.execute(DETAILS_QUERY, (student_id,))
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    synopsis, presentations, certificates = row[-3:]
+    return StudentDetails(
+        StudentRecord.from_row(row[:-3]),
+        tuple(json.loads(synopsis)) if synopsis else None,
+        [tuple(pres) for pres in json.loads(presentations)],
+        [tuple(cert) for cert in json.loads(certificates)],
+    )
+
+
+class StudentDetailsCache:
+    # Screens that reopen the same student within `ttl` seconds reuse the loaded details. Anything
+    # that writes a student's records calls invalidate(), and logging out clears the whole cache.
+    def __init__(self, db_file, ttl=30):
+        self.db_file = db_file
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, student_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(student_id)
+        if entry and now - entry[0] < self.ttl:
+            return entry[1]
+        details = load_student_details(self.db_file, student_id)
+        if details is not None:
+            with self._lock:
+                self._entries[student_id] = (now, details)
+        return details
+
+    def invalidate(self, student_id=None):
+        with self._lock:
+            if student_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(student_id, None)
@@ -0,0 +1,110 @@
+from connection_manager import get_connection
+
+EXTENSION_STATUSES = ("extended", "on time")
+SYNOPSIS_STATUSES = ("submitted", "pending")
+# Certificate counts are bucketed as 0, 1, 2 and 3 or more
+CERTIFICATE_BUCKETS = (0, 1, 2, 3)
+
+HAS_SYNOPSIS = "EXISTS (SELECT 1 FROM synopsis y WHERE y.student_id = students.id)"
+CERTIFICATE_COUNT = "(SELECT COUNT(*) FROM certificates c WHERE c.student_id = students.id)"
+
+# The value each student is counted under, per facet. Department, supervisor and batch are read
+# from their indexes; synopsis and certificates are index lookups on student_id per student.
+FACETS = {
+    "department": "department",
+    "supervisor": "supervisor",
+    "batch": "batch_from",
+    "extension": "CASE WHEN extension_years > 0 THEN 'extended' ELSE 'on time' END",
+    "synopsis": f"CASE WHEN {HAS_SYNOPSIS} THEN 'submitted' ELSE 'pending' END",
+    "certificates": f"MIN({CERTIFICATE_COUNT}, 3)",
+}
+
+# The value is computed once in the inner query: grouping and ordering on the alias directly would
+# repeat the correlated subqueries, and on the bare column it groups straight off the index
+FACET_COUNT_QUERY = '''
+    SELECT value, COUNT(*) FROM (SELECT {expr} AS value FROM students {where})
+    GROUP BY value
+    ORDER BY value
+'''
+
+
+class FacetFilter:
+    # The selected value of each facet, None for any; the batch range is batch_from/batch_to years,
+    # inclusive. Criteria are written against the columns themselves rather than FACETS, so the
+    # department, supervisor, batch and extension criteria can use their indexes.
+    def __init__(self, department=None, supervisor=None, batch_from=None, batch_to=None, extension=None,
+                 synopsis=None, certificates=None):
+        self.department = department or None
+        self.supervisor = supervisor or None
+        self.batch_from = batch_from
+        self.batch_to = batch_to
+        self.extension = extension or None
+        self.synopsis = synopsis or None
+        self.certificates = certificates
+
+    def validate(self):
+        for year in (self.batch_from, self.batch_to):
+            if year is not None and not isinstance(year, int):
+                raise ValueError("Batch years must be whole numbers.")
+        if self.extension and self.extension not in EXTENSION_STATUSES:
+            raise ValueError(f"Unknown extension status: {self.extension}")
+        if self.synopsis and self.synopsis not in SYNOPSIS_STATUSES:
+            raise ValueError(f"Unknown synopsis status: {self.synopsis}")
+        if self.certificates is not None and self.certificates not in CERTIFICATE_BUCKETS:
+            raise ValueError(f"Unknown certificate count: {self.certificates}")
+
+    def is_empty(self):
+        return not self.where()[0]
+
+    def where(self, exclude=None):
+        # Returns (sql, params) for every criterion except the `exclude` facet's: a facet's counts
+        # ignore its own selection, so they show what choosing another value would give
+        clauses, params = [], []
+        if self.department and exclude != "department":
+            clauses.append("department = ?")
+            params.append(self.department)
+        if self.supervisor and exclude != "supervisor":
+            clauses.append("supervisor = ?")
+            params.append(self.supervisor)
+        if exclude != "batch":
+            if self.batch_from is not None:
+                clauses.append("batch_from >= ?")
+                params.append(self.batch_from)
+            if self.batch_to is not None:
+                clauses.append("batch_to <= ?")
+                params.append(self.batch_to)
+        if self.extension and exclude != "extension":
+            clauses.append("extension_years > 0" if self.extension == "extended" else "extension_years = 0")
+        if self.synopsis and exclude != "synopsis":
+            clauses.append(HAS_SYNOPSIS if self.synopsis == "submitted" else f"NOT {HAS_SYNOPSIS}")
+        if self.certificates is not None and exclude != "certificates":
+            clauses.append(f"{CERTIFICATE_COUNT} {'>=' if self.certificates == CERTIFICATE_BUCKETS[-1] else '='} ?")
+            params.append(self.certificates)
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+
+def facet_counts(db_file, facet_filter):
+    # (number of matching students, {facet: [(value, students), ...]}); one GROUP BY per facet
+    facet_filter.validate()
+    with get_connection(db_file) as conn:
+        cursor = conn.cursor()
+        where, params = facet_filter.where()
+        cursor.execute(f"SELECT COUNT(*) FROM students {where}", params)
+        total = cursor.fetchone()[0]
+        counts = {}
+        for facet, expr in FACETS.items():
+            where, params = facet_filter.where(exclude=facet)
+            cursor.execute(FACET_COUNT_QUERY.format(expr=expr, where=where), params)
+            counts[facet] = cursor.fetchall()
+    return total, counts
+
+
+def matching_ids(db_file, facet_filter, after_id=0, limit=100):
+    # Keyset pagination over the matching ids, in id order like the full student list
+    facet_filter.validate()
+    where, params = facet_filter.where()
+    where = f"{where} AND id > ?" if where else "WHERE id > ?"
+    with get_connection(db_file) as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT id FROM students {where} ORDER BY id LIMIT ?", params + [after_id, limit])
+        return [row[0] for row in cursor.fetchall()]
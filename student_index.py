@@ -0,0 +1,164 @@
+import bisect
+import sys
+import threading
+from connection_manager import get_connection
+from dates import date_text
+
+# Students are always selected with this explicit column list, so records line up whatever order
+# older migrated databases keep the columns in on disk
+STUDENT_COLUMNS = ("id", "roll_number", "batch_from", "batch_to", "original_batch_to", "name", "email", "department",
+                   "supervisor", "registration_date", "dob", "picture_path", "title", "publications", "extension_years")
+STUDENT_DATE_COLUMNS = ("registration_date", "dob")
+
+
+def student_select_list(prefix=""):
+    # The STUDENT_COLUMNS select list, with the stored YYYYMMDD dates read back as YYYY-MM-DD
+    return ", ".join(f"{date_text(prefix + column)} AS {column}" if column in STUDENT_DATE_COLUMNS else prefix + column
+                     for column in STUDENT_COLUMNS)
+
+
+STUDENT_SELECT = f"SELECT {student_select_list()} FROM students"
+
+
+def _shared(value):
+    # Departments, supervisors, batches and dates repeat across many students; keep one copy of each
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class StudentRecord:
+    __slots__ = STUDENT_COLUMNS
+
+    def __init__(self, id, roll_number, batch_from, batch_to, original_batch_to, name, email, department, supervisor,
+                 registration_date, dob, picture_path, title, publications, extension_years):
+        self.id = id
+        self.roll_number = roll_number
+        self.batch_from = _shared(batch_from)
+        self.batch_to = _shared(batch_to)
+        self.original_batch_to = _shared(original_batch_to)
+        self.name = name
+        self.email = email
+        self.department = _shared(department)
+        self.supervisor = _shared(supervisor)
+        self.registration_date = _shared(registration_date)
+        self.dob = _shared(dob)
+        self.picture_path = picture_path
+        self.title = title
+        self.publications = publications
+        self.extension_years = extension_years
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(*row)
+
+    def as_dict(self):
+        return {column: getattr(self, column) for column in STUDENT_COLUMNS}
+
+
+class StudentIndex:
+    # Every student as a StudentRecord, keyed by id, roll number and email, with the ids kept sorted
+    # for keyset paging. Loaded on first use; PhDService calls refresh()/remove() after each write and
+    # reset() when the data may have changed behind its back, so the next lookup reloads.
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._by_id = {}
+        self._by_roll = {}
+        self._by_email = {}
+        self._ids = []
+
+    def _load(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            with get_connection(self.db_file) as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"{STUDENT_SELECT} ORDER BY id")
+                records = [StudentRecord.from_row(row) for row in cursor.fetchall()]
+            self._by_id, self._by_roll, self._by_email, self._ids = {}, {}, {}, []
+            for record in records:
+                self._add(record)
+            self._loaded = True
+
+    def _add(self, record):
+        self._by_id[record.id] = record
+        self._by_roll[record.roll_number] = record
+        self._by_email.setdefault(record.email, []).append(record)
+        if not self._ids or record.id > self._ids[-1]:
+            self._ids.append(record.id)
+        else:
+            bisect.insort(self._ids, record.id)
+
+    def _discard(self, student_id):
+        record = self._by_id.pop(student_id, None)
+        if record is None:
+            return
+        if self._by_roll.get(record.roll_number) is record:
+            del self._by_roll[record.roll_number]
+        same_email = self._by_email.get(record.email, [])
+        same_email[:] = [other for other in same_email if other is not record]
+        if not same_email:
+            self._by_email.pop(record.email, None)
+        position = bisect.bisect_left(self._ids, student_id)
+        if position < len(self._ids) and self._ids[position] == student_id:
+            del self._ids[position]
+
+    def reset(self):
+        with self._lock:
+            self._loaded = False
+            self._by_id, self._by_roll, self._by_email, self._ids = {}, {}, {}, []
+
+    def refresh(self, student_id):
+        # Re-reads one student after a write; drops it if the row is gone
+        if not self._loaded:
+            return
+        with get_connection(self.db_file) as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"{STUDENT_SELECT} WHERE id = ?", (student_id,))
+            row = cursor.fetchone()
+        with self._lock:
+            self._discard(student_id)
+            if row:
+                self._add(StudentRecord.from_row(row))
+
+    def remove(self, student_id):
+        with self._lock:
+            self._discard(student_id)
+
+    def get(self, student_id):
+        self._load()
+        return self._by_id.get(student_id)
+
+    def get_by_roll(self, roll_number):
+        self._load()
+        return self._by_roll.get(roll_number)
+
+    def find_by_email(self, email):
+        self._load()
+        return list(self._by_email.get(email, ()))
+
+    def page(self, after_id=0, limit=100):
+        self._load()
+        with self._lock:
+            start = bisect.bisect_right(self._ids, after_id)
+            return [self._by_id[student_id] for student_id in self._ids[start:start + limit]]
+
+    def matching(self, term, limit=200):
+        # Substring match on name and roll number, for databases without the full-text index
+        self._load()
+        term = term.lower()
+        with self._lock:
+            records = [self._by_id[student_id] for student_id in self._ids]
+        found = []
+        for record in records:
+            if term in record.name.lower() or term in record.roll_number.lower():
+                found.append(record)
+                if len(found) >= limit:
+                    break
+        return found
+
+    def __len__(self):
+        self._load()
+        return len(self._by_id)
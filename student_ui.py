@@ -2,17 +2,24 @@ import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
 import webbrowser
-from PIL import Image, ImageTk
 import sqlite3
+from instrumentation import profile_screen
+from services import PhDService
+from task_runner import TaskRunner
+from screen_manager import ScreenManager
+from ui_utils import format_batch, show_picture
 import os
 
 class StudentUI:
-    def __init__(self, root, db_file, file_manager, show_login, student_id):
+    def __init__(self, root, db_file, file_manager, show_login, student_id, task_runner=None, service=None, screens=None):
         self.root = root
         self.db_file = db_file
         self.file_manager = file_manager
         self.show_login = show_login
         self.student_id = student_id
+        self.task_runner = task_runner or TaskRunner(root)
+        self.service = service or PhDService(db_file, file_manager.blob_dir, file_manager.thumb_dir)
+        self.screens = screens or ScreenManager(root)
         self.setup_styles()
 
     def setup_styles(self):
@@ -42,33 +49,36 @@ class StudentUI:
         scrollbar.pack(side="right", fill="y")
         return card_frame, canvas
 
+    def load_details(self, screen, card_frame, canvas, frame, show, what):
+        # Loads the student's details on a worker and calls show(details) on the Tk thread to fill
+        # `frame`. The screen only counts as built once that has happened, so leaving it while it
+        # loads (or after an error) drops it and the next visit loads again.
+        loading = ttk.Label(frame, text=f"Loading {what}...", font=("Inter", 11), style="TLabel")
+        loading.pack(fill="x", padx=10, pady=5)
+
+        def loaded(details):
+            loading.destroy()
+            show(details)
+            if not frame.winfo_exists():
+                return
+            self.screens.ready(screen, canvas)
+            card_frame.update_idletasks()
+            canvas.configure(scrollregion=canvas.bbox("all"))
+
+        self.task_runner.run(lambda task: self.service.get_student(self.student_id), on_success=loaded, owner=frame,
+                             on_error=lambda e: loading.configure(text=f"Error loading {what}: {e}"))
+
     def button_bind(self, button):
         button.bind("<Enter>", lambda e: button.configure(cursor="hand2"))
         button.bind("<Leave>", lambda e: button.configure(cursor=""))
 
-    def get_student_synopsis(self, student_id):
-        try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM synopsis WHERE student_id = ?", (student_id,))
-                return cursor.fetchone()
-        except sqlite3.Error:
-            return None
-
-    def get_student_presentations(self, student_id):
-        try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM presentations WHERE student_id = ?", (student_id,))
-                return cursor.fetchall()
-        except sqlite3.Error:
-            return []
-
+    @profile_screen
     def show_student_dashboard(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        screen = self.screens.open("student_dashboard")
+        if screen is None:
+            return
 
-        card_frame, canvas = self.create_scrollable_frame(self.root)
+        card_frame, canvas = self.create_scrollable_frame(screen.frame)
         card_frame.configure(padding=30)
 
         # Heading
@@ -80,58 +90,42 @@ class StudentUI:
 
         # Fetch and display student details
         try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM students WHERE id = ?", (self.student_id,))
-                student = cursor.fetchone()
-                if not student:
-                    messagebox.showerror("Error", "Student not found.", parent=self.root)
-                    self.show_login()
-                    return
-
-                # Create a frame for student details with a border
-                student_frame = ttk.Frame(card_frame, style="Card.TFrame", borderwidth=1, relief="solid")
-                student_frame.pack(fill="x", padx=20, pady=10, ipady=5)
-
-                # Calculate batch display with extension
-                batch_from = student[2] if student[2] else None
-                batch_to = student[3] if student[3] else None
-                original_batch_to = student[4] if student[4] else None
-                batch_display = f"{batch_from}-{batch_to}" if batch_from and batch_to else "N/A"
-                if batch_from and batch_to and original_batch_to:
-                    try:
-                        batch_to_int = int(batch_to)
-                        original_batch_to_int = int(original_batch_to)
-                        extension_years = batch_to_int - original_batch_to_int
-                        if extension_years > 0:
-                            batch_display += f" (Extended by {extension_years} year{'s' if extension_years != 1 else ''})"
-                    except ValueError:
-                        pass
-
-                # Display student details in a vertical layout, ensuring labels stretch
-                fields = [
-                    f"ID: {student[0]}",
-                    f"Roll No: {student[1]}",
-                    f"Batch: {batch_display}",
-                    f"Name: {student[5]}",
-                    f"Email: {student[6]}",
-                    f"DOB: {student[10] if student[10] else 'N/A'}",
-                    f"Department: {student[7]}",
-                    f"Supervisor: {student[8]}",
-                    f"Registration Date: {student[9] if student[9] else 'N/A'}",
-                    f"Title: {student[13] if student[13] else 'N/A'}",
-                    f"Publications: {student[14] if student[14] else 'N/A'}"
-                ]
-
-                for field in fields:
-                    label = ttk.Label(
-                        student_frame,
-                        text=field,
-                        font=("Inter", 11),
-                        wraplength=600,
-                        style="TLabel"
-                    )
-                    label.pack(fill="x", padx=10, pady=2)  # Remove anchor="w" to allow centering
+            student = self.service.find_student(self.student_id)
+            if not student:
+                messagebox.showerror("Error", "Student not found.", parent=self.root)
+                self.show_login()
+                return
+
+            # Create a frame for student details with a border
+            student_frame = ttk.Frame(card_frame, style="Card.TFrame", borderwidth=1, relief="solid")
+            student_frame.pack(fill="x", padx=20, pady=10, ipady=5)
+
+            batch_display = format_batch(student.batch_from, student.batch_to, student.extension_years)
+
+            # Display student details in a vertical layout, ensuring labels stretch
+            fields = [
+                f"ID: {student.id}",
+                f"Roll No: {student.roll_number}",
+                f"Batch: {batch_display}",
+                f"Name: {student.name}",
+                f"Email: {student.email}",
+                f"DOB: {student.dob if student.dob else 'N/A'}",
+                f"Department: {student.department}",
+                f"Supervisor: {student.supervisor}",
+                f"Registration Date: {student.registration_date if student.registration_date else 'N/A'}",
+                f"Title: {student.title if student.title else 'N/A'}",
+                f"Publications: {student.publications if student.publications else 'N/A'}"
+            ]
+
+            for field in fields:
+                label = ttk.Label(
+                    student_frame,
+                    text=field,
+                    font=("Inter", 11),
+                    wraplength=600,
+                    style="TLabel"
+                )
+                label.pack(fill="x", padx=10, pady=2)  # Remove anchor="w" to allow centering
 
         except sqlite3.Error as e:
             messagebox.showerror("Error", f"Error loading student details: {e}", parent=self.root)
@@ -165,18 +159,18 @@ class StudentUI:
         self.button_bind(logout_btn)
 
         # Scroll bindings
-        canvas.bind_all("<MouseWheel>", lambda event: canvas.yview_scroll(int(-1 * (event.delta / 120)), "units"))
-        canvas.bind_all("<Button-4>", lambda event: canvas.yview_scroll(-1, "units"))
-        canvas.bind_all("<Button-5>", lambda event: canvas.yview_scroll(1, "units"))
+        self.screens.ready(screen, canvas)
 
         card_frame.update_idletasks()
         canvas.configure(scrollregion=canvas.bbox("all"))
 
+    @profile_screen
     def show_profile(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        screen = self.screens.open("student_profile")
+        if screen is None:
+            return
 
-        card_frame, canvas = self.create_scrollable_frame(self.root)
+        card_frame, canvas = self.create_scrollable_frame(screen.frame)
         card_frame.configure(padding=30)
 
         ttk.Label(
@@ -185,133 +179,110 @@ class StudentUI:
             style="Heading.TLabel"
         ).pack(pady=20)
 
-        try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM students WHERE id = ?", (self.student_id,))
-                student = cursor.fetchone()
-                if not student:
-                    messagebox.showerror("Error", "Student not found.", parent=self.root)
-                    self.show_student_dashboard()
-                    return
-
-                # Create a frame for student details with a border
-                student_frame = ttk.Frame(card_frame, style="Card.TFrame", borderwidth=1, relief="solid")
-                student_frame.pack(fill="x", padx=20, pady=10, ipady=5)
-
-                # Calculate batch display with extension
-                batch_from = student[2] if student[2] else None
-                batch_to = student[3] if student[3] else None
-                original_batch_to = student[4] if student[4] else None
-                batch_display = f"{batch_from}-{batch_to}" if batch_from and batch_to else "N/A"
-                if batch_from and batch_to and original_batch_to:
-                    try:
-                        batch_to_int = int(batch_to)
-                        original_batch_to_int = int(original_batch_to)
-                        extension_years = batch_to_int - original_batch_to_int
-                        if extension_years > 0:
-                            batch_display += f" (Extended by {extension_years} year{'s' if extension_years != 1 else ''})"
-                    except ValueError:
-                        pass
-
-                # Display student details in a vertical layout
-                fields = [
-                    f"ID: {student[0]}",
-                    f"Roll No: {student[1]}",
-                    f"Batch: {batch_display}",
-                    f"Name: {student[5]}",
-                    f"Email: {student[6]}",
-                    f"DOB: {student[10] if student[10] else 'N/A'}",
-                    f"Department: {student[7]}",
-                    f"Supervisor: {student[8]}",
-                    f"Registration Date: {student[9] if student[9] else 'N/A'}",
-                    f"Title: {student[13] if student[13] else 'N/A'}",
-                    f"Publications: {student[14] if student[14] else 'N/A'}"
-                ]
-
-                for field in fields:
-                    label = ttk.Label(
-                        student_frame,
-                        text=field,
-                        font=("Inter", 11),
-                        wraplength=600,
-                        style="TLabel"
-                    )
-                    label.pack(fill="x", padx=10, pady=2)  # Remove anchor="w" to allow centering
-
-                details_frame = ttk.Frame(card_frame, style="Card.TFrame")
-                details_frame.pack(pady=10, fill="x", padx=20)
-
-                # Picture
-                if student[12] and os.path.exists(student[12]):
-                    try:
-                        image = Image.open(student[12])
-                        image = image.resize((150, 150), Image.LANCZOS)
-                        image = ImageTk.PhotoImage(image)
-                        img_label = ttk.Label(details_frame, image=image, background="#FFFFFF")
-                        img_label.image = image
-                        img_label.pack(pady=10)
-                    except Exception as e:
-                        ttk.Label(details_frame, text=f"Unable to load picture: {e}", font=("Inter", 11), style="TLabel").pack(pady=10)
-                else:
-                    ttk.Label(details_frame, text="Picture not available", font=("Inter", 11), style="TLabel").pack(pady=10)
+        profile_frame = ttk.Frame(card_frame, style="Card.TFrame")
+        profile_frame.pack(fill="x")
+
+        def show_details(details):
+            student = details.student if details else None
+            if not student:
+                messagebox.showerror("Error", "Student not found.", parent=self.root)
+                self.show_student_dashboard()
+                return
+
+            # Create a frame for student details with a border
+            student_frame = ttk.Frame(profile_frame, style="Card.TFrame", borderwidth=1, relief="solid")
+            student_frame.pack(fill="x", padx=20, pady=10, ipady=5)
+
+            batch_display = format_batch(student.batch_from, student.batch_to, student.extension_years)
+
+            # Display student details in a vertical layout
+            fields = [
+                f"ID: {student.id}",
+                f"Roll No: {student.roll_number}",
+                f"Batch: {batch_display}",
+                f"Name: {student.name}",
+                f"Email: {student.email}",
+                f"DOB: {student.dob if student.dob else 'N/A'}",
+                f"Department: {student.department}",
+                f"Supervisor: {student.supervisor}",
+                f"Registration Date: {student.registration_date if student.registration_date else 'N/A'}",
+                f"Title: {student.title if student.title else 'N/A'}",
+                f"Publications: {student.publications if student.publications else 'N/A'}"
+            ]
+
+            for field in fields:
+                label = ttk.Label(
+                    student_frame,
+                    text=field,
+                    font=("Inter", 11),
+                    wraplength=600,
+                    style="TLabel"
+                )
+                label.pack(fill="x", padx=10, pady=2)  # Remove anchor="w" to allow centering
 
-                # Certificate
-                if student[11] and os.path.exists(student[11]):
-                    cert_btn = ttk.Button(
+            details_frame = ttk.Frame(profile_frame, style="Card.TFrame")
+            details_frame.pack(pady=10, fill="x", padx=20)
+
+            # Picture
+            show_picture(self.task_runner, details_frame, student.picture_path, self.file_manager.thumb_dir)
+
+            # Certificates
+            if details.certificates:
+                for cert in details.certificates:
+                    if cert[2] and os.path.exists(cert[2]):
+                        cert_btn = ttk.Button(
+                            details_frame,
+                            text=f"View Certificate ({cert[1]})",
+                            style="TButton",
+                            command=lambda p=cert[2]: webbrowser.open(f"file://{os.path.abspath(p)}")
+                        )
+                        cert_btn.pack(pady=5, padx=20, fill="x", ipady=5)
+                        self.button_bind(cert_btn)
+                    else:
+                        ttk.Label(details_frame, text=f"Certificate {cert[1]} not available", font=("Inter", 11), style="TLabel").pack(pady=2)
+            else:
+                ttk.Label(details_frame, text="Certificate not available", font=("Inter", 11), style="TLabel").pack(pady=10)
+
+            # Synopsis
+            synopsis = details.synopsis
+            if synopsis:
+                ttk.Label(details_frame, text="Synopsis:", font=("Inter", 11, "bold"), style="TLabel").pack(pady=5)
+                synopsis_label = f"Title: {synopsis[2]}\nSubmission Date: {synopsis[3]}\nAbstract: {synopsis[4]}"
+                ttk.Label(details_frame, text=synopsis_label, font=("Inter", 11), wraplength=600, style="TLabel").pack(pady=2)
+                if synopsis[5] and os.path.exists(synopsis[5]):
+                    synopsis_btn = ttk.Button(
                         details_frame,
-                        text="View Certificate",
-                        style="TButton",
-                        command=lambda: webbrowser.open(f"file://{os.path.abspath(student[11])}")
+                        text=f"View Synopsis PDF ({os.path.basename(synopsis[5])})",
+                        style="Danger.TButton",  # Changed to Danger.TButton for color
+                        command=lambda: webbrowser.open(f"file://{os.path.abspath(synopsis[5])}")
                     )
-                    cert_btn.pack(pady=10, padx=20, fill="x", ipady=5)
-                    self.button_bind(cert_btn)
+                    synopsis_btn.pack(pady=5, padx=20, fill="x", ipady=5)
+                    self.button_bind(synopsis_btn)
                 else:
-                    ttk.Label(details_frame, text="Certificate not available", font=("Inter", 11), style="TLabel").pack(pady=10)
-
-                # Synopsis
-                synopsis = self.get_student_synopsis(self.student_id)
-                if synopsis:
-                    ttk.Label(details_frame, text="Synopsis:", font=("Inter", 11, "bold"), style="TLabel").pack(pady=5)
-                    synopsis_label = f"Title: {synopsis[2]}\nSubmission Date: {synopsis[3]}\nAbstract: {synopsis[4]}"
-                    ttk.Label(details_frame, text=synopsis_label, font=("Inter", 11), wraplength=600, style="TLabel").pack(pady=2)
-                    if synopsis[5] and os.path.exists(synopsis[5]):
-                        synopsis_btn = ttk.Button(
+                    ttk.Label(details_frame, text="Synopsis PDF not available", font=("Inter", 11), style="TLabel").pack(pady=2)
+            else:
+                ttk.Label(details_frame, text="No synopsis recorded", font=("Inter", 11), style="TLabel").pack(pady=5)
+
+            # Presentations
+            presentations = details.presentations
+            if presentations:
+                ttk.Label(details_frame, text="6-Month Presentations:", font=("Inter", 11, "bold"), style="TLabel").pack(pady=5)
+                for pres in presentations:
+                    pres_label = f"Date: {pres[2]}, Progress: {pres[3]}"
+                    ttk.Label(details_frame, text=pres_label, font=("Inter", 11), style="TLabel").pack(pady=2)
+                    if pres[4] and os.path.exists(pres[4]):
+                        pres_btn = ttk.Button(
                             details_frame,
-                            text=f"View Synopsis PDF ({os.path.basename(synopsis[5])})",
+                            text=f"View Presentation ({os.path.basename(pres[4])})",
                             style="Danger.TButton",  # Changed to Danger.TButton for color
-                            command=lambda: webbrowser.open(f"file://{os.path.abspath(synopsis[5])}")
+                            command=lambda p=pres[4]: webbrowser.open(f"file://{os.path.abspath(p)}")
                         )
-                        synopsis_btn.pack(pady=5, padx=20, fill="x", ipady=5)
-                        self.button_bind(synopsis_btn)
+                        pres_btn.pack(pady=5, padx=20, fill="x", ipady=5)
+                        self.button_bind(pres_btn)
                     else:
-                        ttk.Label(details_frame, text="Synopsis PDF not available", font=("Inter", 11), style="TLabel").pack(pady=2)
-                else:
-                    ttk.Label(details_frame, text="No synopsis recorded", font=("Inter", 11), style="TLabel").pack(pady=5)
-
-                # Presentations
-                presentations = self.get_student_presentations(self.student_id)
-                if presentations:
-                    ttk.Label(details_frame, text="6-Month Presentations:", font=("Inter", 11, "bold"), style="TLabel").pack(pady=5)
-                    for pres in presentations:
-                        pres_label = f"Date: {pres[2]}, Progress: {pres[3]}"
-                        ttk.Label(details_frame, text=pres_label, font=("Inter", 11), style="TLabel").pack(pady=2)
-                        if pres[4] and os.path.exists(pres[4]):
-                            pres_btn = ttk.Button(
-                                details_frame,
-                                text=f"View Presentation ({os.path.basename(pres[4])})",
-                                style="Danger.TButton",  # Changed to Danger.TButton for color
-                                command=lambda p=pres[4]: webbrowser.open(f"file://{os.path.abspath(p)}")
-                            )
-                            pres_btn.pack(pady=5, padx=20, fill="x", ipady=5)
-                            self.button_bind(pres_btn)
-                        else:
-                            ttk.Label(details_frame, text="Presentation file not available", font=("Inter", 11), style="TLabel").pack(pady=2)
-                else:
-                    ttk.Label(details_frame, text="No presentations recorded", font=("Inter", 11), style="TLabel").pack(pady=5)
-
-        except sqlite3.Error as e:
-            messagebox.showerror("Error", f"Error loading profile: {e}", parent=self.root)
+                        ttk.Label(details_frame, text="Presentation file not available", font=("Inter", 11), style="TLabel").pack(pady=2)
+            else:
+                ttk.Label(details_frame, text="No presentations recorded", font=("Inter", 11), style="TLabel").pack(pady=5)
 
         back_btn = ttk.Button(
             card_frame,
@@ -322,18 +293,15 @@ class StudentUI:
         back_btn.pack(pady=10, padx=20, fill="x", ipady=5)
         self.button_bind(back_btn)
 
-        canvas.bind_all("<MouseWheel>", lambda event: canvas.yview_scroll(int(-1 * (event.delta / 120)), "units"))
-        canvas.bind_all("<Button-4>", lambda event: canvas.yview_scroll(-1, "units"))
-        canvas.bind_all("<Button-5>", lambda event: canvas.yview_scroll(1, "units"))
-
-        card_frame.update_idletasks()
-        canvas.configure(scrollregion=canvas.bbox("all"))
+        self.load_details(screen, card_frame, canvas, profile_frame, show_details, "profile")
 
+    @profile_screen
     def show_synopsis(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        screen = self.screens.open("student_synopsis")
+        if screen is None:
+            return
 
-        card_frame, canvas = self.create_scrollable_frame(self.root)
+        card_frame, canvas = self.create_scrollable_frame(screen.frame)
         card_frame.configure(padding=30)
 
         ttk.Label(
@@ -345,31 +313,32 @@ class StudentUI:
         synopsis_frame = ttk.Frame(card_frame, style="Card.TFrame")
         synopsis_frame.pack(pady=40, fill="x", padx=20)
 
-        synopsis = self.get_student_synopsis(self.student_id)
-        if synopsis:
-            ttk.Label(synopsis_frame, text="Synopsis:", font=("Inter", 11, "bold"), style="TLabel").pack(pady=5)
-            synopsis_label = f"Title: {synopsis[2]}\nSubmission Date: {synopsis[3]}\nAbstract: {synopsis[4]}"
-            ttk.Label(
-                synopsis_frame,
-                text=synopsis_label,
-                font=("Inter", 11),
-                wraplength=600,
-                style="TLabel"
-            ).pack(fill="x", padx=10, pady=5)
-
-            if synopsis[5] and os.path.exists(synopsis[5]):
-                synopsis_btn = ttk.Button(
+        def show_details(details):
+            synopsis = details.synopsis if details else None
+            if synopsis:
+                ttk.Label(synopsis_frame, text="Synopsis:", font=("Inter", 11, "bold"), style="TLabel").pack(pady=5)
+                synopsis_label = f"Title: {synopsis[2]}\nSubmission Date: {synopsis[3]}\nAbstract: {synopsis[4]}"
+                ttk.Label(
                     synopsis_frame,
-                    text=f"View Synopsis PDF ({os.path.basename(synopsis[5])})",
-                    style="Danger.TButton",  # Changed to Danger.TButton for color
-                    command=lambda: webbrowser.open(f"file://{os.path.abspath(synopsis[5])}")
-                )
-                synopsis_btn.pack(pady=5, padx=20, fill="x", ipady=5)
-                self.button_bind(synopsis_btn)
+                    text=synopsis_label,
+                    font=("Inter", 11),
+                    wraplength=600,
+                    style="TLabel"
+                ).pack(fill="x", padx=10, pady=5)
+
+                if synopsis[5] and os.path.exists(synopsis[5]):
+                    synopsis_btn = ttk.Button(
+                        synopsis_frame,
+                        text=f"View Synopsis PDF ({os.path.basename(synopsis[5])})",
+                        style="Danger.TButton",  # Changed to Danger.TButton for color
+                        command=lambda: webbrowser.open(f"file://{os.path.abspath(synopsis[5])}")
+                    )
+                    synopsis_btn.pack(pady=5, padx=20, fill="x", ipady=5)
+                    self.button_bind(synopsis_btn)
+                else:
+                    ttk.Label(synopsis_frame, text="Synopsis PDF not available", font=("Inter", 11), style="TLabel").pack(fill="x", padx=10, pady=5)
             else:
-                ttk.Label(synopsis_frame, text="Synopsis PDF not available", font=("Inter", 11), style="TLabel").pack(fill="x", padx=10, pady=5)
-        else:
-            ttk.Label(synopsis_frame, text="No synopsis recorded", font=("Inter", 11), style="TLabel").pack(fill="x", padx=10, pady=5)
+                ttk.Label(synopsis_frame, text="No synopsis recorded", font=("Inter", 11), style="TLabel").pack(fill="x", padx=10, pady=5)
 
         back_btn = ttk.Button(
             card_frame,
@@ -380,18 +349,15 @@ class StudentUI:
         back_btn.pack(pady=10, padx=20, fill="x", ipady=5)
         self.button_bind(back_btn)
 
-        canvas.bind_all("<MouseWheel>", lambda event: canvas.yview_scroll(int(-1 * (event.delta / 120)), "units"))
-        canvas.bind_all("<Button-4>", lambda event: canvas.yview_scroll(-1, "units"))
-        canvas.bind_all("<Button-5>", lambda event: canvas.yview_scroll(1, "units"))
-
-        card_frame.update_idletasks()
-        canvas.configure(scrollregion=canvas.bbox("all"))
+        self.load_details(screen, card_frame, canvas, synopsis_frame, show_details, "synopsis")
 
+    @profile_screen
     def show_presentations(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        screen = self.screens.open("student_presentations")
+        if screen is None:
+            return
 
-        card_frame, canvas = self.create_scrollable_frame(self.root)
+        card_frame, canvas = self.create_scrollable_frame(screen.frame)
         card_frame.configure(padding=30)
 
         ttk.Label(
@@ -403,25 +369,26 @@ class StudentUI:
         presentations_frame = ttk.Frame(card_frame, style="Card.TFrame")
         presentations_frame.pack(pady=10, fill="x", padx=20)
 
-        presentations = self.get_student_presentations(self.student_id)
-        if presentations:
-            ttk.Label(presentations_frame, text="Presentations:", font=("Inter", 11, "bold"), style="TLabel").pack(pady=5)
-            for pres in presentations:
-                pres_label = f"Date: {pres[2]}, Progress: {pres[3]}"
-                ttk.Label(presentations_frame, text=pres_label, font=("Inter", 11), style="TLabel").pack(fill="x", padx=10, pady=2)
-                if pres[4] and os.path.exists(pres[4]):
-                    pres_btn = ttk.Button(
-                        presentations_frame,
-                        text=f"View Presentation ({os.path.basename(pres[4])})",
-                        style="Danger.TButton",  # Changed to Danger.TButton for color
-                        command=lambda p=pres[4]: webbrowser.open(f"file://{os.path.abspath(p)}")
-                    )
-                    pres_btn.pack(pady=5, padx=20, fill="x", ipady=5)
-                    self.button_bind(pres_btn)
-                else:
-                    ttk.Label(presentations_frame, text="Presentation file not available", font=("Inter", 11), style="TLabel").pack(fill="x", padx=10, pady=2)
-        else:
-            ttk.Label(presentations_frame, text="No presentations recorded", font=("Inter", 11), style="TLabel").pack(fill="x", padx=10, pady=5)
+        def show_details(details):
+            presentations = details.presentations if details else []
+            if presentations:
+                ttk.Label(presentations_frame, text="Presentations:", font=("Inter", 11, "bold"), style="TLabel").pack(pady=5)
+                for pres in presentations:
+                    pres_label = f"Date: {pres[2]}, Progress: {pres[3]}"
+                    ttk.Label(presentations_frame, text=pres_label, font=("Inter", 11), style="TLabel").pack(fill="x", padx=10, pady=2)
+                    if pres[4] and os.path.exists(pres[4]):
+                        pres_btn = ttk.Button(
+                            presentations_frame,
+                            text=f"View Presentation ({os.path.basename(pres[4])})",
+                            style="Danger.TButton",  # Changed to Danger.TButton for color
+                            command=lambda p=pres[4]: webbrowser.open(f"file://{os.path.abspath(p)}")
+                        )
+                        pres_btn.pack(pady=5, padx=20, fill="x", ipady=5)
+                        self.button_bind(pres_btn)
+                    else:
+                        ttk.Label(presentations_frame, text="Presentation file not available", font=("Inter", 11), style="TLabel").pack(fill="x", padx=10, pady=2)
+            else:
+                ttk.Label(presentations_frame, text="No presentations recorded", font=("Inter", 11), style="TLabel").pack(fill="x", padx=10, pady=5)
 
         back_btn = ttk.Button(
             card_frame,
@@ -432,9 +399,4 @@ class StudentUI:
         back_btn.pack(pady=10, padx=20, fill="x", ipady=5)
         self.button_bind(back_btn)
 
-        canvas.bind_all("<MouseWheel>", lambda event: canvas.yview_scroll(int(-1 * (event.delta / 120)), "units"))
-        canvas.bind_all("<Button-4>", lambda event: canvas.yview_scroll(-1, "units"))
-        canvas.bind_all("<Button-5>", lambda event: canvas.yview_scroll(1, "units"))
-
-        card_frame.update_idletasks()
-        canvas.configure(scrollregion=canvas.bbox("all"))
\ No newline at end of file
+        self.load_details(screen, card_frame, canvas, presentations_frame, show_details, "presentations")
\ No newline at end of file
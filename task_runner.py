@@ -0,0 +1,134 @@
+import threading
+import tkinter as tk
+from tkinter import ttk
+from tkinter import messagebox
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+class Task:
+    def __init__(self):
+        self.future = None
+        self.progress = None
+        self.message = ""
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise TaskCancelled()
+
+    def report(self, done, total=None, message=None):
+        # Called from the worker thread; the Tk side picks it up on its next poll
+        self.progress = (done, total)
+        if message is not None:
+            self.message = message
+        self.check_cancelled()
+
+
+class ProgressDialog:
+    def __init__(self, root, title, task):
+        self.task = task
+        self.window = tk.Toplevel(root)
+        self.window.title(title)
+        self.window.geometry("400x160")
+        self.window.configure(bg="#F5F7FA")
+        self.window.transient(root)
+        self.window.resizable(False, False)
+        self.window.protocol("WM_DELETE_WINDOW", task.cancel)
+
+        self.label = ttk.Label(self.window, text=title)
+        self.label.pack(anchor="w", padx=20, pady=(20, 5))
+        self.bar = ttk.Progressbar(self.window, mode="indeterminate", length=360)
+        self.bar.pack(padx=20, pady=5)
+        self.bar.start(10)
+        self.cancel_btn = ttk.Button(self.window, text="Cancel", style="TButton", command=self.cancel)
+        self.cancel_btn.pack(pady=10)
+
+    def cancel(self):
+        self.task.cancel()
+        self.cancel_btn.configure(state="disabled", text="Cancelling...")
+
+    def update(self):
+        if self.task.message:
+            self.label.configure(text=self.task.message)
+        if self.task.progress and self.task.progress[1]:
+            done, total = self.task.progress
+            if str(self.bar["mode"]) != "determinate":
+                self.bar.stop()
+                self.bar.configure(mode="determinate", maximum=total)
+            self.bar.configure(maximum=total, value=min(done, total))
+
+    def close(self):
+        if self.window.winfo_exists():
+            self.window.destroy()
+
+
+class TaskRunner:
+    POLL_MS = 50
+
+    def __init__(self, root, max_workers=4):
+        self.root = root
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="phd-worker")
+        self._pending = []
+        self._polling = False
+
+    def run(self, func, *args, on_success=None, on_error=None, owner=None, progress_title=None):
+        # Runs func(task, *args) on a worker thread and delivers the result on the Tk thread.
+        # Callbacks are dropped if `owner` (usually the screen's frame) was destroyed meanwhile.
+        task = Task()
+        task.future = self.executor.submit(func, task, *args)
+        dialog = ProgressDialog(self.root, progress_title, task) if progress_title else None
+        self._pending.append((task, on_success, on_error, owner, dialog))
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.POLL_MS, self._poll)
+        return task
+
+    def _poll(self):
+        # Callbacks may start new tasks, so work through a snapshot of the pending list
+        pending, self._pending = self._pending, []
+        try:
+            while pending:
+                entry = pending.pop(0)
+                task, on_success, on_error, owner, dialog = entry
+                if not task.future.done():
+                    if dialog:
+                        dialog.update()
+                    self._pending.append(entry)
+                    continue
+                if dialog:
+                    dialog.close()
+                if owner is not None and not owner.winfo_exists():
+                    continue
+                error = task.future.exception()
+                if error is None:
+                    if on_success:
+                        on_success(task.future.result())
+                elif isinstance(error, TaskCancelled):
+                    pass
+                elif on_error:
+                    on_error(error)
+                else:
+                    messagebox.showerror("Error", str(error), parent=self.root)
+        finally:
+            # Keep whatever was not reached if a callback raised
+            self._pending.extend(pending)
+            if self._pending:
+                self.root.after(self.POLL_MS, self._poll)
+            else:
+                self._polling = False
+
+    def shutdown(self):
+        for task, *_ in self._pending:
+            task.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,36 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from connection_manager import close_all_connections
+from db_manager import DatabaseManager
+from services import StudentData
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "phd.db"), str(tmp_path / "Uploads"))
+    yield manager
+    close_all_connections()
+
+
+@pytest.fixture
+def make_file(tmp_path):
+    # Writes `content` to tmp_path/name, or a sparse file of `size` bytes for the upload limits
+    def make(name, content=b"data", size=None):
+        path = tmp_path / name
+        with open(path, "wb") as f:
+            if size is None:
+                f.write(content)
+            else:
+                f.truncate(size)
+        return str(path)
+    return make
+
+
+def student(roll_number, department="CS", supervisor="Dr. Rao", batch_from=2015, batch_to=2020, dob=None,
+            email=None):
+    return StudentData(f"Student {roll_number}", roll_number, email or f"{roll_number}@example.com", department,
+                       supervisor, "2015-07-01", "Thesis", "None", dob=dob, batch_from=batch_from, batch_to=batch_to)
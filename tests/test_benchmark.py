@@ -0,0 +1,34 @@
+from benchmark import DatasetConfig, dataset_stats, generate_dataset, percentile, run_benchmark
+from connection_manager import close_all_connections, get_connection
+
+
+def test_seeded_dataset_is_reproducible(tmp_path):
+    config = DatasetConfig(students=5, presentations=2, certificates=1, files=3, file_size=64)
+    rows = []
+    for name in ("first", "second"):
+        workdir = tmp_path / name
+        workdir.mkdir()
+        manager = generate_dataset(str(workdir), config)
+        with get_connection(manager.db_file) as conn:
+            rows.append(conn.execute("SELECT roll_number, name, department, dob FROM students ORDER BY id").fetchall())
+        assert dataset_stats(manager)["files"] == 3
+        close_all_connections()
+    assert len(rows[0]) == 5 and rows[0] == rows[1]
+
+
+def test_run_reports_every_operation(tmp_path):
+    config = DatasetConfig(students=10, files=2, file_size=64)
+    results = run_benchmark(config, iterations=2, workdir=str(tmp_path))
+    dataset = results["dataset"]
+    assert (dataset["students"], dataset["presentations"], dataset["certificates"]) == (10, 40, 20)
+    assert {"login", "search", "detail_load", "view_all", "export_all", "add_student", "delete_student"} <= set(results["operations"])
+    for stats in results["operations"].values():
+        assert stats["iterations"] >= 2 and stats["min_ms"] <= stats["p50_ms"] <= stats["max_ms"]
+
+
+def test_percentile_is_nearest_rank():
+    samples = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+    assert percentile(samples, 0.5) == 5
+    assert percentile(samples, 0.9) == 9
+    assert percentile(samples, 0.99) == 10
+    assert percentile([7], 0.5) == 7
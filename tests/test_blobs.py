@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+import pytest
+import blob_store
+from conftest import student
+from connection_manager import get_connection
+from blob_store import blob_transaction
+from file_manager import JOURNAL_DIR_NAME, STAGING_DIR_NAME, recover_pending_writes, upload_sibling
+
+
+def file_rows(db_file):
+    return get_connection(db_file).execute("SELECT path, ref_count FROM files ORDER BY id").fetchall()
+
+
+def journals(blob_dir):
+    journal_dir = upload_sibling(blob_dir, JOURNAL_DIR_NAME)
+    return [os.path.join(journal_dir, name) for name in os.listdir(journal_dir)] if os.path.isdir(journal_dir) else []
+
+
+def test_identical_uploads_share_one_counted_blob(manager, make_file):
+    service = manager.service
+    first = service.add_student(student("R1"), picture=make_file("a.jpg", b"same picture"))
+    second = service.add_student(student("R2"), picture=make_file("b.jpg", b"same picture"))
+    [(path, ref_count)] = file_rows(manager.db_file)
+    assert ref_count == 2 and os.path.isfile(path)
+    assert path.startswith(manager.blob_dir)
+
+    service.delete_student(first)
+    assert file_rows(manager.db_file) == [(path, 1)]
+    assert os.path.isfile(path)
+    service.delete_student(second)
+    assert file_rows(manager.db_file) == []
+    assert not os.path.exists(path)
+
+
+def test_blobs_are_named_by_content(manager, make_file):
+    manager.service.add_student(student("R1"), picture=make_file("Photo.JPG", b"one"))
+    manager.service.add_student(student("R2"), picture=make_file("other.jpg", b"two"))
+    digests = [hashlib.sha256(content).hexdigest() for content in (b"one", b"two")]
+    assert file_rows(manager.db_file) == [(os.path.join(manager.blob_dir, digest[:2], digest + ".jpg"), 1)
+                                          for digest in digests]
+
+
+def test_failed_transaction_leaves_no_blob(manager, make_file):
+    picture = make_file("a.jpg")
+    with pytest.raises(RuntimeError):
+        with blob_transaction(manager.db_file, manager.blob_dir) as (cursor, blobs):
+            path = blobs.add(picture)
+            raise RuntimeError("cancelled")
+    assert file_rows(manager.db_file) == []
+    assert not os.path.exists(path)
+    assert journals(manager.blob_dir) == []
+
+
+def test_publish_failure_is_recovered_once_writer_is_gone(manager, make_file, monkeypatch):
+    def fail(self):
+        raise OSError("disk full")
+    monkeypatch.setattr(blob_store.BlobWriter, "publish", fail)
+    # The rows committed, so the caller sees success and the journal is kept for recovery
+    student_id = manager.service.add_student(student("R1"), picture=make_file("a.jpg"))
+    monkeypatch.undo()
+    [(path, ref_count)] = file_rows(manager.db_file)
+    assert ref_count == 1 and not os.path.exists(path)
+    [journal_path] = journals(manager.blob_dir)
+    assert manager.service.find_student(student_id).picture_path == path
+
+    with open(journal_path, encoding="utf-8") as f:
+        journal = json.load(f)
+    # A writer that is still running (here the test runner's parent) keeps its journal
+    journal["pid"] = os.getppid()
+    with open(journal_path, "w", encoding="utf-8") as f:
+        json.dump(journal, f)
+    assert recover_pending_writes(manager.db_file, manager.blob_dir) == 0
+    assert not os.path.exists(path)
+
+    # One on another host is recovered once it is stale
+    journal.update(host="elsewhere", created=0)
+    with open(journal_path, "w", encoding="utf-8") as f:
+        json.dump(journal, f)
+    assert recover_pending_writes(manager.db_file, manager.blob_dir) == 1
+    assert os.path.isfile(path)
+    assert journals(manager.blob_dir) == []
+
+
+def test_uncommitted_journal_is_rolled_back(manager):
+    staging = upload_sibling(manager.blob_dir, STAGING_DIR_NAME)
+    staged = os.path.join(staging, "abc", "blob")
+    os.makedirs(os.path.dirname(staged))
+    with open(staged, "wb") as f:
+        f.write(b"data")
+    journal_dir = upload_sibling(manager.blob_dir, JOURNAL_DIR_NAME)
+    os.makedirs(journal_dir, exist_ok=True)
+    path = os.path.join(manager.blob_dir, "ab", "abc.pdf")
+    with open(os.path.join(journal_dir, "abc.json"), "w", encoding="utf-8") as f:
+        json.dump({"created": 0, "host": "elsewhere", "entries": [{"staged": os.path.abspath(staged), "path": path}]}, f)
+    assert recover_pending_writes(manager.db_file, manager.blob_dir) == 1
+    assert not os.path.exists(staged) and not os.path.exists(path)
+    assert journals(manager.blob_dir) == []
@@ -0,0 +1,59 @@
+import pytest
+from conftest import student
+from connection_manager import get_connection
+from services import CertificateData, SynopsisData, ValidationError
+from student_facets import FacetFilter, facet_counts, matching_ids
+
+
+@pytest.fixture
+def students(manager, make_file):
+    service = manager.service
+    certificate = make_file("certificate.pdf")
+    ids = [
+        service.add_student(student("R1", "CS", "Dr. Rao", 2015, 2020),
+                            synopsis=SynopsisData("Graphs", "2018-01-10", "Abstract"),
+                            certificates=[CertificateData("A", certificate), CertificateData("B", certificate)]),
+        service.add_student(student("R2", "CS", "Dr. Iyer", 2016, 2021),
+                            certificates=[CertificateData(title, certificate) for title in "ABCD"]),
+        service.add_student(student("R3", "EE", "Dr. Rao", 2016, 2021),
+                            synopsis=SynopsisData("Circuits", "2019-01-10", "Abstract")),
+    ]
+    # R2's batch was extended by a year
+    with get_connection(manager.db_file) as conn:
+        conn.execute("UPDATE students SET batch_to = 2022 WHERE id = ?", (ids[1],))
+    return ids
+
+
+def test_counts_without_a_filter(manager, students):
+    total, counts = facet_counts(manager.db_file, FacetFilter())
+    assert total == 3
+    assert counts["department"] == [("CS", 2), ("EE", 1)]
+    assert counts["supervisor"] == [("Dr. Iyer", 1), ("Dr. Rao", 2)]
+    assert counts["batch"] == [(2015, 1), (2016, 2)]
+    assert counts["extension"] == [("extended", 1), ("on time", 2)]
+    assert counts["synopsis"] == [("pending", 1), ("submitted", 2)]
+    # Four certificates fall in the "3 or more" bucket
+    assert counts["certificates"] == [(0, 1), (2, 1), (3, 1)]
+
+
+def test_a_facet_ignores_its_own_selection(manager, students):
+    total, counts = facet_counts(manager.db_file, FacetFilter(department="CS", synopsis="submitted"))
+    assert total == 1
+    assert counts["department"] == [("CS", 1), ("EE", 1)]
+    assert counts["synopsis"] == [("pending", 1), ("submitted", 1)]
+    assert counts["supervisor"] == [("Dr. Rao", 1)]
+
+
+def test_matching_ids_pages_in_id_order(manager, students):
+    facet_filter = FacetFilter(batch_from=2016, certificates=3)
+    assert matching_ids(manager.db_file, facet_filter) == [students[1]]
+    assert matching_ids(manager.db_file, FacetFilter(supervisor="Dr. Rao"), limit=1) == [students[0]]
+    assert matching_ids(manager.db_file, FacetFilter(supervisor="Dr. Rao"), after_id=students[0]) == [students[2]]
+    assert matching_ids(manager.db_file, FacetFilter(extension="extended")) == [students[1]]
+
+
+def test_unknown_values_are_rejected(manager):
+    with pytest.raises(ValueError):
+        facet_counts(manager.db_file, FacetFilter(extension="late"))
+    with pytest.raises(ValidationError):
+        manager.service.student_facets(FacetFilter(batch_from="2015"))
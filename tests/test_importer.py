@@ -0,0 +1,89 @@
+import csv
+import io
+import zipfile
+from datetime import date, datetime
+from connection_manager import get_connection
+from importer import cell_text, import_students
+
+STUDENT_HEADERS = ["ID", "Name", "Roll Number", "Email", "Department", "Supervisor", "Registration Date", "DOB",
+                   "Batch From", "Batch To", "Title", "Publications", "Picture Path"]
+
+
+def csv_text(headers, rows):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(headers)
+    writer.writerows(rows)
+    return out.getvalue()
+
+
+def export_zip(path, students, certificates):
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("students.csv", csv_text(STUDENT_HEADERS, students))
+        archive.writestr("certificates.csv", csv_text(["Student ID", "Certificate Title", "Certificate Path"], certificates))
+    return path
+
+
+def student_row(source_id, roll_number, registration_date="2015-07-01", picture=""):
+    return [source_id, f"Student {roll_number}", roll_number, f"{roll_number}@example.com", "CS", "Dr. Rao",
+            registration_date, "02-03-1990", "2015", "2020", "Thesis", "None", picture]
+
+
+def test_bad_rows_are_reported_and_the_rest_imported(manager, make_file, tmp_path):
+    big_picture = make_file("big.jpg", size=21 * 1024 * 1024)
+    big_certificate = make_file("big.pdf", size=101 * 1024 * 1024)
+    certificate = make_file("ok.pdf")
+    path = export_zip(str(tmp_path / "export.zip"), [
+        student_row("1", "R1"),
+        student_row("2", "R2", registration_date="2020-02-30"),
+        student_row("3", "R3", picture=big_picture),
+        student_row("4", "R4", picture=str(tmp_path / "missing.jpg")),
+    ], [
+        ["1", "Degree", certificate],
+        ["1", "Too big", big_certificate],
+        ["2", "Orphan", certificate],
+    ])
+
+    result = import_students(manager.db_file, path, manager.blob_dir)
+
+    assert [(error.table, error.row_number) for error in result.errors] == [
+        ("students", 3), ("students", 4), ("students", 5), ("certificates", 3), ("certificates", 4)]
+    assert "2020-02-30" in result.errors[0].message
+    assert "limited to 20 MB" in result.errors[1].message
+    assert "not found" in result.errors[2].message
+    assert "limited to 100 MB" in result.errors[3].message
+    assert result.counts == {"students": 1, "presentations": 0, "synopsis": 0, "certificates": 1}
+
+    cursor = get_connection(manager.db_file).cursor()
+    cursor.execute("SELECT roll_number, registration_date, dob, batch_from FROM students")
+    assert cursor.fetchall() == [("R1", 20150701, 19900302, 2015)]
+    cursor.execute("SELECT certificate_title, ref_count FROM certificates JOIN files ON files.path = certificate_path")
+    assert cursor.fetchall() == [("Degree", 1)]
+
+
+def test_students_are_imported_from_csv(manager, tmp_path):
+    path = tmp_path / "students.csv"
+    path.write_text(csv_text(STUDENT_HEADERS, [student_row("1", "R1"), student_row("2", "R2", "01-08-2016")]),
+                    encoding="utf-8")
+    result = import_students(manager.db_file, str(path), manager.blob_dir)
+    assert result.errors == [] and result.counts["students"] == 2
+    cursor = get_connection(manager.db_file).cursor()
+    cursor.execute("SELECT roll_number, registration_date, dob FROM students ORDER BY roll_number")
+    assert cursor.fetchall() == [("R1", 20150701, 19900302), ("R2", 20160801, 19900302)]
+
+
+def test_existing_roll_number_is_a_row_error(manager, tmp_path):
+    path = tmp_path / "students.csv"
+    path.write_text(csv_text(STUDENT_HEADERS, [student_row("1", "R1")]), encoding="utf-8")
+    import_students(manager.db_file, str(path), manager.blob_dir)
+    result = import_students(manager.db_file, str(path), manager.blob_dir)
+    assert [str(error) for error in result.errors] == ["students row 2: roll number R1 already exists"]
+    assert result.counts["students"] == 0
+
+
+def test_excel_cells_read_like_csv_text():
+    assert cell_text(datetime(2015, 7, 1, 0, 0)) == "2015-07-01"
+    assert cell_text(date(2015, 7, 1)) == "2015-07-01"
+    assert cell_text(2015.0) == "2015"
+    assert cell_text(2.5) == "2.5"
+    assert cell_text(None) == ""
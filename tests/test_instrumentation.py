@@ -0,0 +1,31 @@
+import sqlite3
+import pytest
+from instrumentation import InstrumentedCursor, connect, profiler
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(str(tmp_path / "profile.db"))
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    yield conn
+    profiler.disable()
+    profiler.reset()
+    conn.close()
+
+
+def test_plain_cursors_while_profiling_is_off(conn):
+    assert type(conn.cursor()) is sqlite3.Cursor
+    assert type(conn.execute("SELECT 1")) is sqlite3.Cursor
+    assert type(conn.executemany("INSERT INTO t VALUES (?)", [(1,), (2,)])) is sqlite3.Cursor
+    assert profiler.report()["operations"] == []
+
+
+def test_profiled_cursors_record_statements(conn):
+    profiler.enable()
+    cursor = conn.execute("SELECT x FROM t")
+    assert isinstance(cursor, InstrumentedCursor)
+    cursor.fetchall()
+    conn.executemany("INSERT INTO t VALUES (?)", [(1,), (2,)])
+    kinds = {(op["kind"], op["label"]) for op in profiler.report()["operations"]}
+    assert kinds == {("execute", "SELECT x FROM t"), ("fetch", "SELECT x FROM t"),
+                     ("executemany", "INSERT INTO t VALUES (?)")}
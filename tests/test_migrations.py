@@ -0,0 +1,103 @@
+import sqlite3
+from connection_manager import close_all_connections, get_connection
+from db_manager import DatabaseManager
+from migrations import SCHEMA_VERSION
+
+
+def legacy_database(path, certificate):
+    # The layout before schema versions: TEXT dates and batches, enrollment_date, one certificate per student
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE students (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            roll_number TEXT NOT NULL,
+            batch_from TEXT,
+            batch_to TEXT,
+            name TEXT NOT NULL,
+            email TEXT NOT NULL,
+            department TEXT NOT NULL,
+            supervisor TEXT NOT NULL,
+            enrollment_date TEXT NOT NULL,
+            dob TEXT,
+            picture_path TEXT,
+            certificate_path TEXT
+        );
+        CREATE TABLE presentations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            presentation_date TEXT NOT NULL,
+            progress_notes TEXT NOT NULL,
+            presentation_file TEXT,
+            FOREIGN KEY (student_id) REFERENCES students(id) ON DELETE CASCADE
+        );
+    ''')
+    conn.executemany('''
+        INSERT INTO students (id, roll_number, batch_from, batch_to, name, email, department, supervisor,
+                              enrollment_date, dob, certificate_path)
+        VALUES (?, ?, ?, ?, ?, ?, 'CS', 'Dr. Rao', ?, ?, ?)
+    ''', [(1, "R1", "2015", "2020", "Asha", "asha@example.com", "2015-07-01", "02-03-1990", certificate),
+          (2, "R2", " 2016 ", "2021", "Ravi", "ravi@example.com", "01-08-2016", "2020-02-30", None),
+          (3, "R3", "2017", "2022", "Gone", "gone@example.com", "2017-07-01", None, None)])
+    conn.execute("INSERT INTO presentations (student_id, presentation_date, progress_notes) VALUES (1, '15-01-2016', 'First')")
+    conn.execute("DELETE FROM students WHERE id = 3")
+    conn.commit()
+    conn.close()
+
+
+def test_legacy_database_migrates_to_typed_schema(tmp_path, make_file, capsys):
+    db_file = str(tmp_path / "legacy.db")
+    certificate = make_file("certificate.pdf")
+    legacy_database(db_file, certificate)
+    try:
+        manager = DatabaseManager(db_file, str(tmp_path / "Uploads"))
+        cursor = get_connection(db_file).cursor()
+        assert cursor.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        assert cursor.execute("PRAGMA integrity_check").fetchall() == [("ok",)]
+        assert cursor.execute("PRAGMA foreign_key_check").fetchall() == []
+        assert cursor.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+        cursor.execute("SELECT id, batch_from, batch_to, registration_date, dob, extension_years FROM students ORDER BY id")
+        # DD-MM-YYYY and YYYY-MM-DD both convert; 2020-02-30 isn't a date and is cleared
+        assert cursor.fetchall() == [(1, 2015, 2020, 20150701, 19900302, 0), (2, 2016, 2021, 20160801, None, 0)]
+        # The cleared value is kept and reported so it can be corrected by hand
+        cursor.execute("SELECT * FROM unconverted_values")
+        assert cursor.fetchall() == [("students", 2, "dob", "2020-02-30")]
+        assert "1 unreadable students.dob values were cleared (ids 2)" in capsys.readouterr().out
+        cursor.execute("SELECT presentation_date FROM presentations")
+        assert cursor.fetchall() == [(20160115,)]
+        cursor.execute("SELECT student_id, certificate_path FROM certificates")
+        assert cursor.fetchall() == [(1, certificate)]
+        cursor.execute("SELECT ref_count FROM files WHERE path = ?", (certificate,))
+        assert cursor.fetchall() == [(1,)]
+
+        # Ids of rows deleted before the rebuild are not handed out again
+        cursor.execute('''
+            INSERT INTO students (roll_number, name, email, department, supervisor, registration_date, title, publications)
+            VALUES ('R4', 'New', 'new@example.com', 'CS', 'Dr. Rao', 20240101, '', '')
+        ''')
+        assert cursor.lastrowid == 4
+        manager.service.delete_student(1)
+        assert cursor.execute("SELECT COUNT(*) FROM certificates").fetchone()[0] == 0
+        assert cursor.execute("PRAGMA foreign_key_check").fetchall() == []
+    finally:
+        close_all_connections()
+
+
+def test_current_database_is_left_alone(manager):
+    cursor = get_connection(manager.db_file).cursor()
+    cursor.execute("SELECT sql FROM sqlite_master ORDER BY name")
+    schema = cursor.fetchall()
+    manager.create_or_migrate_table()
+    cursor.execute("SELECT sql FROM sqlite_master ORDER BY name")
+    assert cursor.fetchall() == schema
+    assert cursor.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+
+
+def test_student_lookups_use_indexes(manager):
+    cursor = get_connection(manager.db_file).cursor()
+    for sql, index in [("SELECT * FROM certificates WHERE student_id = 1", "idx_certificates_student_id"),
+                       ("SELECT * FROM presentations WHERE student_id = 1 ORDER BY presentation_date", "idx_presentations_student_date"),
+                       ("SELECT * FROM synopsis WHERE student_id = 1", "idx_synopsis_student_id"),
+                       ("SELECT id FROM students WHERE email = 'a' AND dob = 19900302", "idx_students_email_dob")]:
+        plan = " ".join(row[-1] for row in cursor.execute("EXPLAIN QUERY PLAN " + sql))
+        assert index in plan, plan
@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+from conftest import student
+from server import MAX_BODY_SIZE, PhDServer
+
+
+@pytest.fixture
+def server(manager):
+    server = PhDServer(manager, read_workers=1)
+    yield server
+    server.close()
+
+
+def call(server, method, target, body=None, token=None):
+    headers = {"authorization": f"Bearer {token}"} if token else {}
+    return asyncio.run(server.dispatch(method, target, body or {}, headers))
+
+
+def login(server, username, password):
+    status, payload = call(server, "POST", "/login", {"username": username, "password": password})
+    assert status == 200
+    return payload
+
+
+def test_every_route_but_login_needs_a_session(server):
+    assert call(server, "GET", "/students")[0] == 401
+    assert call(server, "GET", "/students", token="made-up")[0] == 401
+    assert call(server, "POST", "/login", {"username": "admin", "password": "wrong"})[0] == 401
+    token = login(server, "admin", "admin")["token"]
+    assert call(server, "GET", "/students", token=token) == (200, [])
+
+
+def test_students_only_read_their_own_records(server, manager):
+    own = manager.service.add_student(student("R1", dob="1990-03-02"))
+    other = manager.service.add_student(student("R2"))
+    session = login(server, "R1@example.com", "02-03-1990")
+    assert (session["is_admin"], session["student_id"]) == (False, own)
+    token = session["token"]
+
+    status, payload = call(server, "GET", f"/students/{own}", token=token)
+    assert status == 200 and payload["student"]["roll_number"] == "R1"
+    assert call(server, "GET", f"/students/{own}/certificates", token=token)[0] == 200
+    assert call(server, "GET", f"/students/{other}", token=token)[0] == 403
+    assert call(server, "GET", "/students", token=token)[0] == 403
+    assert call(server, "DELETE", f"/students/{own}", token=token)[0] == 403
+    assert call(server, "PUT", f"/students/{own}/synopsis", {"synopsis_title": "Mine"}, token=token)[0] == 403
+    assert manager.service.find_student(own) is not None
+
+
+def test_admins_write_and_logout_ends_the_session(server, manager):
+    student_id = manager.service.add_student(student("R1"))
+    token = login(server, "admin", "admin")["token"]
+    assert call(server, "DELETE", f"/students/{student_id}", token=token)[0] == 200
+    assert manager.service.find_student(student_id) is None
+
+    assert call(server, "POST", "/logout", token=token) == (200, {})
+    assert call(server, "GET", "/students", token=token)[0] == 401
+
+
+def raw_request(server, request):
+    # Sends raw bytes to server.handle over a local socket and returns everything it writes back
+    async def send():
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        async with listener:
+            reader, writer = await asyncio.open_connection(*listener.sockets[0].getsockname()[:2])
+            writer.write(request)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+    return asyncio.run(send())
+
+
+@pytest.mark.parametrize("length, status", [("abc", b"400"), ("-1", b"400"), ("1_0", b"400"),
+                                            (str(MAX_BODY_SIZE + 1), b"413")])
+def test_unusable_content_length_is_refused_and_closes(server, length, status):
+    request = f"POST /login HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode("latin-1")
+    response = raw_request(server, request + b"GET /students HTTP/1.1\r\n\r\n")
+    assert response.startswith(b"HTTP/1.1 " + status)
+    assert b"Connection: close" in response
+    # Nothing after the refused request is read
+    assert response.count(b"HTTP/1.1") == 1
+
+
+def test_requests_share_a_kept_alive_connection(server):
+    body = b'{"username": "admin", "password": "admin"}'
+    request = b"POST /login HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+    response = raw_request(server, request + request + b"GET /students HTTP/1.1\r\nConnection: close\r\n\r\n")
+    assert response.count(b"HTTP/1.1 200 OK") == 2 and b"HTTP/1.1 401 Unauthorized" in response
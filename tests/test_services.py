@@ -0,0 +1,105 @@
+import os
+import zipfile
+import pytest
+from conftest import student
+from services import (CertificateData, NotFoundError, PresentationData, StudentData, StudentFilter, SynopsisData,
+                      ValidationError)
+from student_facets import FacetFilter
+
+
+def test_presentation_rows_carry_their_file(manager, make_file):
+    # Manage Presentations lists and opens files from these rows without any SQL of its own
+    service = manager.service
+    student_id = service.add_student(student("R1"))
+    service.add_presentation(student_id, PresentationData("2016-01-15", "First", make_file("talk.pdf")))
+    service.add_presentation(student_id, PresentationData("2016-07-15", "Second"))
+    assert service.find_student(student_id).name == "Student R1"
+    [first, second] = service.list_presentations(student_id)
+    assert first[1:4] == (student_id, "2016-01-15", "First")
+    assert first[4].startswith(manager.blob_dir) and open(first[4], "rb").read() == b"data"
+    assert second[2:] == ("2016-07-15", "Second", None)
+    assert service.find_student(student_id + 1) is None
+
+
+def test_form_input_is_checked_before_anything_is_stored(manager):
+    # What Add and Update Student hand over from their entry widgets
+    service = manager.service
+    form = StudentData.from_form(" Asha ", "R1", "r1@example.com", "CS", "Dr. Rao", "01-07-2015", "Thesis", "None",
+                                 dob="02-03-1990", batch_from="2015", batch_to="")
+    assert (form.name, form.registration_date, form.dob, form.batch_from, form.batch_to) == (
+        "Asha", "2015-07-01", "1990-03-02", 2015, None)
+    with pytest.raises(ValidationError, match="DD-MM-YYYY"):
+        StudentData.from_form("Asha", "R1", "r1@example.com", "CS", "Dr. Rao", "2015-07-01", "Thesis", "None")
+    with pytest.raises(ValidationError):
+        service.add_student(StudentData("", "R1", "r1@example.com", "CS", "Dr. Rao", "2015-07-01", "Thesis", "None"))
+    student_id = service.add_student(form)
+    with pytest.raises(ValidationError, match="R1 already exists"):
+        service.add_student(student("R1"))
+    with pytest.raises(NotFoundError):
+        service.update_student(student_id + 1, student("R2"))
+    assert [record.id for record in service.list_students()] == [student_id]
+
+
+def test_list_search_and_filter_read_the_index(manager):
+    # The View, Search and filter panels page through StudentRecords; every write bumps the generation
+    # their cached screens compare against
+    service = manager.service
+    generation = service.generation
+    ids = [service.add_student(student(roll_number, department)) for roll_number, department in
+           [("R1", "CS"), ("R2", "EE"), ("R3", "EE")]]
+    assert service.generation == generation + 3
+    assert [record.id for record in service.list_students(limit=2)] == ids[:2]
+    assert [record.id for record in service.list_students(after_id=ids[1])] == ids[2:]
+    assert [record.roll_number for record in service.search_students("R2")] == ["R2"]
+    assert [record.id for record in service.filter_students(FacetFilter(department="EE"))] == ids[1:]
+    assert service.dashboard_counts()["department"] == [("EE", 2), ("CS", 1)]
+
+
+def test_synopsis_and_certificates_are_replaced_on_update(manager, make_file):
+    service = manager.service
+    student_id = service.add_student(student("R1"), certificates=[CertificateData("Old", make_file("old.pdf", b"old"))])
+    [(_, _, old_path)] = service.get_student(student_id).certificates
+    service.update_student(student_id, student("R1"), synopsis=SynopsisData("Graphs", "2018-01-10", "Abstract"),
+                           certificates=[CertificateData("New", make_file("new.pdf", b"new"))])
+    details = service.get_student(student_id)
+    assert details.synopsis[2:5] == ("Graphs", "2018-01-10", "Abstract")
+    [(_, title, path)] = details.certificates
+    assert title == "New" and open(path, "rb").read() == b"new"
+    # The old certificate's blob went with its last reference
+    assert not os.path.exists(old_path)
+
+
+def test_bulk_delete_archives_the_selection_first(manager, tmp_path):
+    service = manager.service
+    keep = service.add_student(student("R1", "CS"))
+    ids = [service.add_student(student(roll_number, "EE")) for roll_number in ("R2", "R3")]
+    with pytest.raises(ValidationError):
+        service.delete_students(student_filter=StudentFilter())
+    archive = str(tmp_path / "archive.zip")
+    assert service.delete_students(student_filter=StudentFilter(department="EE"), archive_path=archive) == ids
+    with zipfile.ZipFile(archive) as f:
+        assert "students.csv" in f.namelist()
+    assert [record.id for record in service.list_students()] == [keep]
+    assert service.delete_students(student_ids=ids) == []
+
+
+def test_student_details_are_cached_until_the_student_changes(manager):
+    # Update Student reads through the same per-session cache as the View and Search screens
+    service = manager.service
+    student_id = service.add_student(student("R1"))
+    details = service.get_student(student_id)
+    assert details.student.roll_number == "R1"
+    assert service.get_student(student_id) is details
+    service.update_student(student_id, student("R1-B"))
+    assert service.get_student(student_id).student.roll_number == "R1-B"
+    assert service.get_student(student_id + 1) is None
+
+
+def test_students_log_in_with_their_date_of_birth(manager):
+    service = manager.service
+    student_id = service.add_student(student("R1", dob="1990-03-02"))
+    service.add_student(student("R2"))
+    assert service.authenticate("R1@example.com", "02-03-1990").student_id == student_id
+    assert service.authenticate("R1@example.com", "03-02-1990") is None
+    # Without a date of birth there is nothing to check the password against
+    assert service.authenticate("R2@example.com", "02-03-1990") is None
@@ -0,0 +1,106 @@
+import os
+import threading
+from collections import OrderedDict
+from PIL import Image, ImageTk
+from blob_store import file_sha256
+from file_manager import stored_digest
+from instrumentation import file_op
+
+THUMBNAIL_SIZE = (150, 150)
+
+
+class ThumbnailCache:
+    # Thumbnails live on disk as <thumb_dir>/<sha256 of the original>.jpg, so an edited picture gets a
+    # new thumbnail and identical pictures share one. A stat-keyed memo avoids re-hashing originals
+    # that haven't changed, and decoded PhotoImages are kept in a small LRU on the Tk thread.
+    def __init__(self, thumb_dir, size=THUMBNAIL_SIZE, max_photos=64):
+        self.thumb_dir = thumb_dir
+        self.size = size
+        self.max_photos = max_photos
+        self._thumbs = {}
+        self._lock = threading.Lock()
+        self._photos = OrderedDict()
+
+    def _stat_key(self, pic_path):
+        stat = os.stat(pic_path)
+        return (os.path.abspath(pic_path), stat.st_mtime_ns, stat.st_size)
+
+    def ensure_thumbnail(self, pic_path):
+        # Worker-thread call: returns the thumbnail path, generating it on first use
+        key = self._stat_key(pic_path)
+        with self._lock:
+            thumb_path = self._thumbs.get(key)
+        if thumb_path and os.path.exists(thumb_path):
+            return thumb_path
+        digest = stored_digest(pic_path) or file_sha256(pic_path)
+        thumb_path = os.path.join(self.thumb_dir, f"{digest}.jpg")
+        if not os.path.exists(thumb_path):
+            os.makedirs(self.thumb_dir, exist_ok=True)
+            with file_op("image_open", pic_path), Image.open(pic_path) as image:
+                thumbnail = image.convert("RGB").resize(self.size, Image.LANCZOS)
+            temp_path = f"{thumb_path}.{threading.get_ident()}.tmp"
+            thumbnail.save(temp_path, "JPEG", quality=85)
+            os.replace(temp_path, thumb_path)
+        with self._lock:
+            self._thumbs[key] = thumb_path
+        return thumb_path
+
+    def load_thumbnail(self, pic_path):
+        # Worker-thread call: decodes the small thumbnail instead of the original photo
+        thumb_path = self.ensure_thumbnail(pic_path)
+        with file_op("image_open", thumb_path):
+            image = Image.open(thumb_path)
+            image.load()
+        return thumb_path, image
+
+    def cached_photo(self, pic_path):
+        # Tk-thread call: a ready PhotoImage if this exact picture was shown recently
+        try:
+            key = self._stat_key(pic_path)
+        except OSError:
+            return None
+        with self._lock:
+            thumb_path = self._thumbs.get(key)
+        photo = self._photos.get(thumb_path)
+        if photo is not None:
+            self._photos.move_to_end(thumb_path)
+        return photo
+
+    def photo_for(self, thumb_path, image):
+        # Tk-thread call: PhotoImages must be created on the thread that owns the interpreter
+        photo = ImageTk.PhotoImage(image)
+        self._photos[thumb_path] = photo
+        self._photos.move_to_end(thumb_path)
+        while len(self._photos) > self.max_photos:
+            self._photos.popitem(last=False)
+        return photo
+
+    def invalidate(self, pic_path):
+        # Drops the memo for a replaced picture; PhotoImages are keyed by content hash, so stale
+        # ones are never handed out and simply age out of the LRU
+        path = os.path.abspath(pic_path)
+        with self._lock:
+            for key in [key for key in self._thumbs if key[0] == path]:
+                del self._thumbs[key]
+
+    def refresh(self, pic_path):
+        # Called after an upload so the first view is already cheap; a picture PIL can't read
+        # shouldn't fail the save, it just shows the error when viewed
+        self.invalidate(pic_path)
+        try:
+            self.ensure_thumbnail(pic_path)
+        except (OSError, ValueError) as e:
+            print(f"Could not create thumbnail for {pic_path}: {e}")
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_thumbnail_cache(thumb_dir):
+    key = os.path.abspath(thumb_dir)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = ThumbnailCache(thumb_dir)
+    return cache
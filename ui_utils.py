@@ -1,6 +1,52 @@
+import os
 import tkinter as tk
 from tkinter import ttk
 
+
+def format_batch(batch_from, batch_to, extension_years):
+    # extension_years is computed by the database from batch_to and original_batch_to
+    if not (batch_from and batch_to):
+        return "N/A"
+    batch_display = f"{batch_from}-{batch_to}"
+    if extension_years:
+        batch_display += f" (Extended by {extension_years} year{'s' if extension_years != 1 else ''})"
+    return batch_display
+
+
+def show_picture(task_runner, parent, pic_path, thumb_dir):
+    # Recently shown pictures come straight from the PhotoImage cache; otherwise the cached
+    # thumbnail is read (or generated) on a worker and only the PhotoImage is built on the Tk thread
+    if not (pic_path and os.path.exists(pic_path)):
+        ttk.Label(parent, text="Picture not available", font=("Inter", 11)).pack(pady=10)
+        return
+    try:
+        # Pillow is only loaded the first time a picture is shown
+        from thumbnail_cache import get_thumbnail_cache
+    except ImportError:
+        ttk.Label(parent, text="Install Pillow to view pictures", font=("Inter", 11)).pack(pady=10)
+        return
+    cache = get_thumbnail_cache(thumb_dir)
+    photo = cache.cached_photo(pic_path)
+    if photo is not None:
+        img_label = ttk.Label(parent, image=photo, background="#FFFFFF")
+        img_label.image = photo
+        img_label.pack(pady=10)
+        return
+    img_label = ttk.Label(parent, text="Loading picture...", font=("Inter", 11), background="#FFFFFF")
+    img_label.pack(pady=10)
+
+    def load(task):
+        return cache.load_thumbnail(pic_path)
+
+    def loaded(result):
+        photo = cache.photo_for(*result)
+        img_label.configure(image=photo, text="")
+        img_label.image = photo
+
+    task_runner.run(load, on_success=loaded, owner=img_label,
+                    on_error=lambda e: img_label.configure(text=f"Unable to load picture: {e}"))
+
+
 class UIUtils:
     def setup_styles(self):
         style = ttk.Style()